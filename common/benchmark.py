@@ -0,0 +1,108 @@
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Mapping, Sequence
+
+
+def raise_nofile_limit() -> int:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    return hard
+
+
+def wait_for_port(host: str, port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=0.1):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"nothing is listening on {host}:{port}")
+
+            time.sleep(0.05)
+
+
+@contextmanager
+def run_server(
+    args: Sequence[str],
+    port: int,
+    host: str = "127.0.0.1",
+    env: Mapping[str, str] | None = None,
+) -> Iterator[subprocess.Popen]:
+    process = subprocess.Popen(
+        [sys.executable, *args],
+        env=None if env is None else {**os.environ, **env},
+    )
+
+    try:
+        wait_for_port(host, port)
+        yield process
+    finally:
+        process.terminate()
+
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def uvicorn_args(app: str, port: int) -> list[str]:
+    return ["-m", "uvicorn", app, "--port", str(port), "--log-level", "warning"]
+
+
+def cpu_seconds(pid: int) -> float | None:
+    # user + system time of the process, linux only
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+    except OSError:
+        return None
+
+    fields = stat.rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return float("nan")
+
+    index = min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))
+    return sorted_values[index]
+
+
+def latency_summary(latencies: Iterable[float]) -> dict[str, float]:
+    values = sorted(latencies)
+
+    return {
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": values[-1] if values else float("nan"),
+    }
+
+
+def markdown_table(rows: Sequence[dict[str, object]]) -> str:
+    if not rows:
+        return ""
+
+    columns = list(rows[0])
+
+    def cell(value: object) -> str:
+        return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+    lines = [
+        "| " + " | ".join(columns) + " |",
+        "|" + "|".join("---" for _ in columns) + "|",
+        *("| " + " | ".join(cell(row[c]) for c in columns) + " |" for row in rows),
+    ]
+    return "\n".join(lines)
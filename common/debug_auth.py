@@ -0,0 +1,24 @@
+import hmac
+import os
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+BearerDep = Annotated[
+    HTTPAuthorizationCredentials | None, Depends(HTTPBearer(auto_error=False))
+]
+
+
+def requires_debug_token(credentials: BearerDep) -> None:
+    # /debug endpoints take DEBUG_TOKEN as a bearer token and are closed while
+    # it is not set; compare_digest does not leak how much of a guess was right
+    token = os.environ.get("DEBUG_TOKEN", "")
+
+    if (
+        not token
+        or credentials is None
+        or not hmac.compare_digest(credentials.credentials.encode(), token.encode())
+    ):
+        raise HTTPException(HTTPStatus.UNAUTHORIZED)
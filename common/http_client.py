@@ -0,0 +1,91 @@
+import asyncio
+from dataclasses import dataclass
+
+
+class ProtocolError(ConnectionError):
+    # response could not be parsed, the connection is dropped like a broken one
+    pass
+
+
+def _parse_int(text: bytes | str, base: int = 10) -> int:
+    try:
+        return int(text, base)
+    except ValueError as e:
+        raise ProtocolError(f"bad number in response: {text!r}") from e
+
+
+@dataclass(slots=True)
+class HttpConnection:
+    # bare keep-alive HTTP/1.1 connection, so load generators and benchmarks
+    # measure the server and not the client library; any response that cannot
+    # be parsed raises ProtocolError, a ConnectionError like a dropped socket
+    host: str
+    port: int
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+    @staticmethod
+    async def open(host: str, port: int) -> "HttpConnection":
+        reader, writer = await asyncio.open_connection(host, port)
+        return HttpConnection(host, port, reader, writer)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes = b"",
+        content_type: str = "application/octet-stream",
+    ) -> tuple[int, bytes]:
+        self.writer.write(
+            (
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "\r\n"
+            ).encode()
+            + body
+        )
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+
+        headers = {}
+
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            chunks = []
+
+            # chunk size line may carry ";name=value" extensions after the size
+            while size := _parse_int(
+                (await self.reader.readline()).partition(b";")[0].strip(), 16
+            ):
+                chunks.append((await self.reader.readexactly(size + 2))[:-2])
+            await self.reader.readline()
+            content = b"".join(chunks)
+        else:
+            content = await self.reader.readexactly(
+                _parse_int(headers.get("content-length", "0"))
+            )
+
+        # "HTTP/1.1 200 OK", status code is the 3 digits after the version
+        return _parse_int(status_line.partition(b" ")[2][:3]), content
+
+    def abort(self) -> None:
+        # drops the connection without waiting for it, for a request that
+        # failed or was cancelled halfway
+        self.writer.close()
+
+    async def close(self) -> None:
+        self.writer.close()
+
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Callable, Iterator
+
+# snowflake layout of a 63-bit id, most significant bits first: milliseconds
+# since EPOCH_MS (41 bits, ~70 years), worker (10 bits), sequence (12 bits);
+# ids of all workers sort roughly by creation time, so new rows go to the end
+# of an index instead of random pages of it
+#
+# ids pass 2**53 a few weeks after EPOCH_MS, so practically all of them do:
+# REST APIs still send them as JSON numbers, which is exact for Python and Go
+# clients, but JavaScript's JSON.parse rounds them to the nearest double;
+# contracts say so in the OpenAPI description of every id field
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER = (1 << WORKER_BITS) - 1
+SEQUENCE_SIZE = 1 << SEQUENCE_BITS
+EPOCH_MS = 1_704_067_200_000  # 2024-01-01 UTC
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def worker_from_env(default: int = 0) -> int:
+    # every process that hands out ids at the same time needs its own WORKER_ID
+    return int(os.environ.get("WORKER_ID", default))
+
+
+@dataclass(slots=True, frozen=True)
+class _Millisecond:
+    # next() of itertools.count is atomic under the GIL, so threads that see
+    # the same millisecond never get the same sequence number
+    ms: int
+    sequence: Iterator[int]
+
+
+@dataclass(slots=True)
+class Snowflake:
+    worker: int = 0
+    clock: Callable[[], int] = _now_ms
+
+    _current: _Millisecond = field(init=False)
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.worker <= MAX_WORKER:
+            raise ValueError(f"worker must be in [0, {MAX_WORKER}], got {self.worker}")
+
+        self._current = _Millisecond(-1, count(SEQUENCE_SIZE))
+
+    def _compose(self, ms: int, sequence: int) -> int:
+        return (ms << WORKER_BITS | self.worker) << SEQUENCE_BITS | sequence
+
+    def _take(self, current: _Millisecond) -> int | None:
+        # clock going back keeps using the last millisecond, ids never repeat
+        if self.clock() - EPOCH_MS > current.ms:
+            return None
+
+        if (sequence := next(current.sequence)) >= SEQUENCE_SIZE:
+            return None
+
+        return self._compose(current.ms, sequence)
+
+    def next_id(self) -> int:
+        # fast path takes no lock, only moving to the next millisecond does
+        if (id := self._take(self._current)) is not None:
+            return id
+
+        with self._lock:
+            # another thread may have moved on while this one waited
+            if (id := self._take(self._current)) is not None:
+                return id
+
+            # sequence of this millisecond is used up: the next one is
+            # borrowed, the clock catches up with it soon
+            ms = max(self.clock() - EPOCH_MS, self._current.ms + 1)
+            self._current = _Millisecond(ms, count(1))
+
+        return self._compose(ms, 0)
+
+    def __iter__(self) -> Iterator[int]:
+        while True:
+            yield self.next_id()
+
+    def lease(self, n: int) -> list[range]:
+        # n ids for a bulk insert, taken under the lock once: whole fresh
+        # milliseconds are reserved, ids of each of them are one range
+        if n <= 0:
+            return []
+
+        milliseconds = -(-n // SEQUENCE_SIZE)
+        last_size = n - (milliseconds - 1) * SEQUENCE_SIZE
+
+        with self._lock:
+            start = max(self.clock() - EPOCH_MS, self._current.ms + 1)
+            # rest of the last millisecond is left to next_id()
+            self._current = _Millisecond(start + milliseconds - 1, count(last_size))
+
+        blocks = []
+
+        for ms in range(start, start + milliseconds):
+            first = self._compose(ms, 0)
+            size = SEQUENCE_SIZE if ms < start + milliseconds - 1 else last_size
+            blocks.append(range(first, first + size))
+
+        return blocks
@@ -0,0 +1,21 @@
+import codecs
+from typing import AsyncIterator
+
+
+async def utf8_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # request body arrives in arbitrary chunks, lines are cut at "\n" only
+    # after utf-8 was decoded incrementally, so a character split between two
+    # chunks stays whole; invalid utf-8 raises UnicodeDecodeError
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    tail = ""
+
+    async for chunk in chunks:
+        *lines, tail = (tail + decoder.decode(chunk)).split("\n")
+
+        for line in lines:
+            yield line
+
+    tail += decoder.decode(b"", final=True)
+
+    if tail:
+        yield tail
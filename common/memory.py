@@ -0,0 +1,165 @@
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import islice
+from types import FunctionType, ModuleType
+from typing import Collection, Mapping
+
+# tracing is off until asked for, it makes every allocation several times
+# slower; one frame is enough to group allocations by module
+TRACE_FRAMES = 1
+# records of a store measured to estimate bytes per record
+SAMPLE_SIZE = 1000
+
+_SHARED = (type, ModuleType, FunctionType, Enum)
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def deep_size(obj: object, seen: set[int]) -> int:
+    # bytes of obj and everything only reachable through it; types, enum
+    # members and the like are shared by all records and are not counted
+    if id(obj) in seen or isinstance(obj, _SHARED):
+        return 0
+
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+
+    if hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if slot not in ("__dict__", "__weakref__") and hasattr(obj, slot):
+                size += deep_size(getattr(obj, slot), seen)
+
+    return size
+
+
+def store_stats(name: str, store: Collection | Mapping) -> dict[str, object]:
+    # per record cost is measured on a sample, the container's own table is
+    # spread over all of its records
+    records = len(store)
+    seen: set[int] = set()
+
+    if isinstance(store, Mapping):
+        sample = list(islice(store.items(), SAMPLE_SIZE))
+        sampled = sum(deep_size(k, seen) + deep_size(v, seen) for k, v in sample)
+    else:
+        sample = list(islice(store, SAMPLE_SIZE))
+        sampled = sum(deep_size(record, seen) for record in sample)
+
+    per_record = sampled / len(sample) if sample else 0.0
+    per_record += sys.getsizeof(store) / records if records else 0.0
+
+    return {
+        "store": name,
+        "records": records,
+        "bytes_per_record": round(per_record, 1),
+        "estimated_bytes": round(per_record * records),
+    }
+
+
+def _module_names() -> dict[str, str]:
+    return {
+        module.__file__: name
+        for name, module in list(sys.modules.items())
+        if getattr(module, "__file__", None)
+    }
+
+
+def _by_module(
+    snapshot: tracemalloc.Snapshot, previous: tracemalloc.Snapshot
+) -> list[dict[str, object]]:
+    modules = _module_names()
+    totals: dict[str, list[int]] = defaultdict(lambda: [0, 0, 0, 0])
+
+    for diff in snapshot.compare_to(previous, "filename"):
+        filename = diff.traceback[0].filename
+        total = totals[modules.get(filename, filename)]
+        total[0] += diff.size
+        total[1] += diff.size_diff
+        total[2] += diff.count
+        total[3] += diff.count_diff
+
+    return [
+        {
+            "module": module,
+            "bytes": size,
+            "bytes_diff": size_diff,
+            "count": count,
+            "count_diff": count_diff,
+        }
+        for module, (size, size_diff, count, count_diff) in totals.items()
+    ]
+
+
+def _top(rows: list[dict[str, object]], key: str, n: int) -> list[dict[str, object]]:
+    return sorted(rows, key=lambda row: row[key], reverse=True)[:n]
+
+
+@dataclass(slots=True)
+class MemoryProfiler:
+    # first snapshot after start() is the baseline, every report is compared
+    # with it and with the snapshot of the report before
+    _baseline: tracemalloc.Snapshot | None = field(init=False, default=None)
+    _previous: tracemalloc.Snapshot | None = field(init=False, default=None)
+    _previous_at: float = field(init=False, default=0.0)
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+
+        self._baseline = self._previous = self._snapshot()
+        self._previous_at = time.monotonic()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self._baseline = self._previous = None
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    def report(
+        self, stores: Mapping[str, Collection | Mapping], top: int = 20
+    ) -> dict[str, object]:
+        report: dict[str, object] = {
+            "tracing": self.tracing,
+            "stores": [store_stats(name, store) for name, store in stores.items()],
+        }
+
+        if not self.tracing or self._baseline is None:
+            return report
+
+        snapshot = self._snapshot()
+        now = time.monotonic()
+        current, peak = tracemalloc.get_traced_memory()
+        since_previous = _by_module(snapshot, self._previous)
+        since_start = _by_module(snapshot, self._baseline)
+        report |= {
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "seconds_since_previous": round(now - self._previous_at, 3),
+            "top_modules": _top(since_start, "bytes", top),
+            "growth_since_start": _top(since_start, "bytes_diff", top),
+            "growth_since_previous": _top(since_previous, "bytes_diff", top),
+        }
+        self._previous, self._previous_at = snapshot, now
+
+        return report
@@ -0,0 +1,350 @@
+import asyncio
+import json
+import os
+import time
+from bisect import bisect_left
+from dataclasses import asdict, dataclass, field
+from itertools import accumulate
+from pathlib import Path
+from typing import Callable, Iterable
+
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# same metric names, labels and buckets as default metrics of
+# prometheus-fastapi-instrumentator, so dashboards keep working whichever of
+# the two serves /metrics; requests to /metrics itself are not counted, and
+# http_requests_inprogress is exported as with its inprogress option on
+LATENCY_BUCKETS = (
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    1.5,
+    2.0,
+    2.5,
+    3.0,
+    3.5,
+    4.0,
+    4.5,
+    5.0,
+    7.5,
+    10.0,
+    30.0,
+    60.0,
+)
+# per handler histogram has few buckets, all of them are also in
+# LATENCY_BUCKETS, so it is rendered from the same counters
+LOWR_BUCKETS = (0.1, 0.5, 1.0)
+STATUSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+UNMATCHED = "none"
+
+
+@dataclass(slots=True)
+class _Series:
+    # preallocated counters of one (method, handler), requests by status class
+    # and latency buckets; middleware runs on the event loop thread only, so
+    # plain int increments need no locks
+    requests: list[int] = field(default_factory=lambda: [0] * len(STATUSES))
+    buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    over_last_bucket: int = 0
+    latency_sum: float = 0.0
+    latency_count: int = 0
+    # content-length headers summed, 0 if there was none, like instrumentator
+    request_bytes: int = 0
+    response_bytes: int = 0
+
+    def merge(self, other: "_Series") -> None:
+        for i, count in enumerate(other.requests):
+            self.requests[i] += count
+
+        for i, count in enumerate(other.buckets):
+            self.buckets[i] += count
+
+        self.over_last_bucket += other.over_last_bucket
+        self.latency_sum += other.latency_sum
+        self.latency_count += other.latency_count
+        self.request_bytes += other.request_bytes
+        self.response_bytes += other.response_bytes
+
+
+@dataclass(slots=True)
+class LiteMetrics:
+    app: ASGIApp
+    # every sample_every-th request is timed, all of them are counted
+    sample_every: int = 1
+    # /metrics text is rendered at most once per ttl
+    exposition_ttl: float = 1.0
+    path: str = "/metrics"
+    # default prometheus_client registry (process metrics and anything else
+    # registered there) is appended to the exposition
+    include_registry: bool = True
+    # with several worker processes each of them writes its counters to this
+    # directory at most once per flush_interval, /metrics sums them all, and
+    # prometheus_client metrics are read in its multiprocess mode from there
+    multiprocess_dir: str | None = field(
+        default_factory=lambda: os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    )
+    flush_interval: float = 1.0
+    clock: Callable[[], float] = time.perf_counter
+
+    _series: dict[tuple[str, str], _Series] = field(init=False, default_factory=dict)
+    _seen: int = field(init=False, default=0)
+    _in_progress: int = field(init=False, default=0)
+    _exposition: bytes = field(init=False, default=b"")
+    _exposition_at: float = field(init=False, default=float("-inf"))
+    _flush_scheduled: bool = field(init=False, default=False)
+    _file: Path | None = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        if self.multiprocess_dir is not None:
+            # start time keeps files of a restarted worker with reused pid apart
+            self._file = (
+                Path(self.multiprocess_dir)
+                / f"lite_{os.getpid()}_{time.time_ns()}.json"
+            )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"] == self.path:
+            await self._expose(send)
+            return
+
+        self._seen += 1
+        sampled = self._seen % self.sample_every == 0
+        started = self.clock() if sampled else 0.0
+        status = 500
+        response_bytes = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_bytes
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_bytes = _content_length(message.get("headers", ()))
+
+            await send(message)
+
+        self._in_progress += 1
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._in_progress -= 1
+            route = scope.get("route")
+            key = (scope["method"], route.path if route is not None else UNMATCHED)
+
+            if (series := self._series.get(key)) is None:
+                series = self._series[key] = _Series()
+
+            series.requests[min(status // 100, 5) - 1] += 1
+            series.request_bytes += _content_length(scope["headers"])
+            series.response_bytes += response_bytes
+
+            if sampled:
+                elapsed = self.clock() - started
+                i = bisect_left(LATENCY_BUCKETS, elapsed)
+
+                if i < len(LATENCY_BUCKETS):
+                    series.buckets[i] += 1
+                else:
+                    series.over_last_bucket += 1
+
+                series.latency_sum += elapsed
+                series.latency_count += 1
+
+            if self._file is not None and not self._flush_scheduled:
+                self._flush_scheduled = True
+                asyncio.get_running_loop().call_later(self.flush_interval, self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        self._write()
+
+    def _write(self) -> None:
+        # runs on the event loop like the counting itself; the file is
+        # replaced at once, so readers in other workers never see it half done
+        state = {
+            "pid": os.getpid(),
+            "in_progress": self._in_progress,
+            "series": [[*key, asdict(series)] for key, series in self._series.items()],
+        }
+        tmp = self._file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state))
+        tmp.replace(self._file)
+
+    def _collect(self) -> tuple[dict[tuple[str, str], _Series], int]:
+        if self._file is None:
+            return self._series, self._in_progress
+
+        self._write()
+        totals: dict[tuple[str, str], _Series] = {}
+        in_progress = 0
+
+        for path in Path(self.multiprocess_dir).glob("lite_*.json"):
+            state = json.loads(path.read_text())
+
+            for method, handler, fields in state["series"]:
+                series = totals.setdefault((method, handler), _Series())
+                series.merge(_Series(**fields))
+
+            # requests of exited workers are kept, like prometheus_client
+            # does for counters, but they are not in progress anymore
+            if _alive(state["pid"]):
+                in_progress += state["in_progress"]
+
+        return totals, in_progress
+
+    async def _expose(self, send: Send) -> None:
+        now = time.monotonic()
+
+        if now - self._exposition_at > self.exposition_ttl:
+            self._exposition = self.render()
+            self._exposition_at = now
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/plain; version=0.0.4; charset=utf-8"),
+                    (b"content-length", str(len(self._exposition)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": self._exposition})
+
+    def render(self) -> bytes:
+        all_series, in_progress = self._collect()
+        lines = [
+            (
+                "# HELP http_requests_total Total number of requests by method, "
+                "status and handler."
+            ),
+            "# TYPE http_requests_total counter",
+        ]
+
+        for (method, handler), series in all_series.items():
+            for status, count in zip(STATUSES, series.requests):
+                if count:
+                    lines.append(
+                        f'http_requests_total{{handler="{handler}",method="{method}",'
+                        f'status="{status}"}} {count}'
+                    )
+
+        # sizes are by handler only, every request is observed once
+        sizes: dict[str, list[int]] = {}
+
+        for (_, handler), series in all_series.items():
+            size = sizes.setdefault(handler, [0, 0, 0])
+            size[0] += sum(series.requests)
+            size[1] += series.request_bytes
+            size[2] += series.response_bytes
+
+        for name, direction, column in (
+            ("http_request_size_bytes", "incoming requests", 1),
+            ("http_response_size_bytes", "outgoing responses", 2),
+        ):
+            lines += [
+                f"# HELP {name} Content length of {direction} by handler.",
+                f"# TYPE {name} summary",
+            ]
+
+            for handler, size in sizes.items():
+                lines += [
+                    f'{name}_count{{handler="{handler}"}} {size[0]}',
+                    f'{name}_sum{{handler="{handler}"}} {size[column]}',
+                ]
+
+        total = _Series()
+
+        for series in all_series.values():
+            total.merge(series)
+
+        lines += [
+            (
+                "# HELP http_request_duration_highr_seconds Latency with many "
+                f"buckets but no API specific labels, every {self.sample_every} "
+                "request(s) sampled."
+            ),
+            "# TYPE http_request_duration_highr_seconds histogram",
+            *_histogram("http_request_duration_highr_seconds", "", total),
+            (
+                "# HELP http_request_duration_seconds Latency with only few "
+                f"buckets by handler, every {self.sample_every} request(s) sampled."
+            ),
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+
+        for (method, handler), series in all_series.items():
+            lines += _histogram(
+                "http_request_duration_seconds",
+                f'handler="{handler}",method="{method}",',
+                series,
+                LOWR_BUCKETS,
+            )
+
+        lines += [
+            "# HELP http_requests_inprogress Requests being handled right now.",
+            "# TYPE http_requests_inprogress gauge",
+            f"http_requests_inprogress {in_progress}",
+        ]
+
+        text = ("\n".join(lines) + "\n").encode()
+
+        if not self.include_registry:
+            return text
+
+        if self.multiprocess_dir is None:
+            return text + generate_latest(REGISTRY)
+
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry, self.multiprocess_dir)
+        return text + generate_latest(registry)
+
+
+def _histogram(
+    name: str,
+    labels: str,
+    series: _Series,
+    buckets: tuple[float, ...] = LATENCY_BUCKETS,
+) -> list[str]:
+    # labels are empty or end with a comma, cumulative counts of `buckets`
+    # are picked from the cumulative counts of all LATENCY_BUCKETS
+    cumulative = dict(zip(LATENCY_BUCKETS, accumulate(series.buckets)))
+    plain = f"{{{labels.rstrip(',')}}}" if labels else ""
+
+    return [
+        *(f'{name}_bucket{{{labels}le="{le}"}} {cumulative[le]}' for le in buckets),
+        f'{name}_bucket{{{labels}le="+Inf"}} {series.latency_count}',
+        f"{name}_sum{plain} {series.latency_sum}",
+        f"{name}_count{plain} {series.latency_count}",
+    ]
+
+
+def _content_length(headers: Iterable[tuple[bytes, bytes]]) -> int:
+    for name, value in headers:
+        if name == b"content-length":
+            return int(value) if value.isdigit() else 0
+
+    return 0
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
@@ -0,0 +1,118 @@
+import asyncio
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+MAX_SECONDS = 60.0
+MAX_HZ = 250
+MAX_DEPTH = 128
+# sampler thread gets the GIL when a busy thread hits the switch interval or
+# releases it for io; with the default 5ms samples pile up on io calls
+SWITCH_INTERVAL = 0.0005
+
+# top frames of a thread that waits for work, such samples are not kept
+# unless asked for: threadpool workers would fill most of the output
+IDLE = {
+    ("selectors", "select"),
+    ("threading", "wait"),
+    ("threading", "_wait_for_tstate_lock"),
+    ("queue", "get"),
+}
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+# one profile at a time, so the overhead never adds up
+_running = threading.Lock()
+
+
+@dataclass(slots=True)
+class Sampler:
+    # every interval stacks of all threads are read with sys._current_frames
+    # and counted in collapsed form: "thread;outer;...;inner count"
+    interval: float = 0.01
+    include_idle: bool = False
+    names: dict[int, str] = field(default_factory=dict)
+
+    stacks: Counter[str] = field(init=False, default_factory=Counter)
+    samples: int = field(init=False, default=0)
+    _stop: threading.Event = field(init=False, default_factory=threading.Event)
+    _thread: threading.Thread | None = field(init=False, default=None)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own)
+
+    def sample(self, exclude: int | None = None) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        self.samples += 1
+
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude:
+                continue
+
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "?")
+
+            if not self.include_idle and (module, code.co_name) in IDLE:
+                continue
+
+            frames = []
+
+            while frame is not None and len(frames) < MAX_DEPTH:
+                module = frame.f_globals.get("__name__", "?")
+                frames.append(f"{module}:{frame.f_code.co_qualname}")
+                frame = frame.f_back
+
+            thread = self.names.get(ident) or names.get(ident, str(ident))
+            frames.append(thread)
+            self.stacks[";".join(reversed(frames))] += 1
+
+    def collapsed(self) -> str:
+        # input format of flamegraph.pl, speedscope and inferno
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+async def run_profile(
+    seconds: float, hz: int = 100, include_idle: bool = False
+) -> Sampler:
+    # called on the event loop thread, which is labeled so in the output
+    if not _running.acquire(blocking=False):
+        raise ProfilerBusy("profile is already running")
+
+    try:
+        sampler = Sampler(
+            1 / min(hz, MAX_HZ),
+            include_idle,
+            {threading.get_ident(): "event-loop"},
+        )
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch_interval, SWITCH_INTERVAL))
+        sampler.start()
+
+        try:
+            await asyncio.sleep(min(seconds, MAX_SECONDS))
+        finally:
+            sampler.stop()
+            sys.setswitchinterval(switch_interval)
+    finally:
+        _running.release()
+
+    return sampler
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+from anyio import to_thread
+from fastapi import FastAPI
+from prometheus_client import REGISTRY, CollectorRegistry, Gauge, Histogram
+
+LAG_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+# name anyio gives threads of its default pool, used by sync handlers,
+# sync dependencies and run_in_threadpool
+WORKER_THREAD_NAME = "AnyIO worker thread"
+
+
+@dataclass(slots=True)
+class RuntimeMetrics:
+    registry: CollectorRegistry = REGISTRY
+    # how often the probe wakes up, lag is how late it does
+    interval: float = 0.1
+
+    loop_lag: Histogram = field(init=False)
+    loop_lag_last: Gauge = field(init=False)
+    threadpool_waiting: Gauge = field(init=False)
+    threadpool_tokens: Gauge = field(init=False)
+    threadpool_threads: Gauge = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.loop_lag = Histogram(
+            "event_loop_lag_seconds",
+            "How late a timer callback runs, any blocking code on the loop adds up",
+            buckets=LAG_BUCKETS,
+            registry=self.registry,
+        )
+        # multiprocess_mode only matters with PROMETHEUS_MULTIPROC_DIR
+        self.loop_lag_last = Gauge(
+            "event_loop_lag_last_seconds",
+            "Lag of the latest probe",
+            registry=self.registry,
+            multiprocess_mode="max",
+        )
+        self.threadpool_waiting = Gauge(
+            "threadpool_waiting_tasks",
+            "Tasks waiting for a thread limiter token, i.e. thread pool queue",
+            registry=self.registry,
+            multiprocess_mode="livesum",
+        )
+        self.threadpool_tokens = Gauge(
+            "threadpool_tokens",
+            "Thread limiter tokens by state: borrowed or total",
+            ("state",),
+            registry=self.registry,
+            multiprocess_mode="livesum",
+        )
+        self.threadpool_threads = Gauge(
+            "threadpool_threads",
+            "Worker threads by state: busy or idle",
+            ("state",),
+            registry=self.registry,
+            multiprocess_mode="livesum",
+        )
+
+    def observe_threadpool(self) -> None:
+        # default limiter is per event loop, so it is read on the loop thread
+        statistics = to_thread.current_default_thread_limiter().statistics()
+        threads = sum(t.name == WORKER_THREAD_NAME for t in threading.enumerate())
+
+        self.threadpool_waiting.set(statistics.tasks_waiting)
+        self.threadpool_tokens.labels("borrowed").set(statistics.borrowed_tokens)
+        self.threadpool_tokens.labels("total").set(statistics.total_tokens)
+        self.threadpool_threads.labels("busy").set(statistics.borrowed_tokens)
+        self.threadpool_threads.labels("idle").set(
+            max(threads - statistics.borrowed_tokens, 0)
+        )
+
+    async def probe(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - started - self.interval, 0.0)
+
+            self.loop_lag.observe(lag)
+            self.loop_lag_last.set(lag)
+            self.observe_threadpool()
+
+
+_default_metrics: RuntimeMetrics | None = None
+
+
+def default_metrics() -> RuntimeMetrics:
+    global _default_metrics
+
+    if _default_metrics is None:
+        _default_metrics = RuntimeMetrics(
+            interval=float(os.environ.get("LOOP_PROBE_INTERVAL", "0.1"))
+        )
+
+    return _default_metrics
+
+
+def set_thread_limiter(tokens: int | None) -> None:
+    # anyio default is 40 threads; must be called on the running event loop
+    if tokens is not None:
+        to_thread.current_default_thread_limiter().total_tokens = tokens
+
+
+@asynccontextmanager
+async def runtime_metrics(app: FastAPI | None = None) -> AsyncIterator[None]:
+    # lifespan of an app: sizes the thread limiter from THREAD_LIMITER_TOKENS
+    # and runs the probe for as long as the app is up
+    tokens = os.environ.get("THREAD_LIMITER_TOKENS")
+    set_thread_limiter(int(tokens) if tokens else None)
+    task = asyncio.create_task(default_metrics().probe())
+
+    try:
+        yield
+    finally:
+        task.cancel()
+
+        with suppress(asyncio.CancelledError):
+            await task
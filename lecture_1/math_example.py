@@ -4,8 +4,14 @@ from typing import Annotated
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import JSONResponse
+from prometheus_client import make_asgi_app
 
-app = FastAPI()
+from common.runtime_metrics import runtime_metrics
+
+# handlers are sync, so they run in anyio thread pool: its queue, threads and
+# event loop lag are on /metrics, THREAD_LIMITER_TOKENS sets the pool size
+app = FastAPI(lifespan=runtime_metrics)
+app.mount("/metrics", make_asgi_app())
 
 
 @app.get("/factorial")
@@ -0,0 +1,211 @@
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+import grpc
+import websockets
+from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
+
+import lecture_2.grpc_example.ping_pb2 as pb2
+import lecture_2.grpc_example.ping_pb2_grpc as pb2_grpc
+from common.benchmark import (
+    cpu_seconds,
+    latency_summary,
+    markdown_table,
+    raise_nofile_limit,
+    run_server,
+    uvicorn_args,
+)
+from common.http_client import HttpConnection
+
+# ws_example server broadcasts to every subscriber (and rate limits them), so
+# echo for REST and WebSocket is served by this small app instead
+echo_app = FastAPI()
+
+
+@echo_app.post("/echo")
+async def post_echo(request: Request) -> Response:
+    return Response(await request.body(), media_type="application/octet-stream")
+
+
+@echo_app.websocket("/echo")
+async def ws_echo(ws: WebSocket) -> None:
+    await ws.accept()
+
+    try:
+        while True:
+            await ws.send_bytes(await ws.receive_bytes())
+    except WebSocketDisconnect:
+        pass
+
+
+# worker gets a payload and returns coroutine that sends one message and waits
+# for the echo
+type Worker = Callable[[], Awaitable[None]]
+type WorkerFactory = Callable[[bytes], Awaitable[tuple[Worker, Callable]]]
+
+
+def check_echo(payload: bytes, size: int) -> None:
+    # explicit check, asserts are stripped under python -O
+    if size != len(payload):
+        raise RuntimeError(f"echo returned {size} bytes, {len(payload)} were sent")
+
+
+def rest_worker(host: str, port: int) -> WorkerFactory:
+    async def factory(payload: bytes) -> tuple[Worker, Callable]:
+        connection = await HttpConnection.open(host, port)
+
+        async def send() -> None:
+            status, body = await connection.request("POST", "/echo", payload)
+            if status != 200:
+                raise RuntimeError(f"echo returned status {status}")
+            check_echo(payload, len(body))
+
+        return send, connection.close
+
+    return factory
+
+
+def ws_worker(host: str, port: int) -> WorkerFactory:
+    async def factory(payload: bytes) -> tuple[Worker, Callable]:
+        ws = await websockets.connect(
+            f"ws://{host}:{port}/echo", ping_interval=None, max_size=None
+        )
+
+        async def send() -> None:
+            await ws.send(payload)
+            check_echo(payload, len(await ws.recv()))
+
+        return send, ws.close
+
+    return factory
+
+
+def grpc_worker(channel: grpc.aio.Channel) -> WorkerFactory:
+    # all workers share one channel, requests are multiplexed over HTTP/2
+    stub = pb2_grpc.ExampleStub(channel)
+
+    async def factory(payload: bytes) -> tuple[Worker, Callable]:
+        request = pb2.PingRequest(message=payload.decode())
+
+        async def send() -> None:
+            response = await stub.Ping(request)
+            check_echo(payload, len(response.message))
+
+        async def close() -> None:
+            pass
+
+        return send, close
+
+    return factory
+
+
+async def measure(
+    factory: WorkerFactory,
+    server_pid: int,
+    size: int,
+    concurrency: int,
+    duration: float,
+) -> dict[str, float]:
+    payload = b"x" * size
+    workers = await asyncio.gather(*(factory(payload) for _ in range(concurrency)))
+    latencies: list[float] = []
+
+    async def loop(send: Worker, deadline: float) -> None:
+        while (started := time.perf_counter()) < deadline:
+            await send()
+            latencies.append(time.perf_counter() - started)
+
+    # warm up connections and server before measuring
+    await asyncio.gather(*(send() for send, _ in workers))
+
+    cpu_before = cpu_seconds(server_pid)
+    started = time.perf_counter()
+    await asyncio.gather(*(loop(send, started + duration) for send, _ in workers))
+    elapsed = time.perf_counter() - started
+    cpu_after = cpu_seconds(server_pid)
+
+    await asyncio.gather(*(close() for _, close in workers))
+
+    summary = latency_summary(latencies)
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": summary["p50"] * 1000,
+        "p99_ms": summary["p99"] * 1000,
+        "server_cpu_us_per_msg": (
+            (cpu_after - cpu_before) / len(latencies) * 1_000_000
+            if cpu_before is not None and cpu_after is not None and latencies
+            else float("nan")
+        ),
+    }
+
+
+async def run(
+    args: argparse.Namespace,
+    http_pid: int,
+    grpc_pid: int,
+) -> list[dict[str, object]]:
+    rows = []
+
+    async with grpc.aio.insecure_channel(f"{args.host}:{args.grpc_port}") as channel:
+        transports = {
+            "rest": (rest_worker(args.host, args.http_port), http_pid),
+            "websocket": (ws_worker(args.host, args.http_port), http_pid),
+            "grpc": (grpc_worker(channel), grpc_pid),
+        }
+
+        for size in args.sizes:
+            for concurrency in args.concurrency:
+                for name, (factory, pid) in transports.items():
+                    result = await measure(
+                        factory, pid, size, concurrency, args.duration
+                    )
+                    rows.append(
+                        {
+                            "transport": name,
+                            "size": size,
+                            "concurrency": concurrency,
+                            **result,
+                        }
+                    )
+
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="REST vs WebSocket vs gRPC echo")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[16, 1024, 16384], help="bytes"
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--http-port", type=int, default=8766)
+    parser.add_argument("--grpc-port", type=int, default=50153)
+    args = parser.parse_args()
+
+    raise_nofile_limit()
+
+    grpc_args = [
+        "-m",
+        "lecture_2.grpc_example.example_service_async",
+        "--address",
+        f"{args.host}:{args.grpc_port}",
+    ]
+
+    with (
+        run_server(
+            uvicorn_args("lecture_2.bench_transports:echo_app", args.http_port),
+            args.http_port,
+            args.host,
+        ) as http_server,
+        run_server(grpc_args, args.grpc_port, args.host) as grpc_server,
+    ):
+        rows = asyncio.run(run(args, http_server.pid, grpc_server.pid))
+
+    print(markdown_table(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Sequence
+
+import grpc
+
+import lecture_2.grpc_example.ping_pb2 as pb2
+import lecture_2.grpc_example.ping_pb2_grpc as pb2_grpc
+
+_deadline: ContextVar[float | None] = ContextVar("grpc_deadline", default=None)
+
+
+@contextmanager
+def deadline(timeout: float) -> Iterator[None]:
+    # every call made inside (including tasks started inside) shares the same
+    # deadline, nested deadlines can only make it shorter
+    current = _deadline.get()
+    new = time.monotonic() + timeout
+    token = _deadline.set(new if current is None else min(current, new))
+
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_timeout(timeout: float | None = None) -> float | None:
+    current = _deadline.get()
+
+    if current is None:
+        return timeout
+
+    remaining = max(0.0, current - time.monotonic())
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+@dataclass(slots=True)
+class _PooledChannel:
+    channel: grpc.aio.Channel
+    stub: pb2_grpc.ExampleStub
+    in_flight: asyncio.Semaphore
+    # calls picked this channel, including ones waiting for in_flight slot
+    load: int = 0
+
+
+class ExampleClient:
+    def __init__(
+        self,
+        target: str,
+        channels: int = 4,
+        max_in_flight: int = 100,
+        timeout: float | None = None,
+        options: Sequence[tuple[str, int | str]] = (),
+    ) -> None:
+        self.timeout = timeout
+        self._pool = []
+
+        for _ in range(channels):
+            # without local subchannel pool all channels to the same target
+            # would share one HTTP/2 connection
+            channel = grpc.aio.insecure_channel(
+                target,
+                options=[("grpc.use_local_subchannel_pool", 1), *options],
+            )
+            self._pool.append(
+                _PooledChannel(
+                    channel,
+                    pb2_grpc.ExampleStub(channel),
+                    asyncio.Semaphore(max_in_flight),
+                )
+            )
+
+    async def __aenter__(self) -> "ExampleClient":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await asyncio.gather(*(pooled.channel.close() for pooled in self._pool))
+
+    def _pick(self) -> _PooledChannel:
+        return min(self._pool, key=lambda pooled: pooled.load)
+
+    async def ping(self, message: str, timeout: float | None = None) -> str:
+        timeout = timeout if timeout is not None else self.timeout
+
+        if timeout is None:
+            return await self._ping(message)
+
+        with deadline(timeout):
+            return await self._ping(message)
+
+    async def _ping(self, message: str) -> str:
+        pooled = self._pick()
+        pooled.load += 1
+
+        try:
+            async with pooled.in_flight:
+                # time spent waiting for in-flight slot counts against deadline
+                timeout = remaining_timeout()
+
+                if timeout is not None and timeout <= 0:
+                    raise grpc.aio.AioRpcError(
+                        grpc.StatusCode.DEADLINE_EXCEEDED,
+                        grpc.aio.Metadata(),
+                        grpc.aio.Metadata(),
+                        "Deadline Exceeded before the call was sent",
+                    )
+
+                response = await pooled.stub.Ping(
+                    pb2.PingRequest(message=message),
+                    timeout=timeout,
+                )
+        finally:
+            pooled.load -= 1
+
+        return response.message
+
+    async def ping_many(
+        self,
+        messages: Iterable[str],
+        timeout: float | None = None,
+    ) -> list[str]:
+        # all pings are sent at once (bounded by max_in_flight per channel),
+        # results are in the same order as messages
+        timeout = timeout if timeout is not None else self.timeout
+
+        if timeout is None:
+            return await asyncio.gather(*(self._ping(m) for m in messages))
+
+        with deadline(timeout):
+            return await asyncio.gather(*(self._ping(m) for m in messages))
+
+
+async def main() -> None:
+    async with ExampleClient("localhost:50051") as client:
+        print(await client.ping("message lol"))
+
+        started = time.perf_counter()
+        responses = await client.ping_many(f"message {i}" for i in range(10_000))
+        elapsed = time.perf_counter() - started
+
+        print(f"{len(responses)} pings in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
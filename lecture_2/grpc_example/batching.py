@@ -0,0 +1,66 @@
+import time
+from queue import Empty, Queue
+from threading import Thread
+from typing import Iterable, Iterator
+
+import lecture_2.grpc_example.ping_pb2 as pb2
+
+_END = object()
+
+
+def batch_requests(
+    requests: Iterable[pb2.PingRequest],
+    max_size: int = 100,
+    max_delay: float = 0.01,
+) -> Iterator[pb2.PingBatchRequest]:
+    # batch is sent when it has max_size messages or max_delay seconds passed
+    # since its first message. Source is read in a separate thread through a
+    # bounded queue, so slow source (like input()) does not hold back partially
+    # filled batch, and fast source is throttled when stream can not keep up
+    queue: Queue = Queue(maxsize=max_size * 4)
+    errors: list[BaseException] = []
+
+    def produce() -> None:
+        try:
+            for request in requests:
+                queue.put(request)
+        except BaseException as e:
+            # raised again by the consumer once the batches read before it are
+            # sent, and here, so the thread does not end as if the source ran out
+            errors.append(e)
+            raise
+        finally:
+            queue.put(_END)
+
+    Thread(target=produce, daemon=True).start()
+
+    batch: list[pb2.PingRequest] = []
+    deadline = 0.0
+
+    while True:
+        timeout = max(0.0, deadline - time.monotonic()) if batch else None
+
+        try:
+            request = queue.get(timeout=timeout)
+        except Empty:
+            yield pb2.PingBatchRequest(messages=batch)
+            batch = []
+            continue
+
+        if request is _END:
+            break
+
+        if not batch:
+            deadline = time.monotonic() + max_delay
+
+        batch.append(request)
+
+        if len(batch) >= max_size:
+            yield pb2.PingBatchRequest(messages=batch)
+            batch = []
+
+    if batch:
+        yield pb2.PingBatchRequest(messages=batch)
+
+    if errors:
+        raise errors[0]
@@ -0,0 +1,119 @@
+import argparse
+import time
+from collections import deque
+from typing import Callable, Iterator
+
+import grpc
+
+import lecture_2.grpc_example.ping_pb2 as pb2
+import lecture_2.grpc_example.ping_pb2_grpc as pb2_grpc
+from common.benchmark import markdown_table, run_server
+from lecture_2.grpc_example.batching import batch_requests
+
+
+def requests(count: int, size: int) -> Iterator[pb2.PingRequest]:
+    message = "x" * size
+    for _ in range(count):
+        yield pb2.PingRequest(message=message)
+
+
+def windowed(calls: Iterator[grpc.Future], window: int) -> int:
+    # keeps up to `window` unary calls in flight, returns number of messages
+    in_flight: deque[grpc.Future] = deque()
+    received = 0
+
+    for call in calls:
+        in_flight.append(call)
+
+        if len(in_flight) >= window:
+            received += _messages(in_flight.popleft().result())
+
+    while in_flight:
+        received += _messages(in_flight.popleft().result())
+
+    return received
+
+
+def _messages(response: pb2.PongResponse | pb2.PongBatchResponse) -> int:
+    return len(response.messages) if isinstance(response, pb2.PongBatchResponse) else 1
+
+
+def unary(stub: pb2_grpc.ExampleStub, args: argparse.Namespace) -> int:
+    return windowed(
+        (stub.Ping.future(r) for r in requests(args.messages, args.size)),
+        args.window,
+    )
+
+
+def stream(stub: pb2_grpc.ExampleStub, args: argparse.Namespace) -> int:
+    return sum(1 for _ in stub.PingStream(requests(args.messages, args.size)))
+
+
+def batch(stub: pb2_grpc.ExampleStub, args: argparse.Namespace) -> int:
+    batches = (
+        pb2.PingBatchRequest(messages=list(requests(args.batch_size, args.size)))
+        for _ in range(args.messages // args.batch_size)
+    )
+    return windowed((stub.PingBatch.future(b) for b in batches), args.window)
+
+
+def batch_stream(stub: pb2_grpc.ExampleStub, args: argparse.Namespace) -> int:
+    batches = batch_requests(
+        requests(args.messages, args.size), args.batch_size, args.batch_delay
+    )
+    return sum(len(r.messages) for r in stub.PingBatchStream(batches))
+
+
+MODES: dict[str, Callable[[pb2_grpc.ExampleStub, argparse.Namespace], int]] = {
+    "unary": unary,
+    "stream": stream,
+    "batch": batch,
+    "batch_stream": batch_stream,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="messages/s for Ping vs PingStream vs PingBatch(Stream)"
+    )
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--size", type=int, default=16, help="message bytes")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--batch-delay", type=float, default=0.005, help="seconds")
+    parser.add_argument("--window", type=int, default=64, help="unary in flight")
+    parser.add_argument("--port", type=int, default=50152)
+    args = parser.parse_args()
+
+    server_args = [
+        "-m",
+        "lecture_2.grpc_example.example_service_async",
+        "--address",
+        f"127.0.0.1:{args.port}",
+    ]
+    rows = []
+
+    with (
+        run_server(server_args, args.port),
+        grpc.insecure_channel(f"127.0.0.1:{args.port}") as channel,
+    ):
+        stub = pb2_grpc.ExampleStub(channel)
+
+        for name, mode in MODES.items():
+            started = time.perf_counter()
+            received = mode(stub, args)
+            elapsed = time.perf_counter() - started
+
+            rows.append(
+                {
+                    "mode": name,
+                    "messages": received,
+                    "seconds": elapsed,
+                    "messages_per_s": received / elapsed,
+                }
+            )
+
+    print(markdown_table(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+
+import grpc
+
+import lecture_2.grpc_example.ping_pb2 as pb2
+import lecture_2.grpc_example.ping_pb2_grpc as pb2_grpc
+from common.benchmark import markdown_table, run_server
+
+
+async def _ping_loop(target: str, duration: float, concurrency: int) -> int:
+    # every client process has its own channel, which means its own TCP
+    # connection, so SO_REUSEPORT can spread clients between workers
+    async with grpc.aio.insecure_channel(target) as channel:
+        stub = pb2_grpc.ExampleStub(channel)
+        request = pb2.PingRequest(message="ping")
+        await stub.Ping(request)
+
+        deadline = time.perf_counter() + duration
+        done = 0
+
+        async def loop() -> None:
+            nonlocal done
+            while time.perf_counter() < deadline:
+                await stub.Ping(request)
+                done += 1
+
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+        return done
+
+
+def run_client(target: str, duration: float, concurrency: int) -> int:
+    return asyncio.run(_ping_loop(target, duration, concurrency))
+
+
+def measure(workers: int, args: argparse.Namespace) -> dict[str, object]:
+    server_args = [
+        "-m",
+        "lecture_2.grpc_example.multiprocess_server",
+        "--workers",
+        str(workers),
+        "--address",
+        f"127.0.0.1:{args.port}",
+    ]
+
+    with run_server(server_args, args.port):
+        # give the rest of the workers time to bind after the first one did
+        time.sleep(1.0)
+
+        with multiprocessing.get_context("spawn").Pool(args.clients) as pool:
+            started = time.perf_counter()
+            counts = pool.starmap(
+                run_client,
+                [(f"127.0.0.1:{args.port}", args.duration, args.concurrency)]
+                * args.clients,
+            )
+            elapsed = time.perf_counter() - started
+
+    return {"workers": workers, "rpcs": sum(counts), "rpc_per_s": sum(counts) / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ping RPC/s by number of workers")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4],
+        help="worker counts to measure",
+    )
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--concurrency", type=int, default=32, help="per client")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--port", type=int, default=50151)
+    args = parser.parse_args()
+
+    print(markdown_table([measure(workers, args) for workers in args.workers]))
+
+
+if __name__ == "__main__":
+    main()
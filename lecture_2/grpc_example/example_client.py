@@ -1,7 +1,10 @@
+import argparse
+
 import grpc
 
 import lecture_2.grpc_example.ping_pb2 as pb2
 import lecture_2.grpc_example.ping_pb2_grpc as pb2_grpc
+from lecture_2.grpc_example.batching import batch_requests
 
 
 def message_from_input_generator():
@@ -15,11 +18,35 @@ def message_from_input_generator():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="pack input messages into batches of this size (PingBatchStream)",
+    )
+    parser.add_argument("--batch-delay", type=float, default=0.5, help="seconds")
+    args = parser.parse_args()
+
     with grpc.insecure_channel("localhost:50051") as channel:
         stub = pb2_grpc.ExampleStub(channel)
 
         response = stub.Ping(pb2.PingRequest(message="message lol"))
         print(response)
 
-        for response in stub.PingStream(message_from_input_generator()):
-            print(response)
+        response = stub.PingBatch(
+            pb2.PingBatchRequest(
+                messages=[pb2.PingRequest(message=f"message {i}") for i in range(3)]
+            )
+        )
+        print(response)
+
+        if args.batch_size > 1:
+            batches = batch_requests(
+                message_from_input_generator(), args.batch_size, args.batch_delay
+            )
+            for response in stub.PingBatchStream(batches):
+                print(response)
+        else:
+            for response in stub.PingStream(message_from_input_generator()):
+                print(response)
@@ -1,10 +1,13 @@
+import argparse
 from concurrent import futures
 from typing import Iterable
 
 import grpc
+from prometheus_client import start_http_server
 
 import lecture_2.grpc_example.ping_pb2 as pb2
 import lecture_2.grpc_example.ping_pb2_grpc as pb2_grpc
+from lecture_2.grpc_example.metrics import MetricsInterceptor
 
 
 class ExampleService(pb2_grpc.ExampleServicer):
@@ -15,11 +18,43 @@ class ExampleService(pb2_grpc.ExampleServicer):
         for message in request_iterator:
             yield pb2.PongResponse(message=message.message)
 
+    def PingBatch(self, request: pb2.PingBatchRequest, context):
+        return pb2.PongBatchResponse(
+            messages=[pb2.PongResponse(message=m.message) for m in request.messages]
+        )
+
+    def PingBatchStream(
+        self, request_iterator: Iterable[pb2.PingBatchRequest], context
+    ):
+        for batch in request_iterator:
+            yield self.PingBatch(batch, context)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ExampleService on thread pool")
+    parser.add_argument("--address", default="[::]:50051")
+    parser.add_argument("--max-workers", type=int, default=10)
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=9100,
+        help="port for prometheus /metrics, 0 means metrics are not exposed",
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
+    args = parse_args()
     print("running server")
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=args.max_workers),
+        interceptors=[MetricsInterceptor()],
+    )
     pb2_grpc.add_ExampleServicer_to_server(ExampleService(), server)
-    server.add_insecure_port("[::]:50051")
+    server.add_insecure_port(args.address)
     server.start()
+
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+
     server.wait_for_termination()
@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import signal
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+import grpc
+from prometheus_client import start_http_server
+
+import lecture_2.grpc_example.ping_pb2 as pb2
+import lecture_2.grpc_example.ping_pb2_grpc as pb2_grpc
+from lecture_2.grpc_example.metrics import AsyncMetricsInterceptor
+
+COMPRESSIONS = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+
+class AsyncExampleService(pb2_grpc.ExampleServicer):
+    async def Ping(self, request: pb2.PingRequest, context) -> pb2.PongResponse:
+        return pb2.PongResponse(message=request.message)
+
+    async def PingStream(
+        self,
+        request_iterator: AsyncIterator[pb2.PingRequest],
+        context,
+    ) -> AsyncIterator[pb2.PongResponse]:
+        async for message in request_iterator:
+            yield pb2.PongResponse(message=message.message)
+
+    async def PingBatch(
+        self,
+        request: pb2.PingBatchRequest,
+        context,
+    ) -> pb2.PongBatchResponse:
+        return pb2.PongBatchResponse(
+            messages=[pb2.PongResponse(message=m.message) for m in request.messages]
+        )
+
+    async def PingBatchStream(
+        self,
+        request_iterator: AsyncIterator[pb2.PingBatchRequest],
+        context,
+    ) -> AsyncIterator[pb2.PongBatchResponse]:
+        async for batch in request_iterator:
+            yield await self.PingBatch(batch, context)
+
+
+@dataclass(slots=True)
+class ServerConfig:
+    address: str = "[::]:50051"
+    # limit on RPCs in flight for the whole server, None means unlimited
+    max_concurrent_rpcs: int | None = None
+    # limit on RPCs multiplexed over one HTTP/2 connection
+    max_concurrent_streams: int = 1000
+    keepalive_time_ms: int = 30_000
+    keepalive_timeout_ms: int = 10_000
+    compression: grpc.Compression = grpc.Compression.NoCompression
+    shutdown_grace: float = 10.0
+    # lets several processes bind the same address, kernel balances connections
+    reuse_port: bool = False
+    # port for prometheus /metrics, None means metrics are not exposed
+    metrics_port: int | None = None
+
+    def options(self) -> list[tuple[str, int]]:
+        return [
+            ("grpc.max_concurrent_streams", self.max_concurrent_streams),
+            ("grpc.keepalive_time_ms", self.keepalive_time_ms),
+            ("grpc.keepalive_timeout_ms", self.keepalive_timeout_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.min_ping_interval_without_data_ms", self.keepalive_time_ms),
+            ("grpc.so_reuseport", int(self.reuse_port)),
+        ]
+
+
+def create_server(config: ServerConfig) -> tuple[grpc.aio.Server, int]:
+    server = grpc.aio.server(
+        interceptors=[AsyncMetricsInterceptor()],
+        options=config.options(),
+        compression=config.compression,
+        maximum_concurrent_rpcs=config.max_concurrent_rpcs,
+    )
+    pb2_grpc.add_ExampleServicer_to_server(AsyncExampleService(), server)
+    port = server.add_insecure_port(config.address)
+
+    return server, port
+
+
+async def serve(config: ServerConfig) -> None:
+    server, port = create_server(config)
+    await server.start()
+    print(f"running async server on port {port}")
+
+    if config.metrics_port is not None:
+        start_http_server(config.metrics_port)
+        print(f"exposing metrics on port {config.metrics_port}")
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    await stopping.wait()
+
+    # new RPCs are rejected right away, in-flight ones get grace period to finish
+    print(f"draining in-flight RPCs for up to {config.shutdown_grace}s")
+    await server.stop(config.shutdown_grace)
+
+
+def parse_config() -> ServerConfig:
+    defaults = ServerConfig()
+    parser = argparse.ArgumentParser(description="ExampleService on grpc.aio")
+    parser.add_argument("--address", default=defaults.address)
+    parser.add_argument("--max-concurrent-rpcs", type=int)
+    parser.add_argument(
+        "--max-concurrent-streams", type=int, default=defaults.max_concurrent_streams
+    )
+    parser.add_argument(
+        "--keepalive-time-ms", type=int, default=defaults.keepalive_time_ms
+    )
+    parser.add_argument(
+        "--keepalive-timeout-ms", type=int, default=defaults.keepalive_timeout_ms
+    )
+    parser.add_argument("--metrics-port", type=int)
+    parser.add_argument("--compression", choices=COMPRESSIONS, default="none")
+    parser.add_argument("--shutdown-grace", type=float, default=defaults.shutdown_grace)
+    args = parser.parse_args()
+
+    return ServerConfig(
+        address=args.address,
+        max_concurrent_rpcs=args.max_concurrent_rpcs,
+        max_concurrent_streams=args.max_concurrent_streams,
+        keepalive_time_ms=args.keepalive_time_ms,
+        keepalive_timeout_ms=args.keepalive_timeout_ms,
+        compression=COMPRESSIONS[args.compression],
+        shutdown_grace=args.shutdown_grace,
+        metrics_port=args.metrics_port,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(serve(parse_config()))
@@ -0,0 +1,278 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Iterator
+
+import grpc
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+STREAM_MESSAGES_BUCKETS = (1, 2, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+_CODES_BY_VALUE = {code.value[0]: code for code in grpc.StatusCode}
+
+
+@dataclass(slots=True)
+class GrpcMetrics:
+    registry: CollectorRegistry = REGISTRY
+
+    handling_seconds: Histogram = field(init=False)
+    handled: Counter = field(init=False)
+    in_flight: Gauge = field(init=False)
+    stream_messages: Histogram = field(init=False)
+
+    def __post_init__(self) -> None:
+        labels = ("grpc_service", "grpc_method", "grpc_type")
+
+        self.handling_seconds = Histogram(
+            "grpc_server_handling_seconds",
+            "Time from RPC start to its completion, streams included",
+            labels,
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.handled = Counter(
+            "grpc_server_handled",
+            "Completed RPCs by status code",
+            (*labels, "grpc_code"),
+            registry=self.registry,
+        )
+        self.in_flight = Gauge(
+            "grpc_server_in_flight",
+            "RPCs started but not completed yet",
+            labels,
+            registry=self.registry,
+        )
+        self.stream_messages = Histogram(
+            "grpc_server_stream_messages",
+            "Messages received from / sent to client per streaming RPC",
+            (*labels, "direction"),
+            buckets=STREAM_MESSAGES_BUCKETS,
+            registry=self.registry,
+        )
+
+
+_default_metrics: GrpcMetrics | None = None
+
+
+def default_metrics() -> GrpcMetrics:
+    global _default_metrics
+
+    if _default_metrics is None:
+        _default_metrics = GrpcMetrics()
+
+    return _default_metrics
+
+
+def _rpc_type(handler: grpc.RpcMethodHandler) -> str:
+    return (
+        f"{'stream' if handler.request_streaming else 'unary'}_"
+        f"{'stream' if handler.response_streaming else 'unary'}"
+    )
+
+
+def _status_code(context, default: grpc.StatusCode) -> grpc.StatusCode:
+    code = context.code()
+
+    if code is None:
+        return default
+
+    return code if isinstance(code, grpc.StatusCode) else _CODES_BY_VALUE[code]
+
+
+@dataclass(slots=True)
+class _Call:
+    metrics: GrpcMetrics
+    labels: tuple[str, str, str]
+    request_streaming: bool
+    response_streaming: bool
+
+    started_at: float = field(init=False, default_factory=time.perf_counter)
+    received: int = field(init=False, default=0)
+    sent: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        self.metrics.in_flight.labels(*self.labels).inc()
+
+    def finish(self, code: grpc.StatusCode) -> None:
+        self.metrics.in_flight.labels(*self.labels).dec()
+        self.metrics.handling_seconds.labels(*self.labels).observe(
+            time.perf_counter() - self.started_at
+        )
+        self.metrics.handled.labels(*self.labels, code.name).inc()
+
+        if self.request_streaming:
+            self.metrics.stream_messages.labels(*self.labels, "received").observe(
+                self.received
+            )
+
+        if self.response_streaming:
+            self.metrics.stream_messages.labels(*self.labels, "sent").observe(self.sent)
+
+
+def _call_factory(
+    metrics: GrpcMetrics,
+    handler_call_details: grpc.HandlerCallDetails,
+    handler: grpc.RpcMethodHandler,
+) -> Callable[[], _Call]:
+    _, service, method = handler_call_details.method.split("/")
+    labels = (service, method, _rpc_type(handler))
+
+    return lambda: _Call(
+        metrics,
+        labels,
+        handler.request_streaming,
+        handler.response_streaming,
+    )
+
+
+def _rebuild_handler(handler: grpc.RpcMethodHandler, behavior) -> grpc.RpcMethodHandler:
+    factory = {
+        (False, False): grpc.unary_unary_rpc_method_handler,
+        (False, True): grpc.unary_stream_rpc_method_handler,
+        (True, False): grpc.stream_unary_rpc_method_handler,
+        (True, True): grpc.stream_stream_rpc_method_handler,
+    }[(handler.request_streaming, handler.response_streaming)]
+
+    return factory(
+        behavior,
+        request_deserializer=handler.request_deserializer,
+        response_serializer=handler.response_serializer,
+    )
+
+
+def _behavior(handler: grpc.RpcMethodHandler):
+    return (
+        handler.unary_unary
+        or handler.unary_stream
+        or handler.stream_unary
+        or handler.stream_stream
+    )
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    def __init__(self, metrics: GrpcMetrics | None = None) -> None:
+        self._metrics = metrics or default_metrics()
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+
+        if handler is None:
+            return None
+
+        new_call = _call_factory(self._metrics, handler_call_details, handler)
+        behavior = _behavior(handler)
+
+        def count_received(call: _Call, requests: Iterator) -> Iterator:
+            for request in requests:
+                call.received += 1
+                yield request
+
+        def track_sent(call: _Call, responses: Iterator, context) -> Iterator:
+            try:
+                for response in responses:
+                    call.sent += 1
+                    yield response
+            except GeneratorExit:
+                call.finish(grpc.StatusCode.CANCELLED)
+                raise
+            except BaseException:
+                call.finish(_status_code(context, grpc.StatusCode.UNKNOWN))
+                raise
+
+            call.finish(_status_code(context, grpc.StatusCode.OK))
+
+        def wrapper(request, context):
+            call = new_call()
+
+            if handler.request_streaming:
+                request = count_received(call, request)
+
+            if handler.response_streaming:
+                return track_sent(call, behavior(request, context), context)
+
+            try:
+                response = behavior(request, context)
+            except BaseException:
+                call.finish(_status_code(context, grpc.StatusCode.UNKNOWN))
+                raise
+
+            call.finish(_status_code(context, grpc.StatusCode.OK))
+            return response
+
+        return _rebuild_handler(handler, wrapper)
+
+
+class AsyncMetricsInterceptor(grpc.aio.ServerInterceptor):
+    def __init__(self, metrics: GrpcMetrics | None = None) -> None:
+        self._metrics = metrics or default_metrics()
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+
+        if handler is None:
+            return None
+
+        new_call = _call_factory(self._metrics, handler_call_details, handler)
+        behavior = _behavior(handler)
+
+        async def count_received(call: _Call, requests: AsyncIterator) -> AsyncIterator:
+            async for request in requests:
+                call.received += 1
+                yield request
+
+        async def track_sent(request, context) -> AsyncIterator:
+            call = new_call()
+
+            if handler.request_streaming:
+                request = count_received(call, request)
+
+            try:
+                async for response in behavior(request, context):
+                    call.sent += 1
+                    yield response
+            except (GeneratorExit, asyncio.CancelledError):
+                call.finish(grpc.StatusCode.CANCELLED)
+                raise
+            except BaseException:
+                call.finish(_status_code(context, grpc.StatusCode.UNKNOWN))
+                raise
+
+            call.finish(_status_code(context, grpc.StatusCode.OK))
+
+        async def wrapper(request, context):
+            call = new_call()
+
+            if handler.request_streaming:
+                request = count_received(call, request)
+
+            try:
+                response = await behavior(request, context)
+            except asyncio.CancelledError:
+                call.finish(grpc.StatusCode.CANCELLED)
+                raise
+            except BaseException:
+                call.finish(_status_code(context, grpc.StatusCode.UNKNOWN))
+                raise
+
+            call.finish(_status_code(context, grpc.StatusCode.OK))
+            return response
+
+        return _rebuild_handler(
+            handler, track_sent if handler.response_streaming else wrapper
+        )
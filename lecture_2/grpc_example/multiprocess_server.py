@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from dataclasses import dataclass, field, replace
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+
+from lecture_2.grpc_example.example_service_async import ServerConfig, serve
+
+# grpc does not survive fork after its core is initialized, spawn is safe
+_context = multiprocessing.get_context("spawn")
+
+
+def run_worker(config: ServerConfig) -> None:
+    asyncio.run(serve(config))
+
+
+@dataclass(slots=True)
+class Worker:
+    process: BaseProcess
+    started_at: float
+    # crashes in a row, each one doubles delay before the next restart
+    failures: int = 0
+    restart_at: float | None = None
+
+
+@dataclass(slots=True)
+class Supervisor:
+    config: ServerConfig
+    workers: int = os.cpu_count() or 1
+    min_restart_delay: float = 0.5
+    max_restart_delay: float = 30.0
+    # worker that lived at least that long is considered healthy again
+    stable_after: float = 10.0
+
+    _workers: dict[int, Worker] = field(init=False, default_factory=dict)
+    _stopping: bool = field(init=False, default=False)
+
+    def _spawn(self, slot: int, failures: int = 0) -> None:
+        process = _context.Process(
+            target=run_worker,
+            args=(self._worker_config(slot),),
+            name=f"grpc-worker-{slot}",
+        )
+        process.start()
+        self._workers[slot] = Worker(process, time.monotonic(), failures)
+        print(f"worker {slot} started with pid {process.pid}")
+
+    def _worker_config(self, slot: int) -> ServerConfig:
+        # workers can share grpc port, but not metrics port
+        if self.config.metrics_port is None:
+            return self.config
+
+        return replace(self.config, metrics_port=self.config.metrics_port + slot)
+
+    def _on_exit(self, slot: int, worker: Worker) -> None:
+        now = time.monotonic()
+
+        if now - worker.started_at >= self.stable_after:
+            worker.failures = 0
+
+        delay = min(
+            self.max_restart_delay,
+            self.min_restart_delay * 2**worker.failures,
+        )
+        worker.failures += 1
+        worker.restart_at = now + delay
+
+        print(
+            f"worker {slot} (pid {worker.process.pid}) exited with code "
+            f"{worker.process.exitcode}, restarting in {delay}s"
+        )
+
+    def stop(self, *_) -> None:
+        self._stopping = True
+
+    def run(self) -> None:
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        for slot in range(self.workers):
+            self._spawn(slot)
+
+        while not self._stopping:
+            alive = [w for w in self._workers.values() if w.process.is_alive()]
+            wait([w.process.sentinel for w in alive], timeout=0.5)
+
+            for slot, worker in list(self._workers.items()):
+                if self._stopping or worker.process.is_alive():
+                    continue
+
+                if worker.restart_at is None:
+                    self._on_exit(slot, worker)
+                elif worker.restart_at <= time.monotonic():
+                    self._spawn(slot, worker.failures)
+
+        self._shutdown()
+
+    def _shutdown(self) -> None:
+        for worker in self._workers.values():
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+        deadline = time.monotonic() + self.config.shutdown_grace + 5.0
+
+        for worker in self._workers.values():
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="ExampleService in N processes sharing one port (SO_REUSEPORT)"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--address", default=ServerConfig().address)
+    parser.add_argument("--shutdown-grace", type=float, default=5.0)
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="worker N exposes prometheus metrics on metrics-port + N",
+    )
+    args = parser.parse_args()
+
+    config = ServerConfig(
+        address=args.address,
+        shutdown_grace=args.shutdown_grace,
+        reuse_port=True,
+        metrics_port=args.metrics_port,
+    )
+    Supervisor(config, workers=args.workers).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nping.proto\x12\x07\x65xample\"\x1e\n\x0bPingRequest\x12\x0f\n\x07message\x18\x01 \x01(\t\"\x1f\n\x0cPongResponse\x12\x0f\n\x07message\x18\x01 \x01(\t2}\n\x07\x45xample\x12\x33\n\x04Ping\x12\x14.example.PingRequest\x1a\x15.example.PongResponse\x12=\n\nPingStream\x12\x14.example.PingRequest\x1a\x15.example.PongResponse(\x01\x30\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nping.proto\x12\x07\x65xample\"\x1e\n\x0bPingRequest\x12\x0f\n\x07message\x18\x01 \x01(\t\"\x1f\n\x0cPongResponse\x12\x0f\n\x07message\x18\x01 \x01(\t\":\n\x10PingBatchRequest\x12&\n\x08messages\x18\x01 \x03(\x0b\x32\x14.example.PingRequest\"<\n\x11PongBatchResponse\x12\'\n\x08messages\x18\x01 \x03(\x0b\x32\x15.example.PongResponse2\x8f\x02\n\x07\x45xample\x12\x33\n\x04Ping\x12\x14.example.PingRequest\x1a\x15.example.PongResponse\x12=\n\nPingStream\x12\x14.example.PingRequest\x1a\x15.example.PongResponse(\x01\x30\x01\x12\x42\n\tPingBatch\x12\x19.example.PingBatchRequest\x1a\x1a.example.PongBatchResponse\x12L\n\x0fPingBatchStream\x12\x19.example.PingBatchRequest\x1a\x1a.example.PongBatchResponse(\x01\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -35,6 +35,10 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_PINGREQUEST']._serialized_end=53
   _globals['_PONGRESPONSE']._serialized_start=55
   _globals['_PONGRESPONSE']._serialized_end=86
-  _globals['_EXAMPLE']._serialized_start=88
-  _globals['_EXAMPLE']._serialized_end=213
+  _globals['_PINGBATCHREQUEST']._serialized_start=88
+  _globals['_PINGBATCHREQUEST']._serialized_end=146
+  _globals['_PONGBATCHRESPONSE']._serialized_start=148
+  _globals['_PONGBATCHRESPONSE']._serialized_end=208
+  _globals['_EXAMPLE']._serialized_start=211
+  _globals['_EXAMPLE']._serialized_end=482
 # @@protoc_insertion_point(module_scope)
@@ -44,6 +44,16 @@ class ExampleStub(object):
                 request_serializer=ping__pb2.PingRequest.SerializeToString,
                 response_deserializer=ping__pb2.PongResponse.FromString,
                 _registered_method=True)
+        self.PingBatch = channel.unary_unary(
+                '/example.Example/PingBatch',
+                request_serializer=ping__pb2.PingBatchRequest.SerializeToString,
+                response_deserializer=ping__pb2.PongBatchResponse.FromString,
+                _registered_method=True)
+        self.PingBatchStream = channel.stream_stream(
+                '/example.Example/PingBatchStream',
+                request_serializer=ping__pb2.PingBatchRequest.SerializeToString,
+                response_deserializer=ping__pb2.PongBatchResponse.FromString,
+                _registered_method=True)
 
 
 class ExampleServicer(object):
@@ -61,6 +71,18 @@ class ExampleServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PingBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PingBatchStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ExampleServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -74,6 +96,16 @@ def add_ExampleServicer_to_server(servicer, server):
                     request_deserializer=ping__pb2.PingRequest.FromString,
                     response_serializer=ping__pb2.PongResponse.SerializeToString,
             ),
+            'PingBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.PingBatch,
+                    request_deserializer=ping__pb2.PingBatchRequest.FromString,
+                    response_serializer=ping__pb2.PongBatchResponse.SerializeToString,
+            ),
+            'PingBatchStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.PingBatchStream,
+                    request_deserializer=ping__pb2.PingBatchRequest.FromString,
+                    response_serializer=ping__pb2.PongBatchResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'example.Example', rpc_method_handlers)
@@ -138,3 +170,57 @@ class Example(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def PingBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/example.Example/PingBatch',
+            ping__pb2.PingBatchRequest.SerializeToString,
+            ping__pb2.PongBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PingBatchStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/example.Example/PingBatchStream',
+            ping__pb2.PingBatchRequest.SerializeToString,
+            ping__pb2.PongBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
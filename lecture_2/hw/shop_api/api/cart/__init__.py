@@ -0,0 +1,10 @@
+from .contracts import AddItemRequest, CartIdResponse, CartItemResponse, CartResponse
+from .routes import router
+
+__all__ = [
+    "AddItemRequest",
+    "CartIdResponse",
+    "CartItemResponse",
+    "CartResponse",
+    "router",
+]
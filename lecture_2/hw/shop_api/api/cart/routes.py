@@ -0,0 +1,114 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, Response
+from pydantic import NonNegativeFloat, NonNegativeInt, PositiveInt
+
+from lecture_2.hw.shop_api.api.dependencies import StoreDep, call
+
+from .contracts import AddItemRequest, CartIdResponse, CartResponse
+
+router = APIRouter(prefix="/cart")
+
+
+@router.post("", status_code=HTTPStatus.CREATED)
+async def post_cart(response: Response, store: StoreDep) -> CartIdResponse:
+    id = await call(store.create_cart)
+    response.headers["location"] = f"/cart/{id}"
+
+    return CartIdResponse(id=id)
+
+
+@router.get(
+    "/{id}",
+    responses={
+        HTTPStatus.OK: {
+            "description": "Successfully returned requested cart",
+        },
+        HTTPStatus.NOT_FOUND: {
+            "description": "Failed to return requested cart as one was not found",
+        },
+    },
+)
+async def get_cart(id: int, store: StoreDep) -> CartResponse:
+    entity = await call(store.get_cart, id)
+
+    if entity is None:
+        raise HTTPException(
+            HTTPStatus.NOT_FOUND,
+            f"Request resource /cart/{id} was not found",
+        )
+
+    return CartResponse.from_entity(entity)
+
+
+@router.get("")
+async def get_cart_list(
+    store: StoreDep,
+    offset: Annotated[NonNegativeInt, Query()] = 0,
+    limit: Annotated[PositiveInt, Query()] = 10,
+    min_price: Annotated[NonNegativeFloat | None, Query()] = None,
+    max_price: Annotated[NonNegativeFloat | None, Query()] = None,
+    min_quantity: Annotated[NonNegativeInt | None, Query()] = None,
+    max_quantity: Annotated[NonNegativeInt | None, Query()] = None,
+) -> list[CartResponse]:
+    carts = await call(
+        store.get_carts, offset, limit, min_price, max_price, min_quantity, max_quantity
+    )
+    return [CartResponse.from_entity(e) for e in carts]
+
+
+@router.post(
+    "/{cart_id}/add/{item_id}",
+    responses={
+        HTTPStatus.OK: {
+            "description": "Successfully added item to cart",
+        },
+        HTTPStatus.NOT_FOUND: {
+            "description": "Failed to add item as cart or item was not found",
+        },
+    },
+)
+async def add_item_to_cart(
+    cart_id: int,
+    item_id: int,
+    store: StoreDep,
+) -> CartResponse:
+    entity = await call(store.add_to_cart, cart_id, item_id)
+
+    if entity is None:
+        raise HTTPException(
+            HTTPStatus.NOT_FOUND,
+            f"Requested resource /cart/{cart_id} or /item/{item_id} was not found",
+        )
+
+    return CartResponse.from_entity(entity)
+
+
+@router.post(
+    "/{cart_id}/add",
+    responses={
+        HTTPStatus.OK: {
+            "description": "Successfully added all items to cart",
+        },
+        HTTPStatus.NOT_FOUND: {
+            "description": "Failed to add items as cart or any item was not found",
+        },
+    },
+)
+async def add_items_to_cart(
+    cart_id: int,
+    items: list[AddItemRequest],
+    store: StoreDep,
+) -> CartResponse:
+    entity = await call(
+        store.add_many_to_cart, cart_id, [(item.id, item.quantity) for item in items]
+    )
+
+    if entity is None:
+        raise HTTPException(
+            HTTPStatus.NOT_FOUND,
+            f"Requested resource /cart/{cart_id} or one of items was not found",
+        )
+
+    return CartResponse.from_entity(entity)
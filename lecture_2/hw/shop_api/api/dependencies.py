@@ -0,0 +1,22 @@
+from typing import Annotated, Callable
+
+from fastapi import Depends, Request
+from starlette.concurrency import run_in_threadpool
+
+from lecture_2.hw.shop_api.store import Store
+
+
+def store(request: Request) -> Store:
+    return request.app.state.store
+
+
+StoreDep = Annotated[Store, Depends(store)]
+
+
+async def call[**P, R](method: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+    # method is bound to a store; blocking ones go to the thread pool, the
+    # unstriped memory store answers in place without a thread hop
+    if method.__self__.blocking:
+        return await run_in_threadpool(method, *args, **kwargs)
+
+    return method(*args, **kwargs)
@@ -0,0 +1,17 @@
+from .contracts import (
+    ImportResponse,
+    ItemRequest,
+    ItemResponse,
+    PatchItemRequest,
+    TopItemResponse,
+)
+from .routes import router
+
+__all__ = [
+    "ImportResponse",
+    "ItemRequest",
+    "ItemResponse",
+    "PatchItemRequest",
+    "TopItemResponse",
+    "router",
+]
@@ -0,0 +1,132 @@
+import csv
+import json
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from pydantic import TypeAdapter, ValidationError
+
+from common.lines import utf8_lines
+from lecture_2.hw.shop_api.store.models import ItemInfo
+
+from .contracts import ItemRequest
+
+CSV_TYPES = ("text/csv",)
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+_rows = TypeAdapter(list[ItemRequest])
+_row = TypeAdapter(ItemRequest)
+
+
+@dataclass(slots=True)
+class BulkImportError(Exception):
+    # 1-based number of the first bad row; blank lines and csv header are not
+    # rows
+    row: int | None
+    errors: list
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # a body that is not utf-8 is rejected like a bad row; which row it is
+    # in is not known, because rows are counted only after decoding
+    try:
+        async for line in utf8_lines(chunks):
+            yield line
+    except UnicodeDecodeError as e:
+        raise BulkImportError(
+            None, [{"type": "utf8_invalid", "loc": [], "msg": str(e)}]
+        ) from e
+
+
+async def _csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # quoted field may contain newlines: record ends on a line where quotes
+    # are balanced (escaped quotes are doubled, so parity is kept)
+    record = []
+    quotes = 0
+
+    async for line in _lines(chunks):
+        record.append(line)
+        quotes += line.count('"')
+
+        if quotes % 2 == 0:
+            yield "\n".join(record)
+            record.clear()
+
+    if record:
+        yield "\n".join(record)
+
+
+def _validation_error(error: ValidationError, first_row: int) -> BulkImportError:
+    errors = json.loads(error.json(include_url=False))
+    loc = errors[0]["loc"]
+    row = first_row + loc[0] if loc and isinstance(loc[0], int) else None
+
+    return BulkImportError(row, errors)
+
+
+async def csv_batches(
+    chunks: AsyncIterator[bytes],
+    batch_size: int,
+) -> AsyncIterator[list[ItemInfo]]:
+    records = _csv_records(chunks)
+    header = next(csv.reader([await anext(records, "")]), [])
+    rows_done = 0
+    batch: list[str] = []
+
+    def validate() -> list[ItemInfo]:
+        rows = [dict(zip(header, values)) for values in csv.reader(batch)]
+
+        try:
+            return [request.as_item_info() for request in _rows.validate_python(rows)]
+        except ValidationError as e:
+            raise _validation_error(e, rows_done + 1) from e
+
+    async for record in records:
+        if not record.strip():
+            continue
+
+        batch.append(record)
+
+        if len(batch) == batch_size:
+            yield validate()
+            rows_done += len(batch)
+            batch.clear()
+
+    if batch:
+        yield validate()
+
+
+async def ndjson_batches(
+    chunks: AsyncIterator[bytes],
+    batch_size: int,
+) -> AsyncIterator[list[ItemInfo]]:
+    rows_done = 0
+    batch: list[str] = []
+
+    def validate() -> list[ItemInfo]:
+        # every line is parsed on its own: joined into one array, a line with
+        # two objects would pass as two rows and a syntax error would not
+        # point at its line
+        items = []
+
+        for row, line in enumerate(batch, rows_done + 1):
+            try:
+                items.append(_row.validate_json(line).as_item_info())
+            except ValidationError as e:
+                errors = json.loads(e.json(include_url=False))
+                raise BulkImportError(row, errors) from e
+
+        return items
+
+    async for line in _lines(chunks):
+        if not line.strip():
+            continue
+
+        batch.append(line)
+
+        if len(batch) == batch_size:
+            yield validate()
+            rows_done += len(batch)
+            batch.clear()
+
+    if batch:
+        yield validate()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, ConfigDict, NonNegativeFloat
+
+from lecture_2.hw.shop_api.store.models import (
+    ItemEntity,
+    ItemInfo,
+    PatchItemInfo,
+    TopItem,
+)
+
+
+class ItemResponse(BaseModel):
+    id: int
+    name: str
+    price: float
+    deleted: bool
+
+    @staticmethod
+    def from_entity(entity: ItemEntity) -> ItemResponse:
+        return ItemResponse(
+            id=entity.id,
+            name=entity.info.name,
+            price=entity.info.price,
+            deleted=entity.info.deleted,
+        )
+
+
+class ItemRequest(BaseModel):
+    name: str
+    price: NonNegativeFloat
+
+    def as_item_info(self) -> ItemInfo:
+        return ItemInfo(name=self.name, price=self.price)
+
+
+class PatchItemRequest(BaseModel):
+    name: str | None = None
+    price: NonNegativeFloat | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+    def as_patch_item_info(self) -> PatchItemInfo:
+        return PatchItemInfo(name=self.name, price=self.price)
+
+
+class TopItemResponse(BaseModel):
+    id: int
+    name: str
+    price: float
+    carted: int
+
+    @staticmethod
+    def from_top_item(top_item: TopItem) -> TopItemResponse:
+        return TopItemResponse(
+            id=top_item.id,
+            name=top_item.info.name,
+            price=top_item.info.price,
+            carted=top_item.carted,
+        )
+
+
+class ImportResponse(BaseModel):
+    imported: int
+    # [first, last] ids of imported rows, adjacent batches are merged
+    ids: list[tuple[int, int]]
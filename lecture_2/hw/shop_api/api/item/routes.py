@@ -0,0 +1,196 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import NonNegativeFloat, NonNegativeInt, PositiveInt
+
+from lecture_2.hw.shop_api.api.dependencies import StoreDep, call
+
+from .bulk import CSV_TYPES, NDJSON_TYPES, BulkImportError, csv_batches, ndjson_batches
+from .contracts import (
+    ImportResponse,
+    ItemRequest,
+    ItemResponse,
+    PatchItemRequest,
+    TopItemResponse,
+)
+
+router = APIRouter(prefix="/item")
+
+
+@router.post("", status_code=HTTPStatus.CREATED)
+async def post_item(
+    info: ItemRequest,
+    response: Response,
+    store: StoreDep,
+) -> ItemResponse:
+    entity = await call(store.add_item, info.as_item_info())
+    response.headers["location"] = f"/item/{entity.id}"
+
+    return ItemResponse.from_entity(entity)
+
+
+@router.post(
+    "/import",
+    status_code=HTTPStatus.CREATED,
+    responses={
+        HTTPStatus.CREATED: {
+            "description": "Successfully imported all rows",
+        },
+        HTTPStatus.UNPROCESSABLE_ENTITY: {
+            "description": "Import stopped at invalid row, earlier batches are kept",
+        },
+        HTTPStatus.UNSUPPORTED_MEDIA_TYPE: {
+            "description": "Body is neither CSV nor NDJSON",
+        },
+    },
+)
+async def import_items(
+    request: Request,
+    store: StoreDep,
+    batch_size: Annotated[PositiveInt, Query(le=10_000)] = 1000,
+) -> ImportResponse:
+    # body is read chunk by chunk, every batch is validated at once and
+    # inserted with one range of ids, so memory use does not grow with file
+    content_type = request.headers.get("content-type", "").partition(";")[0].strip()
+
+    if content_type in CSV_TYPES:
+        batches = csv_batches(request.stream(), batch_size)
+    elif content_type in NDJSON_TYPES:
+        batches = ndjson_batches(request.stream(), batch_size)
+    else:
+        raise HTTPException(
+            HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+            f"Expected one of {CSV_TYPES + NDJSON_TYPES}, got {content_type!r}",
+        )
+
+    imported = 0
+    ids: list[tuple[int, int]] = []
+
+    try:
+        async for infos in batches:
+            batch_ids = await call(store.add_items, infos)
+            imported += len(batch_ids)
+
+            if not batch_ids:
+                continue
+
+            if ids and ids[-1][1] + 1 == batch_ids.start:
+                ids[-1] = (ids[-1][0], batch_ids[-1])
+            else:
+                ids.append((batch_ids.start, batch_ids[-1]))
+    except BulkImportError as e:
+        raise HTTPException(
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            {"imported": imported, "ids": ids, "row": e.row, "errors": e.errors},
+        ) from e
+
+    return ImportResponse(imported=imported, ids=ids)
+
+
+@router.get("/top")
+async def get_top_items(
+    store: StoreDep,
+    k: Annotated[PositiveInt, Query(le=100)] = 10,
+) -> list[TopItemResponse]:
+    # ranking is kept up to date by add to cart, so this reads k entries
+    return [
+        TopItemResponse.from_top_item(top_item)
+        for top_item in await call(store.get_top_items, k)
+    ]
+
+
+@router.get(
+    "/{id}",
+    responses={
+        HTTPStatus.OK: {
+            "description": "Successfully returned requested item",
+        },
+        HTTPStatus.NOT_FOUND: {
+            "description": "Failed to return requested item as one was not found",
+        },
+    },
+)
+async def get_item(id: int, store: StoreDep) -> ItemResponse:
+    entity = await call(store.get_item, id)
+
+    if entity is None:
+        raise HTTPException(
+            HTTPStatus.NOT_FOUND,
+            f"Request resource /item/{id} was not found",
+        )
+
+    return ItemResponse.from_entity(entity)
+
+
+@router.get("")
+async def get_item_list(
+    store: StoreDep,
+    offset: Annotated[NonNegativeInt, Query()] = 0,
+    limit: Annotated[PositiveInt, Query()] = 10,
+    min_price: Annotated[NonNegativeFloat | None, Query()] = None,
+    max_price: Annotated[NonNegativeFloat | None, Query()] = None,
+    show_deleted: Annotated[bool, Query()] = False,
+) -> list[ItemResponse]:
+    return [
+        ItemResponse.from_entity(e)
+        for e in await call(
+            store.get_items, offset, limit, min_price, max_price, show_deleted
+        )
+    ]
+
+
+@router.put(
+    "/{id}",
+    responses={
+        HTTPStatus.OK: {
+            "description": "Successfully replaced item",
+        },
+        HTTPStatus.NOT_MODIFIED: {
+            "description": "Failed to replace item as one was not found",
+        },
+    },
+)
+async def put_item(id: int, info: ItemRequest, store: StoreDep) -> ItemResponse:
+    entity = await call(store.replace_item, id, info.as_item_info())
+
+    if entity is None:
+        raise HTTPException(
+            HTTPStatus.NOT_MODIFIED,
+            f"Requested resource /item/{id} was not found",
+        )
+
+    return ItemResponse.from_entity(entity)
+
+
+@router.patch(
+    "/{id}",
+    responses={
+        HTTPStatus.OK: {
+            "description": "Successfully patched item",
+        },
+        HTTPStatus.NOT_MODIFIED: {
+            "description": "Failed to patch item as one was not found or deleted",
+        },
+    },
+)
+async def patch_item(
+    id: int,
+    info: PatchItemRequest,
+    store: StoreDep,
+) -> ItemResponse:
+    entity = await call(store.patch_item, id, info.as_patch_item_info())
+
+    if entity is None:
+        raise HTTPException(
+            HTTPStatus.NOT_MODIFIED,
+            f"Requested resource /item/{id} was not found",
+        )
+
+    return ItemResponse.from_entity(entity)
+
+
+@router.delete("/{id}")
+async def delete_item(id: int, store: StoreDep) -> Response:
+    await call(store.delete_item, id)
+    return Response("")
@@ -0,0 +1,76 @@
+import argparse
+import random
+import sys
+import threading
+import time
+
+from common.benchmark import latency_summary, markdown_table
+from lecture_2.hw.shop_api.store import ItemInfo, MemoryStore
+
+
+def measure(stripes: int, args: argparse.Namespace) -> dict[str, object]:
+    store = MemoryStore(stripes=stripes)
+    items = [store.add_item(ItemInfo(f"item-{i}", 1.0)) for i in range(args.items)]
+    carts = [store.create_cart() for _ in range(args.carts)]
+    latencies: list[list[float]] = [[] for _ in range(args.threads)]
+    start = threading.Barrier(args.threads + 1)
+    deadline = 0.0
+
+    def worker(n: int) -> None:
+        rng = random.Random(n)
+        own = latencies[n]
+        start.wait()
+
+        while (started := time.perf_counter()) < deadline:
+            batch = [(rng.choice(items).id, 1) for _ in range(args.batch)]
+            store.add_many_to_cart(rng.choice(carts), batch)
+            own.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+
+    for thread in threads:
+        thread.start()
+
+    deadline = time.perf_counter() + args.duration
+    start.wait()
+
+    for thread in threads:
+        thread.join()
+
+    done = sum(len(own) for own in latencies)
+    summary = latency_summary(latency for own in latencies for latency in own)
+    # every added unit has to show up in cart totals, the rest were lost
+    lost = done * args.batch - sum(store.get_cart(id).quantity for id in carts)
+
+    return {
+        "stripes": stripes,
+        "threads": args.threads,
+        "batches/s": round(done / args.duration),
+        "p50_us": round(summary["p50"] * 1_000_000),
+        "p99_us": round(summary["p99"] * 1_000_000),
+        "lost_updates": lost,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="add to cart under contention")
+    parser.add_argument("--stripes", type=int, nargs="+", default=[1, 4, 64])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--carts", type=int, default=100, help="fewer is hotter")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=5, help="items per add call")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds")
+    parser.add_argument(
+        "--switch-interval",
+        type=float,
+        default=0.0001,
+        help="sys.setswitchinterval, lower makes threads interleave more",
+    )
+    args = parser.parse_args()
+
+    sys.setswitchinterval(args.switch_interval)
+    print(markdown_table([measure(stripes, args) for stripes in args.stripes]))
+
+
+if __name__ == "__main__":
+    main()
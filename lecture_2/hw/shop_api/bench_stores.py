@@ -0,0 +1,172 @@
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from common.benchmark import (
+    cpu_seconds,
+    latency_summary,
+    markdown_table,
+    run_server,
+    uvicorn_args,
+)
+from common.http_client import HttpConnection
+
+# request mix of tests/test_homework_2.py: reads of single resources, filtered
+# lists, adds to carts and a few item writes
+MIX = {
+    "get_item": 20,
+    "get_cart": 20,
+    "list_items": 15,
+    "list_carts": 15,
+    "add_to_cart": 20,
+    "post_cart": 4,
+    "patch_item": 4,
+    "delete_item": 2,
+}
+LIST_CARTS_QUERIES = (
+    "",
+    "?min_price=1000.0",
+    "?max_price=20.0",
+    "?min_quantity=1",
+    "?max_quantity=0",
+    "?offset=1&limit=2",
+)
+LIST_ITEMS_QUERIES = ("", "?min_price=100.0", "?max_price=400.0", "?show_deleted=true")
+
+
+async def setup(host: str, port: int, items: int, carts: int) -> tuple[list, list]:
+    rng = random.Random(0)
+    connection = await HttpConnection.open(host, port)
+
+    async def post(path: str, payload: object = None) -> int:
+        _, body = await connection.request(
+            "POST", path, json.dumps(payload).encode(), "application/json"
+        )
+        return json.loads(body)["id"]
+
+    item_ids = [
+        await post("/item", {"name": f"item {i}", "price": rng.uniform(10.0, 500.0)})
+        for i in range(items)
+    ]
+    cart_ids = []
+
+    for i in range(carts):
+        cart_id = await post("/cart")
+        cart_ids.append(cart_id)
+
+        for item_id in rng.choices(item_ids, k=i % 20):
+            await post(f"/cart/{cart_id}/add/{item_id}")
+
+    await connection.close()
+    return item_ids, cart_ids
+
+
+async def client(
+    host: str,
+    port: int,
+    seed: int,
+    deadline: float,
+    item_ids: list[int],
+    cart_ids: list[int],
+    latencies: dict[str, list[float]],
+) -> None:
+    rng = random.Random(seed)
+    connection = await HttpConnection.open(host, port)
+    kinds, weights = zip(*MIX.items())
+
+    while time.perf_counter() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        body, method = b"", "GET"
+
+        match kind:
+            case "get_item":
+                path = f"/item/{rng.choice(item_ids)}"
+            case "get_cart":
+                path = f"/cart/{rng.choice(cart_ids)}"
+            case "list_items":
+                path = f"/item{rng.choice(LIST_ITEMS_QUERIES)}"
+            case "list_carts":
+                path = f"/cart{rng.choice(LIST_CARTS_QUERIES)}"
+            case "add_to_cart":
+                method = "POST"
+                path = f"/cart/{rng.choice(cart_ids)}/add/{rng.choice(item_ids)}"
+            case "post_cart":
+                method, path = "POST", "/cart"
+            case "patch_item":
+                method, path = "PATCH", f"/item/{rng.choice(item_ids)}"
+                body = json.dumps({"price": rng.uniform(10.0, 500.0)}).encode()
+            case "delete_item":
+                method, path = "DELETE", f"/item/{rng.choice(item_ids)}"
+
+        started = time.perf_counter()
+        await connection.request(method, path, body, "application/json")
+        latencies[kind].append(time.perf_counter() - started)
+
+    await connection.close()
+
+
+async def run(args: argparse.Namespace, pid: int) -> dict[str, object]:
+    item_ids, cart_ids = await setup(args.host, args.port, args.items, args.carts)
+    latencies: dict[str, list[float]] = defaultdict(list)
+
+    cpu_before = cpu_seconds(pid)
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(
+        *(
+            client(args.host, args.port, n, deadline, item_ids, cart_ids, latencies)
+            for n in range(args.concurrency)
+        )
+    )
+    cpu_after = cpu_seconds(pid)
+
+    done = sum(len(values) for values in latencies.values())
+    summary = latency_summary(v for values in latencies.values() for v in values)
+    writes = latency_summary(latencies["add_to_cart"])
+
+    return {
+        "rps": round(done / args.duration),
+        "p50_ms": summary["p50"] * 1000,
+        "p99_ms": summary["p99"] * 1000,
+        "add_p99_ms": writes["p99"] * 1000,
+        "server_cpu_us_per_req": (
+            (cpu_after - cpu_before) / done * 1_000_000
+            if cpu_before is not None and cpu_after is not None and done
+            else float("nan")
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="memory vs sqlite shop store")
+    parser.add_argument("--stores", nargs="+", default=["memory", "sqlite"])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--carts", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    rows = []
+
+    for store in args.stores:
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                "SHOP_STORE": store,
+                "SHOP_SQLITE_PATH": str(Path(directory) / "shop.db"),
+            }
+            server = uvicorn_args("lecture_2.hw.shop_api.main:app", args.port)
+
+            with run_server(server, args.port, args.host, env) as process:
+                rows.append({"store": store, **asyncio.run(run(args, process.pid))})
+
+    print(markdown_table(rows))
+
+
+if __name__ == "__main__":
+    main()
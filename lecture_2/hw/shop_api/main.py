@@ -1,3 +1,25 @@
+import os
+
 from fastapi import FastAPI
 
+from lecture_2.hw.shop_api.api import cart, item
+from lecture_2.hw.shop_api.store import MemoryStore, SqliteStore, Store
+
+
+def create_store() -> Store:
+    # SHOP_STORE=sqlite keeps data on disk in SHOP_SQLITE_PATH; memory store
+    # stays on the event loop unless SHOP_MEMORY_STRIPES moves it to threads
+    match os.environ.get("SHOP_STORE", "memory"):
+        case "memory":
+            return MemoryStore(int(os.environ.get("SHOP_MEMORY_STRIPES", "0")))
+        case "sqlite":
+            return SqliteStore(os.environ.get("SHOP_SQLITE_PATH", "shop.db"))
+        case other:
+            raise ValueError(f"unknown SHOP_STORE {other!r}")
+
+
 app = FastAPI(title="Shop API")
+app.state.store = create_store()
+
+app.include_router(item.router)
+app.include_router(cart.router)
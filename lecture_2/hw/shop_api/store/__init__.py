@@ -0,0 +1,23 @@
+from .base import Store
+from .memory import MemoryStore
+from .models import (
+    CartEntity,
+    CartItem,
+    ItemEntity,
+    ItemInfo,
+    PatchItemInfo,
+    TopItem,
+)
+from .sqlite import SqliteStore
+
+__all__ = [
+    "CartEntity",
+    "CartItem",
+    "ItemEntity",
+    "ItemInfo",
+    "MemoryStore",
+    "PatchItemInfo",
+    "SqliteStore",
+    "Store",
+    "TopItem",
+]
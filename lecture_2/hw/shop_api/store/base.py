@@ -0,0 +1,61 @@
+from typing import Protocol, Sequence
+
+from lecture_2.hw.shop_api.store.models import (
+    CartEntity,
+    ItemEntity,
+    ItemInfo,
+    PatchItemInfo,
+    TopItem,
+)
+
+
+class Store(Protocol):
+    # blocking stores are called from the thread pool, so async handlers never
+    # wait on disk or locks inside the event loop
+    @property
+    def blocking(self) -> bool: ...
+
+    def add_item(self, info: ItemInfo) -> ItemEntity: ...
+
+    def add_items(self, infos: Sequence[ItemInfo]) -> range: ...
+
+    def get_item(self, id: int) -> ItemEntity | None: ...
+
+    def get_items(
+        self,
+        offset: int = 0,
+        limit: int = 10,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        show_deleted: bool = False,
+    ) -> list[ItemEntity]: ...
+
+    def get_top_items(self, k: int = 10) -> list[TopItem]: ...
+
+    def replace_item(self, id: int, info: ItemInfo) -> ItemEntity | None: ...
+
+    def patch_item(self, id: int, patch_info: PatchItemInfo) -> ItemEntity | None: ...
+
+    def delete_item(self, id: int) -> None: ...
+
+    def create_cart(self) -> int: ...
+
+    def get_cart(self, id: int) -> CartEntity | None: ...
+
+    def get_carts(
+        self,
+        offset: int = 0,
+        limit: int = 10,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_quantity: int | None = None,
+        max_quantity: int | None = None,
+    ) -> list[CartEntity]: ...
+
+    def add_to_cart(self, cart_id: int, item_id: int) -> CartEntity | None: ...
+
+    def add_many_to_cart(
+        self,
+        cart_id: int,
+        items: Sequence[tuple[int, int]],
+    ) -> CartEntity | None: ...
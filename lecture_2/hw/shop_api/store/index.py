@@ -0,0 +1,147 @@
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import Iterator
+
+type _Entry = tuple[float, int]
+
+
+@dataclass(slots=True)
+class SortedIndex:
+    # (key, id) pairs kept sorted in buckets of up to 2 * load entries: lookup is
+    # a bisect over bucket maximums plus a bisect inside one bucket, insert and
+    # remove shift at most one bucket instead of the whole list
+    load: int = 512
+
+    _buckets: list[list[_Entry]] = field(init=False, default_factory=list)
+    _maxes: list[_Entry] = field(init=False, default_factory=list)
+    _len: int = field(init=False, default=0)
+    # fenwick tree over bucket sizes (1-based), so the entry at a position and
+    # the position of an entry are found in O(log buckets); it is rebuilt only
+    # when a bucket is split or dropped, that is once per ~load changes
+    _sizes: list[int] = field(init=False, default_factory=lambda: [0])
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, key: float, id: int) -> None:
+        entry = (key, id)
+        self._len += 1
+
+        if not self._buckets:
+            self._buckets.append([entry])
+            self._maxes.append(entry)
+            self._rebuild_sizes()
+            return
+
+        i = min(bisect_left(self._maxes, entry), len(self._buckets) - 1)
+        bucket = self._buckets[i]
+        insort(bucket, entry)
+        self._maxes[i] = bucket[-1]
+
+        if len(bucket) > 2 * self.load:
+            self._buckets.insert(i + 1, bucket[self.load :])
+            self._maxes.insert(i + 1, bucket[-1])
+            del bucket[self.load :]
+            self._maxes[i] = bucket[-1]
+            self._rebuild_sizes()
+        else:
+            self._resize(i, 1)
+
+    def remove(self, key: float, id: int) -> None:
+        entry = (key, id)
+        i = bisect_left(self._maxes, entry)
+
+        if i == len(self._buckets):
+            raise KeyError(entry)
+
+        bucket = self._buckets[i]
+        j = bisect_left(bucket, entry)
+
+        if bucket[j] != entry:
+            raise KeyError(entry)
+
+        del bucket[j]
+        self._len -= 1
+
+        if bucket:
+            self._maxes[i] = bucket[-1]
+            self._resize(i, -1)
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+            self._rebuild_sizes()
+
+    def _rebuild_sizes(self) -> None:
+        sizes = [0] * (len(self._buckets) + 1)
+
+        for i, bucket in enumerate(self._buckets, 1):
+            sizes[i] += len(bucket)
+
+            if (parent := i + (i & -i)) < len(sizes):
+                sizes[parent] += sizes[i]
+
+        self._sizes = sizes
+
+    def _resize(self, i: int, delta: int) -> None:
+        i += 1
+
+        while i < len(self._sizes):
+            self._sizes[i] += delta
+            i += i & -i
+
+    def _position(self, entry: _Entry) -> int:
+        # number of entries before `entry`
+        i = bisect_left(self._maxes, entry)
+
+        if i == len(self._buckets):
+            return self._len
+
+        position = bisect_left(self._buckets[i], entry)
+
+        while i:
+            position += self._sizes[i]
+            i -= i & -i
+
+        return position
+
+    def _locate(self, position: int) -> tuple[int, int]:
+        # bucket and index inside it of the entry at `position`
+        i = 0
+        step = 1 << len(self._buckets).bit_length()
+
+        while step:
+            if i + step < len(self._sizes) and self._sizes[i + step] <= position:
+                i += step
+                position -= self._sizes[i]
+
+            step >>= 1
+
+        return i, position
+
+    def count(self, min_key: float | None = None, max_key: float | None = None) -> int:
+        # entries with min_key <= key <= max_key, without walking them
+        start = (float("-inf") if min_key is None else min_key, float("-inf"))
+        stop = (float("inf") if max_key is None else max_key, float("inf"))
+        return max(0, self._position(stop) - self._position(start))
+
+    def range(
+        self,
+        min_key: float | None = None,
+        max_key: float | None = None,
+        offset: int = 0,
+    ) -> Iterator[int]:
+        # ids with min_key <= key <= max_key ordered by (key, id); first offset
+        # of them are skipped by position, so a page costs O(log n + limit)
+        start = (float("-inf") if min_key is None else min_key, float("-inf"))
+        i, j = self._locate(self._position(start) + offset)
+
+        while i < len(self._buckets):
+            bucket = self._buckets[i]
+
+            for key, id in bucket[j:] if j else bucket:
+                if max_key is not None and key > max_key:
+                    return
+
+                yield id
+
+            i, j = i + 1, 0
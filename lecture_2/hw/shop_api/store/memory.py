@@ -0,0 +1,395 @@
+from contextlib import AbstractContextManager, ExitStack, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from itertools import islice
+from threading import Lock
+from typing import Iterable, Iterator, Sequence
+
+from lecture_2.hw.shop_api.store.index import SortedIndex
+from lecture_2.hw.shop_api.store.models import (
+    CartEntity,
+    CartItem,
+    ItemEntity,
+    ItemInfo,
+    PatchItemInfo,
+    TopItem,
+    from_units,
+    to_units,
+)
+
+
+@dataclass(slots=True)
+class _Cart:
+    # item id -> quantity, in order of the first addition
+    quantities: dict[int, int] = field(default_factory=dict)
+    # running totals, so listing carts never walks their items; price is in
+    # integer units of to_units
+    price: int = 0
+    quantity: int = 0
+    # delete stamp the price was last reconciled at
+    synced: int = 0
+
+
+@dataclass(slots=True)
+class MemoryStore:
+    # 0 is for the event loop: calls never overlap there, so the store takes
+    # no locks and is called in place. With stripes it is safe to call from
+    # many threads, and handlers call it from the thread pool
+    stripes: int = 0
+
+    # locking order: cart stripe (several in ascending order) first, then the
+    # shared lock, never the other way round. Stripe guards contents of its
+    # carts, shared lock guards tables, indexes and counters and is held only
+    # for short updates. Item prices change under all stripes, so a cart
+    # stripe also pins prices of its items
+    _cart_locks: list[AbstractContextManager] = field(init=False)
+    _lock: AbstractContextManager = field(init=False)
+    _items: dict[int, ItemInfo] = field(init=False, default_factory=dict)
+    _carts: dict[int, _Cart] = field(init=False, default_factory=dict)
+    # item id -> ids of carts containing it, so a price change touches only them
+    _item_carts: dict[int, set[int]] = field(init=False, default_factory=dict)
+    # not deleted item ids in order of creation, keyed by id, so a page at any
+    # offset is a seek; all items and all carts need no index, their ids are
+    # 1..last id without gaps
+    _live_items: SortedIndex = field(init=False, default_factory=SortedIndex)
+    # range indexes for filtered lists, kept up to date on every mutation;
+    # carts are indexed by price units, so filters compare exact totals
+    _items_by_price: SortedIndex = field(init=False, default_factory=SortedIndex)
+    _live_items_by_price: SortedIndex = field(init=False, default_factory=SortedIndex)
+    _carts_by_price: SortedIndex = field(init=False, default_factory=SortedIndex)
+    _carts_by_quantity: SortedIndex = field(init=False, default_factory=SortedIndex)
+    # item id -> units ever added to carts, live carted items are ranked by
+    # negated count, so the most carted ones come first in the index
+    _carted: dict[int, int] = field(init=False, default_factory=dict)
+    _items_by_carted: SortedIndex = field(init=False, default_factory=SortedIndex)
+    # item id -> delete stamp, carts synced before it still count its price
+    _deleted_at: dict[int, int] = field(init=False, default_factory=dict)
+    # deleted items whose carts were not reconciled yet
+    _pending_deletes: set[int] = field(init=False, default_factory=set)
+    _last_delete: int = field(init=False, default=0)
+    _last_item_id: int = field(init=False, default=0)
+    _last_cart_id: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        if self.stripes:
+            self._cart_locks = [Lock() for _ in range(self.stripes)]
+            self._lock = Lock()
+        else:
+            self._cart_locks = [nullcontext()]
+            self._lock = nullcontext()
+
+    @property
+    def blocking(self) -> bool:
+        # striped store waits on locks, so it is kept off the event loop
+        return self.stripes > 0
+
+    def _cart_lock(self, id: int) -> AbstractContextManager:
+        return self._cart_locks[id % len(self._cart_locks)]
+
+    @contextmanager
+    def _all_cart_locks(self) -> Iterator[None]:
+        # ascending order, so two writers taking all stripes never deadlock
+        with ExitStack() as stack:
+            for lock in self._cart_locks:
+                stack.enter_context(lock)
+
+            yield
+
+    def add_item(self, info: ItemInfo) -> ItemEntity:
+        return ItemEntity(self.add_items([info])[0], info)
+
+    def add_items(self, infos: Sequence[ItemInfo]) -> range:
+        # whole batch gets one range of ids under one lock acquisition
+        with self._lock:
+            ids = range(self._last_item_id + 1, self._last_item_id + 1 + len(infos))
+            self._last_item_id += len(infos)
+
+            for id, info in zip(ids, infos):
+                self._items[id] = info
+                self._item_carts[id] = set()
+                self._live_items.add(id, id)
+                self._items_by_price.add(info.price, id)
+                self._live_items_by_price.add(info.price, id)
+
+        return ids
+
+    def get_item(self, id: int) -> ItemEntity | None:
+        info = self._items.get(id)
+
+        if info is None or info.deleted:
+            return None
+
+        return ItemEntity(id, info)
+
+    def get_items(
+        self,
+        offset: int = 0,
+        limit: int = 10,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        show_deleted: bool = False,
+    ) -> list[ItemEntity]:
+        with self._lock:
+            if min_price is None and max_price is None and show_deleted:
+                page = _id_page(self._last_item_id, offset, limit)
+            elif min_price is None and max_price is None:
+                page = islice(self._live_items.range(offset=offset), limit)
+            else:
+                index = (
+                    self._items_by_price if show_deleted else self._live_items_by_price
+                )
+                page = islice(index.range(min_price, max_price, offset), limit)
+
+            return [ItemEntity(id, self._items[id]) for id in page]
+
+    def get_top_items(self, k: int = 10) -> list[TopItem]:
+        with self._lock:
+            return [
+                TopItem(id, self._items[id], self._carted[id])
+                for id in islice(self._items_by_carted.range(), k)
+            ]
+
+    def replace_item(self, id: int, info: ItemInfo) -> ItemEntity | None:
+        with self._all_cart_locks(), self._lock:
+            if self.get_item(id) is None:
+                return None
+
+            self._set_price(id, info.price)
+            self._items[id].name = info.name
+
+            return ItemEntity(id, self._items[id])
+
+    def patch_item(self, id: int, patch_info: PatchItemInfo) -> ItemEntity | None:
+        cart_locks = (
+            nullcontext() if patch_info.price is None else self._all_cart_locks()
+        )
+
+        with cart_locks, self._lock:
+            if self.get_item(id) is None:
+                return None
+
+            if patch_info.price is not None:
+                self._set_price(id, patch_info.price)
+
+            if patch_info.name is not None:
+                self._items[id].name = patch_info.name
+
+            return ItemEntity(id, self._items[id])
+
+    def delete_item(self, id: int) -> None:
+        with self._lock:
+            info = self._items.get(id)
+
+            if info is None or info.deleted:
+                return
+
+            info.deleted = True
+            self._live_items.remove(id, id)
+            self._live_items_by_price.remove(info.price, id)
+
+            if id in self._carted:
+                self._items_by_carted.remove(-self._carted[id], id)
+
+            # carts are not touched here: deleted items do not count towards
+            # cart price, and each cart subtracts them when it is read next time
+            self._last_delete += 1
+            self._deleted_at[id] = self._last_delete
+            self._pending_deletes.add(id)
+
+    def _set_price(self, id: int, price: float) -> None:
+        # caller holds all cart stripes and the shared lock
+        info = self._items[id]
+        delta = to_units(price) - to_units(info.price)
+
+        self._items_by_price.remove(info.price, id)
+        self._live_items_by_price.remove(info.price, id)
+        info.price = price
+        self._items_by_price.add(price, id)
+        self._live_items_by_price.add(price, id)
+
+        if delta == 0:
+            return
+
+        for cart_id in self._item_carts[id]:
+            cart = self._carts[cart_id]
+            self._update_cart(cart_id, cart, delta * cart.quantities[id], 0)
+
+    def _update_cart(
+        self,
+        id: int,
+        cart: _Cart,
+        price_delta: int,
+        quantity_delta: int,
+    ) -> None:
+        # caller holds the cart stripe and the shared lock
+        if price_delta:
+            self._carts_by_price.remove(cart.price, id)
+            cart.price += price_delta
+            self._carts_by_price.add(cart.price, id)
+
+        if quantity_delta:
+            self._carts_by_quantity.remove(cart.quantity, id)
+            cart.quantity += quantity_delta
+            self._carts_by_quantity.add(cart.quantity, id)
+
+    def _sync_cart(self, id: int, cart: _Cart) -> None:
+        # caller holds the cart stripe
+        with self._lock:
+            if cart.synced == self._last_delete:
+                return
+
+            price_delta = 0
+
+            for item_id, quantity in cart.quantities.items():
+                if self._deleted_at.get(item_id, 0) > cart.synced:
+                    price_delta -= to_units(self._items[item_id].price) * quantity
+
+            cart.synced = self._last_delete
+            self._update_cart(id, cart, price_delta, 0)
+
+    def _sync_pending_deletes(self) -> None:
+        # price filters need every cart total up to date, deleted items do not
+        # change price anymore, so their carts can be forgotten afterwards
+        with self._lock:
+            cart_ids = set[int]().union(
+                *(self._item_carts.pop(item_id) for item_id in self._pending_deletes)
+            )
+            self._pending_deletes.clear()
+
+        for cart_id in sorted(cart_ids):
+            with self._cart_lock(cart_id):
+                self._sync_cart(cart_id, self._carts[cart_id])
+
+    def create_cart(self) -> int:
+        with self._lock:
+            self._last_cart_id += 1
+            id = self._last_cart_id
+            self._carts[id] = _Cart(synced=self._last_delete)
+            self._carts_by_price.add(0, id)
+            self._carts_by_quantity.add(0, id)
+
+        return id
+
+    def get_cart(self, id: int) -> CartEntity | None:
+        cart = self._carts.get(id)
+
+        if cart is None:
+            return None
+
+        with self._cart_lock(id):
+            return self._as_entity(id, cart)
+
+    def get_carts(
+        self,
+        offset: int = 0,
+        limit: int = 10,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_quantity: int | None = None,
+        max_quantity: int | None = None,
+    ) -> list[CartEntity]:
+        price_filter = min_price is not None or max_price is not None
+        quantity_filter = min_quantity is not None or max_quantity is not None
+
+        if price_filter:
+            self._sync_pending_deletes()
+            min_units = None if min_price is None else to_units(min_price)
+            max_units = None if max_price is None else to_units(max_price)
+
+        with self._lock:
+            if price_filter and quantity_filter:
+                # walk the price range, quantity is checked on the running total:
+                # unlike the other pages this costs O(carts in the price range),
+                # one sorted index cannot seek by two keys at once
+                ids: Iterable[int] = islice(
+                    (
+                        id
+                        for id in self._carts_by_price.range(min_units, max_units)
+                        if (
+                            min_quantity is None
+                            or self._carts[id].quantity >= min_quantity
+                        )
+                        and (
+                            max_quantity is None
+                            or self._carts[id].quantity <= max_quantity
+                        )
+                    ),
+                    offset,
+                    None,
+                )
+            elif price_filter:
+                ids = self._carts_by_price.range(min_units, max_units, offset)
+            elif quantity_filter:
+                ids = self._carts_by_quantity.range(min_quantity, max_quantity, offset)
+            else:
+                ids = _id_page(self._last_cart_id, offset, limit)
+
+            page = list(islice(ids, limit))
+
+        # carts are read one by one, a page is not a snapshot of the whole store
+        return [cart for id in page if (cart := self.get_cart(id)) is not None]
+
+    def add_to_cart(self, cart_id: int, item_id: int) -> CartEntity | None:
+        return self.add_many_to_cart(cart_id, [(item_id, 1)])
+
+    def add_many_to_cart(
+        self,
+        cart_id: int,
+        items: Sequence[tuple[int, int]],
+    ) -> CartEntity | None:
+        # (item id, quantity) pairs are added all at once, or none of them if
+        # the cart or any item was not found
+        cart = self._carts.get(cart_id)
+
+        if cart is None:
+            return None
+
+        # stripe, then the shared lock, see locking order above
+        with self._cart_lock(cart_id):
+            with self._lock:
+                if any(self.get_item(item_id) is None for item_id, _ in items):
+                    return None
+
+                # registered before totals change, so a delete racing with us is
+                # reconciled against quantities that include this batch
+                for item_id, quantity in items:
+                    self._item_carts[item_id].add(cart_id)
+                    self._count_carted(item_id, quantity)
+
+            price_delta = 0
+            quantity_delta = 0
+
+            for item_id, quantity in items:
+                cart.quantities[item_id] = cart.quantities.get(item_id, 0) + quantity
+                price_delta += to_units(self._items[item_id].price) * quantity
+                quantity_delta += quantity
+
+            with self._lock:
+                self._update_cart(cart_id, cart, price_delta, quantity_delta)
+
+            return self._as_entity(cart_id, cart)
+
+    def _count_carted(self, id: int, quantity: int) -> None:
+        # caller holds the shared lock, item is not deleted
+        count = self._carted.get(id, 0)
+
+        if count:
+            self._items_by_carted.remove(-count, id)
+
+        self._carted[id] = count + quantity
+        self._items_by_carted.add(-(count + quantity), id)
+
+    def _as_entity(self, id: int, cart: _Cart) -> CartEntity:
+        # caller holds the cart stripe
+        self._sync_cart(id, cart)
+        items = []
+
+        for item_id, quantity in cart.quantities.items():
+            info = self._items[item_id]
+            items.append(CartItem(item_id, info.name, quantity, not info.deleted))
+
+        return CartEntity(id, items, from_units(cart.price), cart.quantity)
+
+
+def _id_page(last_id: int, offset: int, limit: int) -> range:
+    # ids 1..last_id without gaps in id order
+    return range(offset + 1, min(offset + limit, last_id) + 1)
@@ -0,0 +1,58 @@
+from dataclasses import dataclass, field
+
+# cart totals are sums over many item prices, stores keep them as integer
+# numbers of 1/PRICE_SCALE price units, so they never drift from the sum of
+# their items and an emptied cart costs exactly 0
+PRICE_SCALE = 10**9
+
+
+def to_units(price: float) -> int:
+    return round(price * PRICE_SCALE)
+
+
+def from_units(units: int) -> float:
+    return units / PRICE_SCALE
+
+
+@dataclass(slots=True)
+class ItemInfo:
+    name: str
+    price: float
+    deleted: bool = False
+
+
+@dataclass(slots=True)
+class ItemEntity:
+    id: int
+    info: ItemInfo
+
+
+@dataclass(slots=True)
+class TopItem:
+    id: int
+    info: ItemInfo
+    # units of the item added to carts over all time
+    carted: int
+
+
+@dataclass(slots=True)
+class PatchItemInfo:
+    name: str | None = None
+    price: float | None = None
+
+
+@dataclass(slots=True)
+class CartItem:
+    id: int
+    name: str
+    quantity: int
+    available: bool
+
+
+@dataclass(slots=True)
+class CartEntity:
+    id: int
+    items: list[CartItem] = field(default_factory=list)
+    # total price of available items, total quantity of all items
+    price: float = 0.0
+    quantity: int = 0
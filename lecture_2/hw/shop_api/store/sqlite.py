@@ -0,0 +1,367 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import ClassVar, Iterator, Sequence
+
+from lecture_2.hw.shop_api.store.models import (
+    CartEntity,
+    CartItem,
+    ItemEntity,
+    ItemInfo,
+    PatchItemInfo,
+    TopItem,
+    from_units,
+    to_units,
+)
+
+# cart totals are stored next to the cart and updated in the same transaction
+# as its items, in integer units of to_units like in memory store, so they do
+# not drift; every list filter has an index to range scan
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    price REAL NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    carted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS items_price ON items (price);
+CREATE INDEX IF NOT EXISTS items_live_price ON items (price) WHERE deleted = 0;
+CREATE INDEX IF NOT EXISTS items_live_carted ON items (carted DESC, id)
+    WHERE deleted = 0 AND carted > 0;
+
+CREATE TABLE IF NOT EXISTS carts (
+    id INTEGER PRIMARY KEY,
+    price_units INTEGER NOT NULL DEFAULT 0,
+    quantity INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS carts_price ON carts (price_units);
+CREATE INDEX IF NOT EXISTS carts_quantity ON carts (quantity);
+
+CREATE TABLE IF NOT EXISTS cart_items (
+    cart_id INTEGER NOT NULL REFERENCES carts (id),
+    item_id INTEGER NOT NULL REFERENCES items (id),
+    quantity INTEGER NOT NULL,
+    UNIQUE (cart_id, item_id)
+);
+CREATE INDEX IF NOT EXISTS cart_items_item ON cart_items (item_id);
+"""
+
+# statements are kept as constants, so sqlite3 statement cache of every
+# connection prepares each of them only once
+_ADD_ITEM = "INSERT INTO items (name, price) VALUES (?, ?)"
+_LAST_ITEM_ID = "SELECT COALESCE(MAX(id), 0) FROM items"
+_ADD_ITEM_WITH_ID = "INSERT INTO items (id, name, price) VALUES (?, ?, ?)"
+_GET_TOP_ITEMS = """
+SELECT id, name, price, carted FROM items
+WHERE deleted = 0 AND carted > 0
+ORDER BY carted DESC, id
+LIMIT ?
+"""
+_COUNT_CARTED = "UPDATE items SET carted = carted + ? WHERE id = ?"
+_GET_ITEM = "SELECT name, price FROM items WHERE id = ? AND deleted = 0"
+_SET_ITEM = "UPDATE items SET name = ?, price = ? WHERE id = ?"
+_DELETE_ITEM = "UPDATE items SET deleted = 1 WHERE id = ?"
+_SHIFT_CART_PRICES = """
+UPDATE carts SET price_units = carts.price_units + ? * cart_items.quantity
+FROM cart_items WHERE cart_items.cart_id = carts.id AND cart_items.item_id = ?
+"""
+_CREATE_CART = "INSERT INTO carts DEFAULT VALUES"
+_GET_CART = "SELECT id, price_units, quantity FROM carts WHERE id = ?"
+_GET_CART_ITEMS = """
+SELECT cart_items.item_id, items.name, cart_items.quantity, items.deleted
+FROM cart_items JOIN items ON items.id = cart_items.item_id
+WHERE cart_items.cart_id = ?
+ORDER BY cart_items.rowid
+"""
+_ADD_CART_ITEM = """
+INSERT INTO cart_items (cart_id, item_id, quantity) VALUES (?, ?, ?)
+ON CONFLICT (cart_id, item_id) DO UPDATE SET quantity = quantity + excluded.quantity
+"""
+_ADD_TO_CART_TOTALS = """
+UPDATE carts SET price_units = price_units + ?, quantity = quantity + ?
+WHERE id = ?
+"""
+
+
+@dataclass(slots=True)
+class SqliteStore:
+    blocking: ClassVar[bool] = True
+
+    path: str = "shop.db"
+
+    _local: threading.local = field(init=False, default_factory=threading.local)
+    _connections: list[sqlite3.Connection] = field(init=False, default_factory=list)
+    _connections_lock: threading.Lock = field(
+        init=False, default_factory=threading.Lock
+    )
+
+    def __post_init__(self) -> None:
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite connections must not be shared between threads, so every
+        # thread of the pool opens its own one and keeps it
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=64,
+            )
+            # WAL lets readers run next to the single writer
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute("PRAGMA busy_timeout = 5000")
+            self._local.connection = connection
+
+            with self._connections_lock:
+                self._connections.append(connection)
+
+        return connection
+
+    @contextmanager
+    def _transaction(self, write: bool = True) -> Iterator[sqlite3.Connection]:
+        # writers take the lock upfront, so two of them never deadlock trying
+        # to upgrade a read lock; readers get one consistent snapshot
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+
+            self._connections.clear()
+
+        self._local = threading.local()
+
+    def add_item(self, info: ItemInfo) -> ItemEntity:
+        with self._transaction() as connection:
+            cursor = connection.execute(_ADD_ITEM, (info.name, info.price))
+
+        return ItemEntity(cursor.lastrowid, ItemInfo(info.name, info.price))
+
+    def add_items(self, infos: Sequence[ItemInfo]) -> range:
+        # ids of the batch are reserved as one range inside the write
+        # transaction, rows are then inserted with one executemany
+        with self._transaction() as connection:
+            (last_id,) = connection.execute(_LAST_ITEM_ID).fetchone()
+            ids = range(last_id + 1, last_id + 1 + len(infos))
+            connection.executemany(
+                _ADD_ITEM_WITH_ID,
+                [(id, info.name, info.price) for id, info in zip(ids, infos)],
+            )
+
+        return ids
+
+    def get_item(self, id: int) -> ItemEntity | None:
+        row = self._connection().execute(_GET_ITEM, (id,)).fetchone()
+
+        if row is None:
+            return None
+
+        return ItemEntity(id, ItemInfo(*row))
+
+    def get_items(
+        self,
+        offset: int = 0,
+        limit: int = 10,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        show_deleted: bool = False,
+    ) -> list[ItemEntity]:
+        conditions = [] if show_deleted else ["deleted = 0"]
+        params: list[object] = []
+
+        if min_price is not None:
+            conditions.append("price >= ?")
+            params.append(min_price)
+
+        if max_price is not None:
+            conditions.append("price <= ?")
+            params.append(max_price)
+
+        # same order as memory store: by price when filtered by it, else by id
+        price_filter = min_price is not None or max_price is not None
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT id, name, price, deleted FROM items"
+                f"{_where(conditions)}"
+                f" ORDER BY {'price, id' if price_filter else 'id'}"
+                " LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            )
+            .fetchall()
+        )
+
+        return [
+            ItemEntity(id, ItemInfo(name, price, bool(deleted)))
+            for id, name, price, deleted in rows
+        ]
+
+    def get_top_items(self, k: int = 10) -> list[TopItem]:
+        rows = self._connection().execute(_GET_TOP_ITEMS, (k,)).fetchall()
+
+        return [
+            TopItem(id, ItemInfo(name, price), carted)
+            for id, name, price, carted in rows
+        ]
+
+    def replace_item(self, id: int, info: ItemInfo) -> ItemEntity | None:
+        return self.patch_item(id, PatchItemInfo(info.name, info.price))
+
+    def patch_item(self, id: int, patch_info: PatchItemInfo) -> ItemEntity | None:
+        with self._transaction() as connection:
+            row = connection.execute(_GET_ITEM, (id,)).fetchone()
+
+            if row is None:
+                return None
+
+            name, price = row
+            info = ItemInfo(
+                name if patch_info.name is None else patch_info.name,
+                price if patch_info.price is None else patch_info.price,
+            )
+            connection.execute(_SET_ITEM, (info.name, info.price, id))
+
+            if delta := to_units(info.price) - to_units(price):
+                connection.execute(_SHIFT_CART_PRICES, (delta, id))
+
+        return ItemEntity(id, info)
+
+    def delete_item(self, id: int) -> None:
+        # a single statement walks carts of the item through cart_items_item,
+        # so sqlite does not need lazy reconciliation memory store has
+        with self._transaction() as connection:
+            row = connection.execute(_GET_ITEM, (id,)).fetchone()
+
+            if row is None:
+                return
+
+            connection.execute(_DELETE_ITEM, (id,))
+            connection.execute(_SHIFT_CART_PRICES, (-to_units(row[1]), id))
+
+    def create_cart(self) -> int:
+        with self._transaction() as connection:
+            return connection.execute(_CREATE_CART).lastrowid
+
+    def get_cart(self, id: int) -> CartEntity | None:
+        with self._transaction(write=False) as connection:
+            row = connection.execute(_GET_CART, (id,)).fetchone()
+
+            if row is None:
+                return None
+
+            return _as_entity(connection, *row)
+
+    def get_carts(
+        self,
+        offset: int = 0,
+        limit: int = 10,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_quantity: int | None = None,
+        max_quantity: int | None = None,
+    ) -> list[CartEntity]:
+        conditions = []
+        params: list[object] = []
+
+        for condition, value in (
+            ("price_units >= ?", None if min_price is None else to_units(min_price)),
+            ("price_units <= ?", None if max_price is None else to_units(max_price)),
+            ("quantity >= ?", min_quantity),
+            ("quantity <= ?", max_quantity),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+
+        if min_price is not None or max_price is not None:
+            order = "price_units, id"
+        elif min_quantity is not None or max_quantity is not None:
+            order = "quantity, id"
+        else:
+            order = "id"
+
+        with self._transaction(write=False) as connection:
+            rows = connection.execute(
+                f"SELECT id, price_units, quantity FROM carts{_where(conditions)}"
+                f" ORDER BY {order} LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+
+            return [_as_entity(connection, *row) for row in rows]
+
+    def add_to_cart(self, cart_id: int, item_id: int) -> CartEntity | None:
+        return self.add_many_to_cart(cart_id, [(item_id, 1)])
+
+    def add_many_to_cart(
+        self,
+        cart_id: int,
+        items: Sequence[tuple[int, int]],
+    ) -> CartEntity | None:
+        with self._transaction() as connection:
+            cart = connection.execute(_GET_CART, (cart_id,)).fetchone()
+
+            if cart is None:
+                return None
+
+            price = 0
+
+            for item_id, quantity in items:
+                row = connection.execute(_GET_ITEM, (item_id,)).fetchone()
+
+                if row is None:
+                    return None
+
+                price += to_units(row[1]) * quantity
+
+            connection.executemany(
+                _ADD_CART_ITEM,
+                [(cart_id, item_id, quantity) for item_id, quantity in items],
+            )
+            connection.executemany(
+                _COUNT_CARTED,
+                [(quantity, item_id) for item_id, quantity in items],
+            )
+            connection.execute(
+                _ADD_TO_CART_TOTALS,
+                (price, sum(quantity for _, quantity in items), cart_id),
+            )
+
+            cart = connection.execute(_GET_CART, (cart_id,)).fetchone()
+
+            return _as_entity(connection, *cart)
+
+
+def _where(conditions: list[str]) -> str:
+    return f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+def _as_entity(
+    connection: sqlite3.Connection,
+    id: int,
+    price: int,
+    quantity: int,
+) -> CartEntity:
+    items = [
+        CartItem(item_id, name, item_quantity, not deleted)
+        for item_id, name, item_quantity, deleted in connection.execute(
+            _GET_CART_ITEMS, (id,)
+        )
+    ]
+
+    return CartEntity(id, items, from_units(price), quantity)
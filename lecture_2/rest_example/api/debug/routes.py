@@ -0,0 +1,32 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+
+from common.debug_auth import requires_debug_token
+from common.memory import MemoryProfiler
+from lecture_2.rest_example import store
+
+router = APIRouter(prefix="/debug", dependencies=[Depends(requires_debug_token)])
+memory_profiler = MemoryProfiler()
+
+
+@router.post("/memory/start")
+async def start_memory_tracing() -> dict[str, object]:
+    # tracemalloc runs from here until /debug/memory/stop, reports are diffed
+    # against the snapshot taken now
+    memory_profiler.start()
+    return {"tracing": memory_profiler.tracing}
+
+
+@router.post("/memory/stop")
+async def stop_memory_tracing() -> dict[str, object]:
+    memory_profiler.stop()
+    return {"tracing": memory_profiler.tracing}
+
+
+@router.get("/memory")
+async def memory(
+    top: Annotated[int, Query(ge=1, le=100)] = 20,
+) -> dict[str, object]:
+    # store sizes always, allocations by module only while tracing
+    return memory_profiler.report(store.containers(), top)
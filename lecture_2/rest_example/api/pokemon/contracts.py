@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from lecture_2.rest_example.store.models import (
     PatchPokemonInfo,
@@ -10,7 +10,11 @@ from lecture_2.rest_example.store.models import (
 
 
 class PokemonResponse(BaseModel):
-    id: int
+    id: int = Field(
+        description="Snowflake id, above 2^53: parse it as a 64-bit integer, "
+        "not as a JavaScript number",
+        json_schema_extra={"format": "int64"},
+    )
     name: str
     published: bool
 
@@ -1,7 +1,14 @@
+import os
+
 from fastapi import FastAPI
 
+from lecture_2.rest_example.api import debug
 from lecture_2.rest_example.api.pokemon import router
 
 app = FastAPI(title="Pokemon REST API Example")
 
 app.include_router(router)
+
+# /debug exists only if DEBUG_TOKEN is set, and needs it as a bearer token
+if os.environ.get("DEBUG_TOKEN"):
+    app.include_router(debug.router)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: pokemon.proto
+# Protobuf Python Version: 5.27.2
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    5,
+    27,
+    2,
+    '',
+    'pokemon.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rpokemon.proto\x12\x07pokemon\"6\n\x07Pokemon\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x11\n\tpublished\x18\x03 \x01(\x08\".\n\x0bPokemonInfo\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x11\n\tpublished\x18\x02 \x01(\x08\"\\\n\x0cPokemonPatch\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x11\n\x04name\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x16\n\tpublished\x18\x03 \x01(\x08H\x01\x88\x01\x01\x42\x07\n\x05_nameB\x0c\n\n_published\"1\n\x0bPokemonList\x12\"\n\x08pokemons\x18\x01 \x03(\x0b\x32\x10.pokemon.Pokemon\"\x1f\n\x11GetPokemonRequest\x12\n\n\x02id\x18\x01 \x01(\x03\"/\n\x0eGetManyRequest\x12\x0e\n\x06offset\x18\x01 \x01(\x03\x12\r\n\x05limit\x18\x02 \x01(\x03\"8\n\x0e\x41\x64\x64ManyRequest\x12&\n\x08pokemons\x18\x01 \x03(\x0b\x32\x14.pokemon.PokemonInfo\":\n\x10PatchManyRequest\x12&\n\x07patches\x18\x01 \x03(\x0b\x32\x15.pokemon.PokemonPatch2\xf6\x01\n\x0cPokemonStore\x12\x36\n\x06GetOne\x12\x1a.pokemon.GetPokemonRequest\x1a\x10.pokemon.Pokemon\x12\x36\n\x07GetMany\x12\x17.pokemon.GetManyRequest\x1a\x10.pokemon.Pokemon0\x01\x12\x38\n\x07\x41\x64\x64Many\x12\x17.pokemon.AddManyRequest\x1a\x14.pokemon.PokemonList\x12<\n\tPatchMany\x12\x19.pokemon.PatchManyRequest\x1a\x14.pokemon.PokemonListb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'pokemon_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_POKEMON']._serialized_start=26
+  _globals['_POKEMON']._serialized_end=80
+  _globals['_POKEMONINFO']._serialized_start=82
+  _globals['_POKEMONINFO']._serialized_end=128
+  _globals['_POKEMONPATCH']._serialized_start=130
+  _globals['_POKEMONPATCH']._serialized_end=222
+  _globals['_POKEMONLIST']._serialized_start=224
+  _globals['_POKEMONLIST']._serialized_end=273
+  _globals['_GETPOKEMONREQUEST']._serialized_start=275
+  _globals['_GETPOKEMONREQUEST']._serialized_end=306
+  _globals['_GETMANYREQUEST']._serialized_start=308
+  _globals['_GETMANYREQUEST']._serialized_end=355
+  _globals['_ADDMANYREQUEST']._serialized_start=357
+  _globals['_ADDMANYREQUEST']._serialized_end=413
+  _globals['_PATCHMANYREQUEST']._serialized_start=415
+  _globals['_PATCHMANYREQUEST']._serialized_end=473
+  _globals['_POKEMONSTORE']._serialized_start=476
+  _globals['_POKEMONSTORE']._serialized_end=722
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,66 @@
+from google.protobuf.internal import containers as _containers
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class Pokemon(_message.Message):
+    __slots__ = ("id", "name", "published")
+    ID_FIELD_NUMBER: _ClassVar[int]
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    PUBLISHED_FIELD_NUMBER: _ClassVar[int]
+    id: int
+    name: str
+    published: bool
+    def __init__(self, id: _Optional[int] = ..., name: _Optional[str] = ..., published: bool = ...) -> None: ...
+
+class PokemonInfo(_message.Message):
+    __slots__ = ("name", "published")
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    PUBLISHED_FIELD_NUMBER: _ClassVar[int]
+    name: str
+    published: bool
+    def __init__(self, name: _Optional[str] = ..., published: bool = ...) -> None: ...
+
+class PokemonPatch(_message.Message):
+    __slots__ = ("id", "name", "published")
+    ID_FIELD_NUMBER: _ClassVar[int]
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    PUBLISHED_FIELD_NUMBER: _ClassVar[int]
+    id: int
+    name: str
+    published: bool
+    def __init__(self, id: _Optional[int] = ..., name: _Optional[str] = ..., published: bool = ...) -> None: ...
+
+class PokemonList(_message.Message):
+    __slots__ = ("pokemons",)
+    POKEMONS_FIELD_NUMBER: _ClassVar[int]
+    pokemons: _containers.RepeatedCompositeFieldContainer[Pokemon]
+    def __init__(self, pokemons: _Optional[_Iterable[_Union[Pokemon, _Mapping]]] = ...) -> None: ...
+
+class GetPokemonRequest(_message.Message):
+    __slots__ = ("id",)
+    ID_FIELD_NUMBER: _ClassVar[int]
+    id: int
+    def __init__(self, id: _Optional[int] = ...) -> None: ...
+
+class GetManyRequest(_message.Message):
+    __slots__ = ("offset", "limit")
+    OFFSET_FIELD_NUMBER: _ClassVar[int]
+    LIMIT_FIELD_NUMBER: _ClassVar[int]
+    offset: int
+    limit: int
+    def __init__(self, offset: _Optional[int] = ..., limit: _Optional[int] = ...) -> None: ...
+
+class AddManyRequest(_message.Message):
+    __slots__ = ("pokemons",)
+    POKEMONS_FIELD_NUMBER: _ClassVar[int]
+    pokemons: _containers.RepeatedCompositeFieldContainer[PokemonInfo]
+    def __init__(self, pokemons: _Optional[_Iterable[_Union[PokemonInfo, _Mapping]]] = ...) -> None: ...
+
+class PatchManyRequest(_message.Message):
+    __slots__ = ("patches",)
+    PATCHES_FIELD_NUMBER: _ClassVar[int]
+    patches: _containers.RepeatedCompositeFieldContainer[PokemonPatch]
+    def __init__(self, patches: _Optional[_Iterable[_Union[PokemonPatch, _Mapping]]] = ...) -> None: ...
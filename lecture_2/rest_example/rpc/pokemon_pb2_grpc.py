@@ -0,0 +1,226 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from . import pokemon_pb2 as pokemon__pb2
+
+GRPC_GENERATED_VERSION = '1.66.1'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + f' but the generated code in pokemon_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class PokemonStoreStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.GetOne = channel.unary_unary(
+                '/pokemon.PokemonStore/GetOne',
+                request_serializer=pokemon__pb2.GetPokemonRequest.SerializeToString,
+                response_deserializer=pokemon__pb2.Pokemon.FromString,
+                _registered_method=True)
+        self.GetMany = channel.unary_stream(
+                '/pokemon.PokemonStore/GetMany',
+                request_serializer=pokemon__pb2.GetManyRequest.SerializeToString,
+                response_deserializer=pokemon__pb2.Pokemon.FromString,
+                _registered_method=True)
+        self.AddMany = channel.unary_unary(
+                '/pokemon.PokemonStore/AddMany',
+                request_serializer=pokemon__pb2.AddManyRequest.SerializeToString,
+                response_deserializer=pokemon__pb2.PokemonList.FromString,
+                _registered_method=True)
+        self.PatchMany = channel.unary_unary(
+                '/pokemon.PokemonStore/PatchMany',
+                request_serializer=pokemon__pb2.PatchManyRequest.SerializeToString,
+                response_deserializer=pokemon__pb2.PokemonList.FromString,
+                _registered_method=True)
+
+
+class PokemonStoreServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def GetOne(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMany(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AddMany(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PatchMany(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_PokemonStoreServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'GetOne': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetOne,
+                    request_deserializer=pokemon__pb2.GetPokemonRequest.FromString,
+                    response_serializer=pokemon__pb2.Pokemon.SerializeToString,
+            ),
+            'GetMany': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetMany,
+                    request_deserializer=pokemon__pb2.GetManyRequest.FromString,
+                    response_serializer=pokemon__pb2.Pokemon.SerializeToString,
+            ),
+            'AddMany': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddMany,
+                    request_deserializer=pokemon__pb2.AddManyRequest.FromString,
+                    response_serializer=pokemon__pb2.PokemonList.SerializeToString,
+            ),
+            'PatchMany': grpc.unary_unary_rpc_method_handler(
+                    servicer.PatchMany,
+                    request_deserializer=pokemon__pb2.PatchManyRequest.FromString,
+                    response_serializer=pokemon__pb2.PokemonList.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'pokemon.PokemonStore', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('pokemon.PokemonStore', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class PokemonStore(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def GetOne(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/pokemon.PokemonStore/GetOne',
+            pokemon__pb2.GetPokemonRequest.SerializeToString,
+            pokemon__pb2.Pokemon.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMany(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/pokemon.PokemonStore/GetMany',
+            pokemon__pb2.GetManyRequest.SerializeToString,
+            pokemon__pb2.Pokemon.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AddMany(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/pokemon.PokemonStore/AddMany',
+            pokemon__pb2.AddManyRequest.SerializeToString,
+            pokemon__pb2.PokemonList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PatchMany(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/pokemon.PokemonStore/PatchMany',
+            pokemon__pb2.PatchManyRequest.SerializeToString,
+            pokemon__pb2.PokemonList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
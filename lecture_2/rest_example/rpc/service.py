@@ -0,0 +1,93 @@
+from typing import AsyncIterator
+
+import grpc
+
+import lecture_2.rest_example.rpc.pokemon_pb2 as pb2
+import lecture_2.rest_example.rpc.pokemon_pb2_grpc as pb2_grpc
+from lecture_2.rest_example import store
+from lecture_2.rest_example.store.models import (
+    PatchPokemonInfo,
+    PokemonEntity,
+    PokemonInfo,
+)
+
+
+def _as_message(entity: PokemonEntity) -> pb2.Pokemon:
+    return pb2.Pokemon(
+        id=entity.id,
+        name=entity.info.name,
+        published=entity.info.published,
+    )
+
+
+def _as_patch_info(patch: pb2.PokemonPatch) -> PatchPokemonInfo:
+    return PatchPokemonInfo(
+        name=patch.name if patch.HasField("name") else None,
+        published=patch.published if patch.HasField("published") else None,
+    )
+
+
+class PokemonStoreService(pb2_grpc.PokemonStoreServicer):
+    # same store as REST API uses, so both can run side by side in one process
+
+    async def GetOne(self, request: pb2.GetPokemonRequest, context) -> pb2.Pokemon:
+        entity = store.get_one(request.id)
+
+        if entity is None:
+            await context.abort(
+                grpc.StatusCode.NOT_FOUND,
+                f"pokemon {request.id} was not found",
+            )
+
+        return _as_message(entity)
+
+    async def GetMany(
+        self,
+        request: pb2.GetManyRequest,
+        context,
+    ) -> AsyncIterator[pb2.Pokemon]:
+        if request.offset < 0 or request.limit <= 0:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                "offset must be non-negative and limit must be positive",
+            )
+
+        for entity in store.get_many(request.offset, request.limit):
+            yield _as_message(entity)
+
+    async def AddMany(self, request: pb2.AddManyRequest, context) -> pb2.PokemonList:
+        return pb2.PokemonList(
+            pokemons=[
+                _as_message(store.add(PokemonInfo(info.name, info.published)))
+                for info in request.pokemons
+            ]
+        )
+
+    async def PatchMany(
+        self,
+        request: pb2.PatchManyRequest,
+        context,
+    ) -> pb2.PokemonList:
+        # batch is applied only if every pokemon in it exists
+        missing = [p.id for p in request.patches if store.get_one(p.id) is None]
+
+        if missing:
+            await context.abort(
+                grpc.StatusCode.NOT_FOUND,
+                f"pokemons {missing} were not found",
+            )
+
+        return pb2.PokemonList(
+            pokemons=[
+                _as_message(store.patch(patch.id, _as_patch_info(patch)))
+                for patch in request.patches
+            ]
+        )
+
+
+def create_server(address: str) -> tuple[grpc.aio.Server, int]:
+    server = grpc.aio.server()
+    pb2_grpc.add_PokemonStoreServicer_to_server(PokemonStoreService(), server)
+    port = server.add_insecure_port(address)
+
+    return server, port
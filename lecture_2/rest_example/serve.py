@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+
+import uvicorn
+
+from lecture_2.rest_example.main import app
+from lecture_2.rest_example.rpc.service import create_server
+
+
+async def serve(host: str, http_port: int, grpc_port: int) -> None:
+    # both APIs run in one event loop over the same in-memory store
+    grpc_server, _ = create_server(f"{host}:{grpc_port}")
+    await grpc_server.start()
+
+    try:
+        await uvicorn.Server(uvicorn.Config(app, host=host, port=http_port)).serve()
+    finally:
+        await grpc_server.stop(5.0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pokemon REST and gRPC API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--http-port", type=int, default=8000)
+    parser.add_argument("--grpc-port", type=int, default=50052)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.http_port, args.grpc_port))
+    except KeyboardInterrupt:
+        # uvicorn re-raises SIGINT after it has shut down gracefully
+        pass
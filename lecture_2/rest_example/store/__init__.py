@@ -1,11 +1,21 @@
 from .models import PatchPokemonInfo, PokemonEntity, PokemonInfo
-from .queries import add, delete, get_many, get_one, patch, update, upsert
+from .queries import (
+    add,
+    containers,
+    delete,
+    get_many,
+    get_one,
+    patch,
+    update,
+    upsert,
+)
 
 __all__ = [
     "PokemonEntity",
     "PokemonInfo",
     "PatchPokemonInfo",
     "add",
+    "containers",
     "delete",
     "get_many",
     "get_one",
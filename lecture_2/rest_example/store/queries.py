@@ -1,5 +1,6 @@
-from typing import Iterable
+from typing import Iterable, Mapping
 
+from common.ids import Snowflake, worker_from_env
 from lecture_2.rest_example.store.models import (
     PatchPokemonInfo,
     PokemonEntity,
@@ -7,20 +8,12 @@ from lecture_2.rest_example.store.models import (
 )
 
 _data = dict[int, PokemonInfo]()
-
-
-def int_id_generator() -> Iterable[int]:
-    i = 0
-    while True:
-        yield i
-        i += 1
-
-
-_id_generator = int_id_generator()
+# ids are unique across processes as long as each of them has own WORKER_ID
+_ids = Snowflake(worker_from_env())
 
 
 def add(info: PokemonInfo) -> PokemonEntity:
-    _id = next(_id_generator)
+    _id = _ids.next_id()
     _data[_id] = info
 
     return PokemonEntity(_id, info)
@@ -73,3 +66,8 @@ def patch(id: int, patch_info: PatchPokemonInfo) -> PokemonEntity | None:
         _data[id].published = patch_info.published
 
     return PokemonEntity(id=id, info=_data[id])
+
+
+def containers() -> dict[str, Mapping]:
+    # in-memory structures of the store, for memory reports
+    return {"pokemons": _data}
@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+
+import websockets
+
+from common.benchmark import (
+    cpu_seconds,
+    latency_summary,
+    markdown_table,
+    raise_nofile_limit,
+    run_server,
+    uvicorn_args,
+)
+from common.http_client import HttpConnection
+
+BENCH_PREFIX = "bench "
+
+
+@dataclass(slots=True)
+class Results:
+    latencies: list[float] = field(default_factory=list)
+    delivered: int = 0
+    published: int = 0
+    failed_publishes: int = 0
+
+
+def make_message(seq: int, sent_at: float, size: int) -> bytes:
+    message = f"{BENCH_PREFIX}{seq} {sent_at!r} ".encode()
+    return message + b"x" * max(0, size - len(message))
+
+
+async def consume(ws: websockets.WebSocketClientProtocol, results: Results) -> None:
+    try:
+        async for message in ws:
+            # skip "client ... subscribed" notifications from other subscribers
+            if not message.startswith(BENCH_PREFIX):
+                continue
+
+            sent_at = float(message.split(" ", 3)[2])
+            results.latencies.append(time.perf_counter() - sent_at)
+            results.delivered += 1
+    except websockets.ConnectionClosed:
+        pass
+
+
+async def publish(
+    host: str,
+    port: int,
+    rate: float,
+    duration: float,
+    size: int,
+    results: Results,
+) -> None:
+    idle: list[HttpConnection] = []
+
+    async def send(seq: int, sent_at: float) -> None:
+        connection = idle.pop() if idle else await HttpConnection.open(host, port)
+
+        try:
+            status, _ = await connection.request(
+                "POST", "/publish", make_message(seq, sent_at, size)
+            )
+        except (OSError, asyncio.IncompleteReadError):
+            # an unparseable response raises ProtocolError, an OSError too
+            results.failed_publishes += 1
+            await connection.close()
+            return
+
+        idle.append(connection)
+
+        if status == 200:
+            results.published += 1
+        else:
+            results.failed_publishes += 1
+
+    tasks = set()
+    start = time.perf_counter()
+
+    # open loop: messages are scheduled at a fixed rate and stamped with the
+    # scheduled time, so a slow server shows up as latency and not as lower rate
+    for seq in range(int(rate * duration)):
+        scheduled_at = start + seq / rate
+
+        if (delay := scheduled_at - time.perf_counter()) > 0:
+            await asyncio.sleep(delay)
+
+        task = asyncio.create_task(send(seq, scheduled_at))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    await asyncio.gather(*tasks)
+
+    for connection in idle:
+        await connection.close()
+
+
+async def run(args: argparse.Namespace, server_pid: int | None) -> dict[str, object]:
+    url = f"ws://{args.host}:{args.port}/subscribe"
+    results = Results()
+    semaphore = asyncio.Semaphore(args.connect_concurrency)
+
+    async def connect() -> websockets.WebSocketClientProtocol:
+        async with semaphore:
+            return await websockets.connect(
+                url,
+                ping_interval=None,
+                max_queue=None,
+                open_timeout=60,
+            )
+
+    connect_started = time.perf_counter()
+    sockets = await asyncio.gather(
+        *(connect() for _ in range(args.subscribers)),
+        return_exceptions=True,
+    )
+    connect_seconds = time.perf_counter() - connect_started
+
+    connected = [ws for ws in sockets if not isinstance(ws, BaseException)]
+    consumers = [asyncio.create_task(consume(ws, results)) for ws in connected]
+
+    cpu_before = cpu_seconds(server_pid) if server_pid else None
+    await publish(args.host, args.port, args.rate, args.duration, args.size, results)
+    await asyncio.sleep(args.drain)
+    cpu_after = cpu_seconds(server_pid) if server_pid else None
+
+    await asyncio.gather(*(ws.close() for ws in connected), return_exceptions=True)
+    for consumer in consumers:
+        consumer.cancel()
+
+    expected = results.published * len(connected)
+    latencies = latency_summary(results.latencies)
+    cpu_per_message = (
+        (cpu_after - cpu_before) / results.published * 1000
+        if cpu_before is not None and cpu_after is not None and results.published
+        else float("nan")
+    )
+
+    return {
+        "subscribers": len(connected),
+        "connect_s": connect_seconds,
+        "published": results.published,
+        "failed_publishes": results.failed_publishes,
+        "delivered": results.delivered,
+        "dropped": expected - results.delivered,
+        **{f"{name}_ms": value * 1000 for name, value in latencies.items()},
+        "server_cpu_ms_per_msg": cpu_per_message,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Broadcaster fan-out load test")
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=50.0, help="messages/s")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--size", type=int, default=64, help="message bytes")
+    parser.add_argument("--drain", type=float, default=2.0, help="seconds")
+    parser.add_argument("--connect-concurrency", type=int, default=200)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--external",
+        action="store_true",
+        help="do not start server, use one already running on --host:--port",
+    )
+    args = parser.parse_args()
+
+    raise_nofile_limit()
+
+    server = (
+        nullcontext(None)
+        if args.external
+        else run_server(
+            uvicorn_args("lecture_2.ws_example.server:app", args.port),
+            args.port,
+            args.host,
+        )
+    )
+
+    with server as process:
+        report = asyncio.run(run(args, process.pid if process else None))
+
+    print(markdown_table([report]))
+
+
+if __name__ == "__main__":
+    main()
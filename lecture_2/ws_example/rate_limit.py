@@ -0,0 +1,108 @@
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Callable
+
+
+class Policy(StrEnum):
+    DROP = "drop"
+    DELAY = "delay"
+    DISCONNECT = "disconnect"
+
+
+class Decision(StrEnum):
+    ACCEPT = "accept"
+    DROP = "drop"
+    DELAY = "delay"
+    DISCONNECT = "disconnect"
+
+
+@dataclass(slots=True)
+class TokenBucket:
+    rate: float
+    burst: float
+    clock: Callable[[], float] = time.monotonic
+
+    _tokens: float = field(init=False)
+    _updated_at: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._tokens = self.burst
+        self._updated_at = self.clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(
+            self.burst,
+            self._tokens + (now - self._updated_at) * self.rate,
+        )
+        self._updated_at = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+        return True
+
+    def reserve(self) -> float:
+        # takes a token even if there is none (going into debt) and returns
+        # number of seconds to wait until the debt is paid off
+        self._refill()
+        self._tokens -= 1
+
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+@dataclass(slots=True)
+class RateLimiter:
+    rate: float = 10.0
+    burst: float = 20.0
+    policy: Policy = Policy.DROP
+
+    decisions: Counter[Decision] = field(init=False, default_factory=Counter)
+    # number of sends to subscribers that did not happen because of the limiter
+    prevented_fanout: int = field(init=False, default=0)
+
+    def new_bucket(self) -> TokenBucket:
+        return TokenBucket(self.rate, self.burst)
+
+    def decide(self, bucket: TokenBucket, fanout: int) -> Decision:
+        decision = (
+            Decision.ACCEPT if bucket.try_acquire() else Decision(self.policy.value)
+        )
+
+        self.decisions[decision] += 1
+        if decision in (Decision.DROP, Decision.DISCONNECT):
+            self.prevented_fanout += fanout
+
+        return decision
+
+    def stats(self) -> dict[str, int]:
+        return {
+            **{decision.value: self.decisions[decision] for decision in Decision},
+            "prevented_fanout": self.prevented_fanout,
+        }
+
+
+def limiter_from_env() -> RateLimiter:
+    # WS_RATE_LIMIT messages per second per connection, WS_RATE_BURST on top
+    # of it and WS_RATE_POLICY for the rest; defaults are those of RateLimiter
+    defaults = RateLimiter()
+    rate = float(os.environ.get("WS_RATE_LIMIT", defaults.rate))
+    burst = float(os.environ.get("WS_RATE_BURST", defaults.burst))
+
+    if rate <= 0 or burst < 1:
+        raise ValueError(
+            f"rate limit needs rate > 0 and burst >= 1, got {rate}/{burst}"
+        )
+
+    return RateLimiter(
+        rate=rate,
+        burst=burst,
+        policy=Policy(os.environ.get("WS_RATE_POLICY", defaults.policy)),
+    )
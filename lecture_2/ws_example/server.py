@@ -1,7 +1,10 @@
+import asyncio
 from dataclasses import dataclass, field
 from uuid import uuid4
 
-from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, status
+
+from lecture_2.ws_example.rate_limit import Decision, limiter_from_env
 
 app = FastAPI()
 
@@ -23,6 +26,7 @@ class Broadcaster:
 
 
 broadcaster = Broadcaster()
+limiter = limiter_from_env()
 
 
 @app.post("/publish")
@@ -31,16 +35,32 @@ async def post_publish(request: Request):
     await broadcaster.publish(message)
 
 
+@app.get("/rate-limit")
+async def get_rate_limit_stats() -> dict[str, int]:
+    return limiter.stats()
+
+
 @app.websocket("/subscribe")
 async def ws_subscribe(ws: WebSocket):
     client_id = uuid4()
+    bucket = limiter.new_bucket()
     await broadcaster.subscribe(ws)
     await broadcaster.publish(f"client {client_id} subscribed")
 
     try:
         while True:
             text = await ws.receive_text()
+
+            match limiter.decide(bucket, fanout=len(broadcaster.subscribers)):
+                case Decision.DROP:
+                    continue
+                case Decision.DELAY:
+                    await asyncio.sleep(bucket.reserve())
+                case Decision.DISCONNECT:
+                    await ws.close(status.WS_1008_POLICY_VIOLATION)
+                    raise WebSocketDisconnect(status.WS_1008_POLICY_VIOLATION)
+
             await broadcaster.publish(text)
     except WebSocketDisconnect:
-        broadcaster.unsubscribe(ws)
+        await broadcaster.unsubscribe(ws)
         await broadcaster.publish(f"client {client_id} unsubscribed")
@@ -1,44 +1,374 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Iterator
+from urllib.parse import urlsplit
 
-import requests
 from faker import Faker
 
+from common.http_client import HttpConnection
+
+# open-loop load generator for the demo service: requests are sent at the
+# scheduled arrival rate whether or not earlier ones have completed, and
+# latency is measured from the scheduled time, so server queueing is visible
+# (no coordinated omission)
+#
+#   python -m lecture_3.ddoser --stages 30s:200 1m:200 30s:0 --mix get-user=3
+#
+# from the repository root, or as `python ddoser.py` in the demo service
+# image, where common/ is copied next to it
+
 faker = Faker()
 
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+@dataclass(slots=True)
+class Histogram:
+    # HDR-like: values are kept in microseconds in log-linear buckets, the top
+    # `precision` bits of a value are exact, so relative error is below
+    # 2 ** -(precision - 1) (under 2% for the default) and memory is tiny
+    precision: int = 7
+
+    counts: Counter[int] = field(default_factory=Counter)
+    total: int = 0
+    max: int = 0
+
+    def record(self, seconds: float) -> None:
+        value = max(0, round(seconds * 1_000_000))
+        shift = max(0, value.bit_length() - self.precision)
+        self.counts[value >> shift << shift] += 1
+        self.total += 1
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.total:
+            return float("nan")
+
+        rank = math.ceil(q * self.total)
+        seen = 0
+
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+
+            if seen >= rank:
+                return value / 1000
+
+        return self.max / 1000
+
+    def summary(self) -> dict[str, float]:
+        return {
+            **{f"p{q * 100:g}_ms": self.quantile(q) for q in QUANTILES},
+            "max_ms": self.max / 1000,
+        }
+
+
+@dataclass(slots=True)
+class Stats:
+    # latency is from the scheduled start, service time is from the actual send
+    latency: Histogram = field(default_factory=Histogram)
+    service: Histogram = field(default_factory=Histogram)
+    statuses: Counter[str] = field(default_factory=Counter)
+
+
+@dataclass(slots=True)
+class Pool:
+    # up to `size` keep-alive connections; a request waits for a free one,
+    # that wait is part of its latency like any other queueing
+    host: str
+    port: int
+    size: int
+
+    _idle: asyncio.Queue[HttpConnection | None] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._idle = asyncio.Queue()
+
+        for _ in range(self.size):
+            self._idle.put_nowait(None)
+
+    async def request(
+        self, method: str, path: str, body: bytes, content_type: str
+    ) -> tuple[int, bytes]:
+        connection = await self._idle.get()
+
+        try:
+            if connection is None:
+                connection = await HttpConnection.open(self.host, self.port)
+
+            response = await connection.request(method, path, body, content_type)
+        except BaseException:
+            # broken or cancelled mid-request, slot is refilled with a new one
+            if connection is not None:
+                connection.abort()
+
+            self._idle.put_nowait(None)
+            raise
+
+        self._idle.put_nowait(connection)
+        return response
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            if (connection := self._idle.get_nowait()) is not None:
+                await connection.close()
+
+
+def _user() -> dict[str, str]:
+    profile = faker.simple_profile()
+    return {
+        "username": profile["username"],
+        "first_name": profile["name"],
+        "last_name": "",
+        "birthdate": profile["birthdate"].isoformat(),
+    }
+
+
+def build_request(
+    kind: str,
+    args: argparse.Namespace,
+    rng: random.Random,
+    users: list[bytes],
+    created: deque[int],
+) -> tuple[str, str, bytes, str]:
+    match kind:
+        case "create-user":
+            return "POST", "/create-user", rng.choice(users), "application/json"
+        case "create-users":
+            body = b"\n".join(rng.choices(users, k=args.bulk_size))
+            return "POST", "/create-users", body, "application/x-ndjson"
+        case "get-user":
+            # ids are not sequential, only ones created during the run exist
+            id = rng.choice(created) if created else 0
+            return "POST", f"/get-user?id={id}", b"", "application/json"
+        case "root":
+            return "GET", "/", b"", "application/json"
+
+    raise ValueError(f"unknown request kind {kind!r}")
+
+
+def parse_duration(text: str) -> float:
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+    for unit in sorted(units, key=len, reverse=True):
+        if text.endswith(unit):
+            return float(text[: -len(unit)]) * units[unit]
 
-def create_users():
-    for _ in range(500):
-        user = faker.profile()
-        response = requests.post(
-            "http://localhost:8080/create-user",
-            json={
-                "username": user["username"],
-                "first_name": user["name"],
-                "last_name": "",
-            },
+    return float(text)
+
+
+def parse_stage(text: str) -> tuple[float, float]:
+    # "30s:200" ramps linearly to 200 requests/s over 30 seconds
+    duration, _, target = text.partition(":")
+    stage = parse_duration(duration), float(target)
+
+    if stage[0] <= 0 or stage[1] < 0:
+        raise argparse.ArgumentTypeError(
+            f"stage {text!r} needs a positive duration and a rate of 0 or more"
+        )
+
+    return stage
+
+
+def parse_mix(texts: list[str]) -> dict[str, float]:
+    return {
+        kind: float(weight) for kind, _, weight in (t.partition("=") for t in texts)
+    }
+
+
+def arrivals(start_rate: float, stages: list[tuple[float, float]]) -> Iterator[float]:
+    # offsets of scheduled requests from the test start, like k6
+    # ramping-arrival-rate: inside a stage rate goes linearly r0 -> r1, so
+    # r0 * t + a * t^2 requests with a = (r1 - r0) / (2 * d) are due by t
+    offset = 0.0
+    rate = start_rate
+    due = 0.0
+    n = 1
+
+    for duration, target in stages:
+        if duration <= 0:
+            raise ValueError(f"stage duration must be positive, got {duration}")
+
+        a = (target - rate) / (2 * duration)
+
+        while True:
+            left = n - due
+
+            if a == 0:
+                t = left / rate if rate > 0 else math.inf
+            elif (discriminant := rate * rate + 4 * a * left) >= 0:
+                t = (math.sqrt(discriminant) - rate) / (2 * a)
+            else:
+                t = math.inf
+
+            if not 0 <= t <= duration:
+                break
+
+            yield offset + t
+            n += 1
+
+        due += rate * duration + a * duration * duration
+        offset += duration
+        rate = target
+
+
+async def run(args: argparse.Namespace) -> dict[str, object]:
+    url = urlsplit(args.url)
+    pool = Pool(url.hostname, url.port or 80, args.connections)
+    mix = parse_mix(args.mix)
+    kinds, weights = list(mix), list(mix.values())
+    rng = random.Random(args.seed)
+    stats: dict[str, Stats] = defaultdict(Stats)
+    # payloads are generated upfront, faker is too slow to run between sends
+    users = [json.dumps(_user()).encode() for _ in range(args.users)]
+    # latest created ids, get-user reads this small hot set
+    created: deque[int] = deque(maxlen=args.hot_ids)
+    in_flight: set[asyncio.Task] = set()
+    dropped = 0
+
+    async def send(kind: str, scheduled: float) -> None:
+        method, path, body, content_type = build_request(
+            kind, args, rng, users, created
         )
+        sent = time.perf_counter()
+
+        try:
+            code, response = await pool.request(method, path, body, content_type)
+            status = str(code)
+
+            if code == 201:
+                created.extend(
+                    json.loads(line)["uid"] for line in response.splitlines()[-10:]
+                )
+        except (ConnectionError, OSError, asyncio.IncompleteReadError) as e:
+            status = type(e).__name__
+        except (ValueError, KeyError, TypeError) as e:
+            # 201 whose body is not NDJSON users is a failed request as well
+            status = f"{status} {type(e).__name__}"
+
+        done = time.perf_counter()
+        stats[kind].latency.record(done - scheduled)
+        stats[kind].service.record(done - sent)
+        stats[kind].statuses[status] += 1
+
+    started = time.perf_counter()
+
+    for offset in arrivals(args.start_rate, args.stages):
+        scheduled = started + offset
 
-        print(response)
+        # late schedule is not caught up by sleeping less later: the request
+        # goes out now, but its latency still counts from `scheduled`
+        if (delay := scheduled - time.perf_counter()) > 0:
+            await asyncio.sleep(delay)
 
+        if len(in_flight) >= args.max_in_flight:
+            dropped += 1
+            continue
 
-def get_users():
-    for _ in range(500):
-        
-        response = requests.post(
-            "http://localhost:8080/get-user",
-            params={"id": faker.random_number(digits=2)},
+        task = asyncio.create_task(send(rng.choices(kinds, weights)[0], scheduled))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    await asyncio.gather(*in_flight)
+    elapsed = time.perf_counter() - started
+    await pool.close()
+
+    scheduled_total = sum(s.latency.total for s in stats.values()) + dropped
+    return {
+        "url": args.url,
+        "stages": [f"{d:g}s:{t:g}" for d, t in args.stages],
+        "connections": args.connections,
+        "elapsed_s": elapsed,
+        "scheduled": scheduled_total,
+        "completed": sum(s.latency.total for s in stats.values()),
+        "dropped": dropped,
+        "achieved_rps": (scheduled_total - dropped) / elapsed if elapsed else 0.0,
+        "requests": {
+            kind: {
+                "count": s.latency.total,
+                "statuses": dict(s.statuses),
+                "latency": s.latency.summary(),
+                "service_time": s.service.summary(),
+            }
+            for kind, s in sorted(stats.items())
+        },
+    }
+
+
+def markdown_report(report: dict[str, object]) -> str:
+    lines = [
+        (
+            f"{report['completed']} requests in {report['elapsed_s']:.1f}s "
+            f"({report['achieved_rps']:.0f}/s), {report['dropped']} dropped "
+            "over --max-in-flight"
+        ),
+        "",
+        (
+            "| request | count | statuses | p50 ms | p90 ms | p99 ms | p99.9 ms "
+            "| max ms | service p99 ms |"
+        ),
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+
+    for kind, r in report["requests"].items():
+        latency = r["latency"]
+        statuses = ", ".join(f"{k}: {v}" for k, v in sorted(r["statuses"].items()))
+        lines.append(
+            f"| {kind} | {r['count']} | {statuses} "
+            f"| {latency['p50_ms']:.2f} | {latency['p90_ms']:.2f} "
+            f"| {latency['p99_ms']:.2f} | {latency['p99.9_ms']:.2f} "
+            f"| {latency['max_ms']:.2f} | {r['service_time']['p99_ms']:.2f} |"
         )
-        print(response)
 
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="open-loop load for demo service")
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument(
+        "--stages",
+        type=parse_stage,
+        nargs="+",
+        default=[parse_stage("10s:100"), parse_stage("20s:100")],
+        help="duration:target_rps, rate ramps linearly to target over duration",
+    )
+    parser.add_argument("--start-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--mix",
+        nargs="+",
+        default=["get-user=1", "create-user=1"],
+        help="kind=weight, kinds: get-user create-user create-users root",
+    )
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=10_000,
+        help="requests over this are dropped and reported, not queued",
+    )
+    parser.add_argument(
+        "--hot-ids", type=int, default=100, help="latest created ids get-user reads"
+    )
+    parser.add_argument("--bulk-size", type=int, default=100, help="create-users")
+    parser.add_argument("--users", type=int, default=1000, help="distinct payloads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
 
-with ThreadPoolExecutor() as executor:
-    futures = {}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
 
-    for i in range(15):
-        futures[executor.submit(create_users)] = f"create-user-{i}"
+    print(markdown_report(report))
 
-    for _ in range(15):
-        futures[executor.submit(get_users)] = f"get-users-{i}"
 
-    for future in as_completed(futures):
-        print(f"completed {futures[future]}")
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,67 @@
+import os
 from http import HTTPStatus
-from typing import Annotated
+from typing import Annotated, Callable, Iterator
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from prometheus_fastapi_instrumentator import Instrumentator
+from pydantic import TypeAdapter, ValidationError
 
+from common.debug_auth import requires_debug_token
+from common.lines import utf8_lines
+from common.memory import MemoryProfiler
+from common.metrics import LiteMetrics
+from common.profiler import MAX_HZ, MAX_SECONDS, ProfilerBusy, run_profile
+from common.runtime_metrics import runtime_metrics
 from demo_service import store
+from demo_service.cache import ResponseCache
 from demo_service.contracts import UserRequest, UserResource
 
-app = FastAPI(title="Demo User API")
-Instrumentator().instrument(app).expose(app)
+BATCH_SIZE = 1000
+
+# adapters are built once, building one per request costs more than using it
+_user_request = TypeAdapter(UserRequest)
+_user_resource = TypeAdapter(UserResource)
+_NOT_FOUND = b'{"detail":"Not Found"}'
+
+# /get-user reads a small set of hot ids, so responses are kept serialized
+# users never change, so only cached "not found" entries can go stale; a
+# shared store gets inserts from other workers too, there those are not cached
+_user_cache = ResponseCache(cache_missing=not store.shared)
+
+if not store.shared:
+    store.on_insert(_user_cache.invalidate)
+
+# loop lag and thread pool use of sqlite writes are exported with the rest,
+# THREAD_LIMITER_TOKENS sets the pool size
+app = FastAPI(title="Demo User API", lifespan=runtime_metrics)
+
+# METRICS_MODE=lite (default) counts in preallocated counters and caches
+# /metrics text, "instrumentator" is the full library, "off" is a baseline
+match os.environ.get("METRICS_MODE", "lite"):
+    case "lite":
+        app.add_middleware(
+            LiteMetrics,
+            sample_every=int(os.environ.get("METRICS_SAMPLE_EVERY", "1")),
+        )
+    case "instrumentator":
+        Instrumentator().instrument(app).expose(app)
+    case "off":
+        pass
+    case other:
+        raise ValueError(f"unknown METRICS_MODE {other!r}")
+
+
+async def _call[**P, R](
+    function: Callable[P, R], *args: P.args, **kwargs: P.kwargs
+) -> R:
+    # sqlite writes may wait for another worker's lock, that wait is kept off
+    # the event loop; reads never wait in WAL mode and run inline
+    if store.blocking:
+        return await run_in_threadpool(function, *args, **kwargs)
+
+    return function(*args, **kwargs)
 
 
 @app.post(
@@ -17,14 +70,154 @@ Instrumentator().instrument(app).expose(app)
     status_code=HTTPStatus.CREATED,
 )
 async def create_user(body: UserRequest) -> UserResource:
-    return store.insert(body)
+    return await _call(store.insert, body)
+
+
+def _validate(batch: list[str], first_row: int) -> list[UserRequest]:
+    # every line is parsed on its own: joined into one array, a line with two
+    # objects would create two users and a syntax error would lose its row
+    users = []
+
+    for row, line in enumerate(batch, first_row):
+        try:
+            users.append(_user_request.validate_json(line))
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False)
+
+            for error in errors:
+                error["loc"] = ("body", row, *error["loc"])
+
+            raise HTTPException(HTTPStatus.UNPROCESSABLE_ENTITY, errors) from e
+
+    return users
+
+
+def _as_ndjson(resources: list[UserResource]) -> Iterator[bytes]:
+    for i in range(0, len(resources), BATCH_SIZE):
+        yield b"".join(
+            _user_resource.dump_json(resource) + b"\n"
+            for resource in resources[i : i + BATCH_SIZE]
+        )
+
+
+@app.post(
+    "/create-users",
+    response_class=StreamingResponse,
+    status_code=HTTPStatus.CREATED,
+)
+async def create_users(request: Request) -> StreamingResponse:
+    # body is NDJSON with one UserRequest per line; users are created only if
+    # every line is valid, response is NDJSON with one UserResource per line
+    # error locations are ("body", row, ...), rows are numbered from 0 like
+    # items of a json array body and blank lines are not counted
+    users: list[UserRequest] = []
+    batch: list[str] = []
 
+    try:
+        async for line in utf8_lines(request.stream()):
+            if line.strip():
+                batch.append(line)
 
-@app.post("/get-user")
-async def get_user(id: Annotated[int, Query()]) -> UserResource:
+            if len(batch) == BATCH_SIZE:
+                users += _validate(batch, len(users))
+                batch.clear()
+    except UnicodeDecodeError as e:
+        raise HTTPException(
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            [{"type": "utf8_invalid", "loc": ("body",), "msg": str(e)}],
+        ) from e
+
+    if batch:
+        users += _validate(batch, len(users))
+
+    return StreamingResponse(
+        _as_ndjson(await _call(store.insert_many, users)),
+        status_code=HTTPStatus.CREATED,
+        media_type="application/x-ndjson",
+    )
+
+
+async def _load_user(id: int) -> bytes | None:
     resource = store.select(id)
 
-    if not resource:
-        raise HTTPException(HTTPStatus.NOT_FOUND)
+    return None if resource is None else _user_resource.dump_json(resource)
+
+
+@app.post(
+    "/get-user",
+    response_model=UserResource,
+    responses={HTTPStatus.NOT_FOUND: {"description": "User was not found"}},
+)
+async def get_user(id: Annotated[int, Query()]) -> Response:
+    # cached bytes are returned as is, skipping response model validation
+    body = await _user_cache.get(id, _load_user)
+
+    if body is None:
+        return Response(_NOT_FOUND, HTTPStatus.NOT_FOUND, media_type="application/json")
+
+    return Response(body, media_type="application/json")
+
+
+# /debug endpoints exist only if DEBUG_TOKEN is set, and need it as a bearer
+# token
+DEBUG_TOKEN = os.environ.get("DEBUG_TOKEN")
+
+
+if DEBUG_TOKEN:
+
+    @app.get(
+        "/debug/profile",
+        response_class=PlainTextResponse,
+        dependencies=[Depends(requires_debug_token)],
+    )
+    async def profile(
+        seconds: Annotated[float, Query(gt=0, le=MAX_SECONDS)] = 10.0,
+        hz: Annotated[int, Query(ge=1, le=MAX_HZ)] = 100,
+        idle: bool = False,
+    ) -> PlainTextResponse:
+        # collapsed stacks of all threads, e.g.
+        #   curl -H "Authorization: Bearer $DEBUG_TOKEN" \
+        #       ':8080/debug/profile?seconds=30' | flamegraph.pl > profile.svg
+        try:
+            sampler = await run_profile(seconds, hz, idle)
+        except ProfilerBusy as e:
+            raise HTTPException(HTTPStatus.CONFLICT, str(e)) from e
+
+        return PlainTextResponse(
+            sampler.collapsed(),
+            headers={"X-Profile-Samples": str(sampler.samples)},
+        )
+
+    memory_profiler = MemoryProfiler()
+
+    @app.post(
+        "/debug/memory/start",
+        dependencies=[Depends(requires_debug_token)],
+    )
+    async def start_memory_tracing() -> dict[str, object]:
+        # tracemalloc runs from here until /debug/memory/stop, reports are
+        # diffed against the snapshot taken now
+        memory_profiler.start()
+        return {"tracing": memory_profiler.tracing}
+
+    @app.post(
+        "/debug/memory/stop",
+        dependencies=[Depends(requires_debug_token)],
+    )
+    async def stop_memory_tracing() -> dict[str, object]:
+        memory_profiler.stop()
+        return {"tracing": memory_profiler.tracing}
 
-    return resource
+    @app.get("/debug/memory", dependencies=[Depends(requires_debug_token)])
+    async def memory(
+        top: Annotated[int, Query(ge=1, le=100)] = 20,
+    ) -> dict[str, object]:
+        # store sizes always, allocations by module only while tracing
+        containers = {
+            **store.containers(),
+            **{
+                f"user_cache.{name}": container
+                for name, container in _user_cache.containers().items()
+            },
+        }
+        return memory_profiler.report(containers, top)
@@ -0,0 +1,94 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Mapping
+
+from prometheus_client import Counter
+
+CACHE_REQUESTS = Counter(
+    "user_cache_requests",
+    "Cached reads by result: hit, miss or coalesced with a running load",
+    ("result",),
+)
+
+
+@dataclass(slots=True)
+class ResponseCache:
+    # LRU of serialized responses by key, None is a cached "not found"
+    max_size: int = 10_000
+    # "not found" can only be cached if every insert reaches invalidate(),
+    # which is not so for users inserted by other worker processes
+    cache_missing: bool = True
+
+    _entries: OrderedDict[int, bytes | None] = field(
+        init=False, default_factory=OrderedDict
+    )
+    # loads in progress, concurrent readers of the same key await the same one
+    _loads: dict[int, asyncio.Future[bytes | None]] = field(
+        init=False, default_factory=dict
+    )
+
+    async def get(
+        self,
+        key: int,
+        load: Callable[[int], Awaitable[bytes | None]],
+    ) -> bytes | None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            CACHE_REQUESTS.labels("hit").inc()
+            return self._entries[key]
+
+        if (running := self._loads.get(key)) is not None:
+            CACHE_REQUESTS.labels("coalesced").inc()
+
+            try:
+                # shielded, so a cancelled reader does not cancel the others
+                return await asyncio.shield(running)
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling() or not running.cancelled():
+                    raise
+
+            # reader that ran the load was cancelled, not this one: load again
+            return await self.get(key, load)
+
+        CACHE_REQUESTS.labels("miss").inc()
+        future = asyncio.get_running_loop().create_future()
+        self._loads[key] = future
+
+        try:
+            value = await load(key)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # mark as retrieved, there may be no other reader to do it
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            # invalidate() drops the running load, its result is stale then
+            fresh = self._loads.get(key) is future
+
+            if fresh:
+                del self._loads[key]
+
+        if fresh and (value is not None or self.cache_missing):
+            self._put(key, value)
+
+        return value
+
+    def _put(self, key: int, value: bytes | None) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: int) -> None:
+        self._entries.pop(key, None)
+        self._loads.pop(key, None)
+
+    def containers(self) -> dict[str, Mapping]:
+        return {"entries": self._entries, "loads": self._loads}
@@ -1,10 +1,14 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class UserResource(BaseModel):
-    uid: int
+    uid: int = Field(
+        description="Snowflake id, above 2^53: parse it as a 64-bit integer, "
+        "not as a JavaScript number",
+        json_schema_extra={"format": "int64"},
+    )
     username: str
     first_name: str
     last_name: str
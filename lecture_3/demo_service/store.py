@@ -1,27 +1,214 @@
-from typing import Iterable
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Callable, ClassVar, Iterator, Mapping, Protocol, Sequence
 
+from common.ids import MAX_WORKER, Snowflake, worker_from_env
 from demo_service.contracts import UserRequest, UserResource
 
 
-def _generate_int_id() -> Iterable[int]:
-    i = 0
-    while True:
-        yield i
-        i += 1
+class Users(Protocol):
+    # True if calls may wait on other processes and should leave the event loop
+    blocking: ClassVar[bool]
 
+    def insert(self, user: UserRequest) -> UserResource: ...
 
-_users = dict[int, UserResource]()
-_id_generator = _generate_int_id()
+    def insert_many(self, users: Sequence[UserRequest]) -> list[UserResource]: ...
 
+    def select(self, id: int) -> UserResource | None: ...
 
-def insert(user: UserRequest) -> UserResource:
-    id = next(_id_generator)
-    resource = UserResource(uid=id, **user.model_dump())
+    def containers(self) -> dict[str, Mapping]: ...
+
+
+@dataclass(slots=True)
+class MemoryUsers:
+    blocking: ClassVar[bool] = False
+
+    _users: dict[int, UserResource] = field(default_factory=dict)
+    _ids: Snowflake = field(default_factory=lambda: Snowflake(worker_from_env()))
+
+    def insert(self, user: UserRequest) -> UserResource:
+        id = self._ids.next_id()
+        resource = UserResource(uid=id, **user.model_dump())
+        self._users[id] = resource
+        return resource
+
+    def insert_many(self, users: Sequence[UserRequest]) -> list[UserResource]:
+        # ids are leased as one block; requests are already validated, so
+        # resources are built without validating the same fields a second time
+        ids = chain.from_iterable(self._ids.lease(len(users)))
+        resources = [
+            UserResource.model_construct(uid=id, **dict(user))
+            for id, user in zip(ids, users)
+        ]
+        self._users.update((resource.uid, resource) for resource in resources)
+        return resources
+
+    def select(self, id: int) -> UserResource | None:
+        return self._users.get(id, None)
+
+    def containers(self) -> dict[str, Mapping]:
+        return {"users": self._users}
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    uid INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    birthdate TEXT
+);
+CREATE TABLE IF NOT EXISTS workers (
+    slot INTEGER PRIMARY KEY AUTOINCREMENT,
+    pid INTEGER NOT NULL
+);
+"""
+
+_CLAIM_WORKER = "INSERT INTO workers (pid) VALUES (?)"
+_INSERT = "INSERT INTO users VALUES (?, ?, ?, ?, ?)"
+_SELECT = "SELECT username, first_name, last_name, birthdate FROM users WHERE uid = ?"
+
+
+def _row(id: int, user: UserRequest) -> tuple[object, ...]:
+    birthdate = None if user.birthdate is None else user.birthdate.isoformat()
+    return id, user.username, user.first_name, user.last_name, birthdate
+
+
+@dataclass(slots=True)
+class SqliteUsers:
+    # one database file for all worker processes of the service, so a user
+    # created by one worker can be read from any other
+    blocking: ClassVar[bool] = True
+
+    path: str
+
+    _local: threading.local = field(init=False, default_factory=threading.local)
+    _ids: Snowflake = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._connection().executescript(SCHEMA)
+
+        # workers of one host share WORKER_ID, each of them claims the next
+        # free slot over it; a worker id comes back only after 1024 claims
+        with self._transaction() as connection:
+            slot = connection.execute(_CLAIM_WORKER, (os.getpid(),)).lastrowid
+
+        self._ids = Snowflake((worker_from_env() + slot) % (MAX_WORKER + 1))
+
+    def _connection(self) -> sqlite3.Connection:
+        # writes run in the threadpool and reads on the event loop thread,
+        # every thread keeps its own connection
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                isolation_level=None,
+                check_same_thread=False,
+                timeout=5.0,
+            )
+            # WAL lets readers of all workers run next to the single writer
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self._local.connection = connection
+
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # writer takes the lock upfront, so it never deadlocks upgrading a
+        # read lock; other workers wait for it up to the connection timeout
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
 
-    _users[id] = resource
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
 
+        connection.execute("COMMIT")
+
+    def insert(self, user: UserRequest) -> UserResource:
+        return self.insert_many([user])[0]
+
+    def insert_many(self, users: Sequence[UserRequest]) -> list[UserResource]:
+        # ids come from this worker's own snowflake, so the transaction only
+        # makes the batch all-or-nothing
+        ids = list(chain.from_iterable(self._ids.lease(len(users))))
+
+        with self._transaction() as connection:
+            connection.executemany(
+                _INSERT, [_row(id, user) for id, user in zip(ids, users)]
+            )
+
+        return [
+            UserResource.model_construct(uid=id, **dict(user))
+            for id, user in zip(ids, users)
+        ]
+
+    def select(self, id: int) -> UserResource | None:
+        row = self._connection().execute(_SELECT, (id,)).fetchone()
+
+        if row is None:
+            return None
+
+        username, first_name, last_name, birthdate = row
+        return UserResource(
+            uid=id,
+            username=username,
+            first_name=first_name,
+            last_name=last_name,
+            birthdate=birthdate,
+        )
+
+    def containers(self) -> dict[str, Mapping]:
+        # users are in the sqlite file, nothing grows in process memory
+        return {}
+
+
+# USER_STORE_PATH selects the sqlite store, required with several workers
+_path = os.environ.get("USER_STORE_PATH")
+_users: Users = MemoryUsers() if _path is None else SqliteUsers(_path)
+# called with id of every inserted user, so caches of it can be dropped
+_on_insert: list[Callable[[int], None]] = []
+
+blocking = _users.blocking
+shared = _path is not None
+
+
+def on_insert(callback: Callable[[int], None]) -> None:
+    _on_insert.append(callback)
+
+
+def _notify(id: int) -> None:
+    for callback in _on_insert:
+        callback(id)
+
+
+def insert(user: UserRequest) -> UserResource:
+    resource = _users.insert(user)
+    _notify(resource.uid)
     return resource
 
 
 def select(id: int) -> UserResource | None:
-    return _users.get(id, None)
+    return _users.select(id)
+
+
+def insert_many(users: Sequence[UserRequest]) -> list[UserResource]:
+    resources = _users.insert_many(users)
+
+    for resource in resources:
+        _notify(resource.uid)
+
+    return resources
+
+
+def containers() -> dict[str, Mapping]:
+    # in-memory structures of the store, for memory reports
+    return _users.containers()
@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import time
+
+from common.benchmark import (
+    cpu_seconds,
+    latency_summary,
+    markdown_table,
+    raise_nofile_limit,
+    run_server,
+    uvicorn_args,
+)
+from common.http_client import HttpConnection
+
+# (METRICS_MODE, METRICS_SAMPLE_EVERY) of example_load.py, "off" is the baseline
+MODES = {
+    "off": ("off", 1),
+    "instrumentator": ("instrumentator", 1),
+    "lite": ("lite", 1),
+    "lite-sampled": ("lite", 10),
+}
+
+
+async def measure(args: argparse.Namespace, pid: int) -> dict[str, float]:
+    connections = [
+        await HttpConnection.open(args.host, args.port) for _ in range(args.concurrency)
+    ]
+    latencies: list[float] = []
+
+    async def loop(connection: HttpConnection, deadline: float) -> None:
+        while (started := time.perf_counter()) < deadline:
+            await connection.request("GET", "/")
+            latencies.append(time.perf_counter() - started)
+
+    # warm up
+    await asyncio.gather(*(c.request("GET", "/") for c in connections))
+
+    cpu_before = cpu_seconds(pid)
+    started = time.perf_counter()
+    await asyncio.gather(*(loop(c, started + args.duration) for c in connections))
+    elapsed = time.perf_counter() - started
+    cpu_after = cpu_seconds(pid)
+
+    # scrape cost: every scrape of instrumentator renders the registry again
+    scrape_started = time.perf_counter()
+
+    for _ in range(args.scrapes):
+        status, _ = await connections[0].request("GET", "/metrics")
+
+    scrape_ms = (time.perf_counter() - scrape_started) / args.scrapes * 1000
+
+    await asyncio.gather(*(c.close() for c in connections))
+
+    summary = latency_summary(latencies)
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": summary["p50"] * 1000,
+        "p99_ms": summary["p99"] * 1000,
+        "server_cpu_us_per_req": (
+            (cpu_after - cpu_before) / len(latencies) * 1_000_000
+            if cpu_before is not None and cpu_after is not None and latencies
+            else float("nan")
+        ),
+        "scrape_ms": scrape_ms if status == 200 else float("nan"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="metrics overhead on example_load")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+    parser.add_argument("--scrapes", type=int, default=50)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8768)
+    args = parser.parse_args()
+
+    raise_nofile_limit()
+    rows = []
+
+    for name in args.modes:
+        mode, sample_every = MODES[name]
+        env = {"METRICS_MODE": mode, "METRICS_SAMPLE_EVERY": str(sample_every)}
+        # example_load.py is a top-level module, like in the lecture_4 docker
+        # image; common is found from the repository root, the working dir
+        server = [
+            *uvicorn_args("example_load:app", args.port),
+            "--app-dir",
+            "lecture_4",
+        ]
+
+        with run_server(server, args.port, args.host, env) as process:
+            rows.append({"metrics": name, **asyncio.run(measure(args, process.pid))})
+
+    print(markdown_table(rows))
+
+
+if __name__ == "__main__":
+    main()
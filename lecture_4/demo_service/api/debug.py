@@ -0,0 +1,84 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPBasic, HTTPBasicCredentials
+
+from common.debug_auth import BearerDep, requires_debug_token
+from common.memory import MemoryProfiler
+from common.profiler import (
+    MAX_HZ,
+    MAX_SECONDS,
+    ProfilerBusy,
+    run_profile,
+)
+from lecture_4.demo_service.api.utils import (
+    UserServiceDep,
+    requires_admin,
+    requires_author,
+)
+
+
+async def requires_debug_access(
+    request: Request,
+    bearer: BearerDep,
+    basic: Annotated[HTTPBasicCredentials | None, Depends(HTTPBasic(auto_error=False))],
+    user_service: UserServiceDep,
+) -> None:
+    # scripts send DEBUG_TOKEN as a bearer token like to the other services,
+    # people log in as an admin
+    if bearer is not None:
+        requires_debug_token(bearer)
+        return
+
+    if basic is None:
+        raise HTTPException(HTTPStatus.UNAUTHORIZED)
+
+    requires_admin(await requires_author(request, basic, user_service))
+
+
+router = APIRouter(prefix="/debug", dependencies=[Depends(requires_debug_access)])
+memory_profiler = MemoryProfiler()
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: Annotated[float, Query(gt=0, le=MAX_SECONDS)] = 10.0,
+    hz: Annotated[int, Query(ge=1, le=MAX_HZ)] = 100,
+    idle: bool = False,
+) -> PlainTextResponse:
+    # collapsed stacks of all threads, e.g.
+    #   curl -u admin:... ':8000/debug/profile?seconds=30' | flamegraph.pl
+    try:
+        sampler = await run_profile(seconds, hz, idle)
+    except ProfilerBusy as e:
+        raise HTTPException(HTTPStatus.CONFLICT, str(e)) from e
+
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={"X-Profile-Samples": str(sampler.samples)},
+    )
+
+
+@router.post("/memory/start")
+async def start_memory_tracing() -> dict[str, object]:
+    # tracemalloc runs from here until /debug/memory/stop, reports are diffed
+    # against the snapshot taken now
+    memory_profiler.start()
+    return {"tracing": memory_profiler.tracing}
+
+
+@router.post("/memory/stop")
+async def stop_memory_tracing() -> dict[str, object]:
+    memory_profiler.stop()
+    return {"tracing": memory_profiler.tracing}
+
+
+@router.get("/memory")
+async def memory(
+    user_service: UserServiceDep,
+    top: Annotated[int, Query(ge=1, le=100)] = 20,
+) -> dict[str, object]:
+    # store sizes always, allocations by module only while tracing
+    return memory_profiler.report(user_service.containers(), top)
@@ -1,9 +1,11 @@
+import os
+
 from fastapi import FastAPI
 
-from lecture_4.demo_service.api import users, utils
+from lecture_4.demo_service.api import debug, users, utils
 
 
-def create_app():
+def create_app(debug_endpoints: bool = False):
     app = FastAPI(
         title="Testing Demo Service",
         lifespan=utils.initialize,
@@ -12,4 +14,8 @@ def create_app():
     app.add_exception_handler(ValueError, utils.value_error_handler)
     app.include_router(users.router)
 
+    # /debug is admin only, but still has to be turned on explicitly
+    if debug_endpoints or os.environ.get("DEBUG_ENDPOINTS") == "1":
+        app.include_router(debug.router)
+
     return app
@@ -2,6 +2,7 @@ from http import HTTPStatus
 from typing import Annotated
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import PlainTextResponse
 
 from lecture_4.demo_service.api.contracts import (
@@ -23,7 +24,10 @@ async def register_user(
     body: RegisterUserRequest,
     user_service: UserServiceDep,
 ) -> UserResponse:
-    entity = user_service.register(UserInfo(**body.model_dump()))
+    # password is hashed there, which is too slow for the event loop
+    entity = await run_in_threadpool(
+        user_service.register, UserInfo(**body.model_dump())
+    )
     return UserResponse.from_user_entity(entity)
 
 
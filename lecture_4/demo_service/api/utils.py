@@ -3,10 +3,12 @@ from datetime import datetime
 from http import HTTPStatus
 from typing import Annotated
 
+from anyio import CapacityLimiter, to_thread
 from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 
+from lecture_4.demo_service.core.passwords import CredentialsCache
 from lecture_4.demo_service.core.users import (
     UserEntity,
     UserInfo,
@@ -35,6 +37,10 @@ async def initialize(app: FastAPI):
     )
 
     app.state.user_service = user_service
+    app.state.credentials_cache = CredentialsCache()
+    # every scrypt call takes ~16MB, so only a few run at once and the rest of
+    # the thread pool stays free for other work
+    app.state.kdf_limiter = CapacityLimiter(4)
 
     yield
 
@@ -49,14 +55,28 @@ security = HTTPBasic()
 CredentialsDep = Annotated[HTTPBasicCredentials, Depends(security)]
 
 
-def requires_author(
-    credentials: CredentialsDep, user_service: UserServiceDep
+async def requires_author(
+    request: Request, credentials: CredentialsDep, user_service: UserServiceDep
 ) -> UserEntity:
-    entity = user_service.get_by_username(credentials.username)
+    # recently verified credentials are found by digest on the event loop,
+    # others are checked against the stored hash in a worker thread
+    cache: CredentialsCache = request.app.state.credentials_cache
+    uid = cache.get(credentials.username, credentials.password)
+
+    if uid is not None and (entity := user_service.get_by_id(uid)) is not None:
+        return entity
+
+    entity = await to_thread.run_sync(
+        user_service.authenticate,
+        credentials.username,
+        credentials.password,
+        limiter=request.app.state.kdf_limiter,
+    )
 
-    if not entity or entity.info.password.get_secret_value() != credentials.password:
+    if entity is None:
         raise HTTPException(HTTPStatus.UNAUTHORIZED)
 
+    cache.put(credentials.username, credentials.password, entity.uid)
     return entity
 
 
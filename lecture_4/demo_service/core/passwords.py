@@ -0,0 +1,102 @@
+import hashlib
+import hmac
+import os
+import time
+from base64 import b64decode, b64encode
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass(slots=True, frozen=True)
+class PasswordHasher:
+    # scrypt with OWASP minimum cost, ~40ms and 16MB per call; parameters are
+    # stored next to every hash, so raising them later keeps old hashes valid
+    n: int = 2**14
+    r: int = 8
+    p: int = 1
+    salt_size: int = 16
+    hash_size: int = 32
+
+    def _derive(self, password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        return hashlib.scrypt(
+            password.encode(),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=2 * 128 * n * r * p,
+            dklen=self.hash_size,
+        )
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(self.salt_size)
+        digest = self._derive(password, salt, self.n, self.r, self.p)
+
+        return "$".join(
+            (
+                "scrypt",
+                str(self.n),
+                str(self.r),
+                str(self.p),
+                b64encode(salt).decode(),
+                b64encode(digest).decode(),
+            )
+        )
+
+    def verify(self, password: str, encoded: str) -> bool:
+        algorithm, n, r, p, salt, digest = encoded.split("$")
+
+        if algorithm != "scrypt":
+            raise ValueError(f"unknown password hash {algorithm!r}")
+
+        derived = self._derive(password, b64decode(salt), int(n), int(r), int(p))
+        return hmac.compare_digest(derived, b64decode(digest))
+
+
+@dataclass(slots=True)
+class CredentialsCache:
+    # successful logins by keyed digest of username and password, so repeated
+    # requests skip the KDF; plaintext passwords are never kept, and the key
+    # is random per process, so digests mean nothing outside of it
+    ttl: float = 30.0
+    max_size: int = 10_000
+    clock: Callable[[], float] = time.monotonic
+
+    _key: bytes = field(init=False, default_factory=lambda: os.urandom(32))
+    # user id and expiry time by digest, oldest first
+    _entries: dict[bytes, tuple[int, float]] = field(init=False, default_factory=dict)
+
+    def _digest(self, username: str, password: str) -> bytes:
+        # username length is hashed too, so no other pair gives the same input
+        username_bytes = username.encode()
+        return hashlib.blake2b(
+            len(username_bytes).to_bytes(4, "big") + username_bytes + password.encode(),
+            key=self._key,
+            digest_size=32,
+        ).digest()
+
+    def get(self, username: str, password: str) -> int | None:
+        digest = self._digest(username, password)
+
+        if (entry := self._entries.get(digest)) is None:
+            return None
+
+        uid, expires_at = entry
+
+        if expires_at <= self.clock():
+            del self._entries[digest]
+            return None
+
+        return uid
+
+    def put(self, username: str, password: str, uid: int) -> None:
+        digest = self._digest(username, password)
+        self._entries.pop(digest, None)
+
+        if len(self._entries) >= self.max_size:
+            del self._entries[next(iter(self._entries))]
+
+        self._entries[digest] = (uid, self.clock() + self.ttl)
+
+    def clear(self) -> None:
+        self._entries.clear()
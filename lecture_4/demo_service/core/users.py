@@ -1,10 +1,13 @@
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Callable
+from typing import Callable, Mapping
 
 from pydantic import BaseModel, SecretStr
 
+from lecture_4.demo_service.core.passwords import PasswordHasher
+
 
 class UserRole(str, Enum):
     USER: str = "user"
@@ -27,25 +30,59 @@ class UserEntity(BaseModel):
 @dataclass(slots=True)
 class UserService:
     password_validators: list[Callable[[str], bool]] = field(default_factory=list)
+    password_hasher: PasswordHasher = field(default_factory=PasswordHasher)
 
     _data: dict[int, UserEntity] = field(init=False, default_factory=dict)
     _username_index: dict[str, int] = field(init=False, default_factory=dict)
     _last_id: int = field(init=False, default=0)
+    # register() and authenticate() may run in worker threads, the KDF runs
+    # outside of the lock, only the username check and insert are under it
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+    # verified for unknown usernames, so they take as long as wrong passwords
+    _dummy_hash: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._dummy_hash = self.password_hasher.hash("")
 
     def register(self, user_info: UserInfo) -> UserEntity:
         if user_info.username in self._username_index:
             raise ValueError("username is already taken")
 
+        password = user_info.password.get_secret_value()
+
         for password_validator in self.password_validators:
-            if not password_validator(user_info.password.get_secret_value()):
+            if not password_validator(password):
                 raise ValueError("invalid password")
 
-        self._last_id += 1
+        # stored info keeps the scrypt hash in place of the password
+        stored_info = user_info.model_copy(
+            update={"password": SecretStr(self.password_hasher.hash(password))}
+        )
 
-        entity = UserEntity(uid=self._last_id, info=user_info)
+        with self._lock:
+            if user_info.username in self._username_index:
+                raise ValueError("username is already taken")
 
-        self._data[entity.uid] = entity
-        self._username_index[entity.info.username] = entity.uid
+            self._last_id += 1
+
+            entity = UserEntity(uid=self._last_id, info=stored_info)
+
+            self._data[entity.uid] = entity
+            self._username_index[entity.info.username] = entity.uid
+
+        return entity
+
+    def authenticate(self, username: str, password: str) -> UserEntity | None:
+        # slow on purpose, callers on an event loop run it in a thread
+        entity = self.get_by_username(username)
+        password_hash = (
+            entity.info.password.get_secret_value()
+            if entity is not None
+            else self._dummy_hash
+        )
+
+        if not self.password_hasher.verify(password, password_hash):
+            return None
 
         return entity
 
@@ -67,6 +104,10 @@ class UserService:
         user.info.role = UserRole.ADMIN
         self._data[user.uid] = user
 
+    def containers(self) -> dict[str, Mapping]:
+        # in-memory structures of the service, for memory reports
+        return {"users": self._data, "username_index": self._username_index}
+
 
 def password_is_longer_than_8(password: str) -> bool:
     return len(password) > 8
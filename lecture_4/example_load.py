@@ -1,9 +1,27 @@
+import os
+
 from fastapi import FastAPI
 from fastapi.responses import PlainTextResponse
 from prometheus_fastapi_instrumentator import Instrumentator
 
+from common.metrics import LiteMetrics
+
 app = FastAPI()
-Instrumentator().instrument(app).expose(app)
+
+# METRICS_MODE=lite (default) counts in preallocated counters and caches
+# /metrics text, "instrumentator" is the full library, "off" is a baseline
+match os.environ.get("METRICS_MODE", "lite"):
+    case "lite":
+        app.add_middleware(
+            LiteMetrics,
+            sample_every=int(os.environ.get("METRICS_SAMPLE_EVERY", "1")),
+        )
+    case "instrumentator":
+        Instrumentator().instrument(app).expose(app)
+    case "off":
+        pass
+    case other:
+        raise ValueError(f"unknown METRICS_MODE {other!r}")
 
 
 @app.get("/")
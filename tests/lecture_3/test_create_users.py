@@ -0,0 +1,78 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from demo_service.api import app
+
+NDJSON = {"content-type": "application/x-ndjson"}
+
+
+def user(n: int) -> str:
+    return json.dumps({"username": f"user{n}", "first_name": "a", "last_name": "b"})
+
+
+@pytest.fixture()
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_create_users_streams_ndjson(client: TestClient) -> None:
+    body = ("\n".join(user(n) for n in range(3)) + "\n").encode()
+
+    response = client.post(
+        "/create-users",
+        # body arrives in chunks that cut lines in the middle
+        content=(body[i : i + 7] for i in range(0, len(body), 7)),
+        headers=NDJSON,
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    users = [json.loads(line) for line in response.text.splitlines()]
+    assert [u["username"] for u in users] == ["user0", "user1", "user2"]
+    assert len({u["uid"] for u in users}) == 3
+
+    got = client.post("/get-user", params={"id": users[1]["uid"]})
+    assert got.json() == users[1]
+
+
+@pytest.mark.parametrize(
+    ("body", "loc", "error"),
+    [
+        # two objects on one line are not two users
+        (f"{user(0)}\n{user(1)},{user(2)}", ["body", 1], "json_invalid"),
+        (f"{user(0)}\n\n{user(1)}\nnot json", ["body", 2], "json_invalid"),
+        (f'{user(0)}\n{{"username": "x"}}', ["body", 1, "first_name"], "missing"),
+        # body cut short in the middle of the last line
+        (f"{user(0)}\n{user(1)[:-5]}", ["body", 1], "json_invalid"),
+    ],
+)
+def test_create_users_reports_bad_row(
+    client: TestClient, body: str, loc: list, error: str
+) -> None:
+    response = client.post("/create-users", content=body, headers=NDJSON)
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()["detail"][0]["loc"] == loc
+    assert response.json()["detail"][0]["type"] == error
+
+
+def test_create_users_rejects_cut_utf8(client: TestClient) -> None:
+    response = client.post(
+        "/create-users", content=user(0).encode() + b"\n\xd0", headers=NDJSON
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()["detail"][0]["loc"] == ["body"]
+
+
+@pytest.mark.parametrize("body", [b"", b"\n\n"])
+def test_create_users_empty_body(client: TestClient, body: bytes) -> None:
+    response = client.post("/create-users", content=body, headers=NDJSON)
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.text == ""
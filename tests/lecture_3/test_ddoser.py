@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import math
+import random
+import re
+
+import pytest
+
+from ddoser import Histogram, arrivals, parse_stage, run
+
+
+@pytest.mark.parametrize(
+    ("start_rate", "stages", "count"),
+    [
+        (100.0, [(2.0, 100.0)], 200),
+        # ramps are triangles: 0 -> 100/s over 2s is 100 requests
+        (0.0, [(2.0, 100.0)], 100),
+        (0.0, [(1.0, 10.0), (1.0, 10.0), (1.0, 0.0)], 20),
+        (0.0, [(5.0, 0.0)], 0),
+    ],
+)
+def test_arrivals_follow_ramp(
+    start_rate: float, stages: list[tuple[float, float]], count: int
+) -> None:
+    offsets = list(arrivals(start_rate, stages))
+
+    assert len(offsets) == count
+    assert offsets == sorted(offsets)
+    assert all(0 <= t <= sum(d for d, _ in stages) for t in offsets)
+
+
+def test_arrivals_ramp_is_linear() -> None:
+    offsets = list(arrivals(0.0, [(2.0, 100.0)]))
+
+    # a quarter of a linear ramp's requests are due by its middle
+    assert sum(t <= 1.0 for t in offsets) == 25
+
+
+def test_arrivals_reject_zero_length_stage() -> None:
+    with pytest.raises(ValueError):
+        list(arrivals(10.0, [(0.0, 10.0)]))
+
+
+@pytest.mark.parametrize(
+    ("text", "stage"),
+    [("30s:200", (30.0, 200.0)), ("1m:5", (60.0, 5.0)), ("500ms:0", (0.5, 0.0))],
+)
+def test_parse_stage(text: str, stage: tuple[float, float]) -> None:
+    assert parse_stage(text) == stage
+
+
+@pytest.mark.parametrize("text", ["0s:10", "-1s:10", "10s:-1"])
+def test_parse_stage_rejects_empty_stages(text: str) -> None:
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_stage(text)
+
+
+@pytest.mark.parametrize("precision", [4, 7])
+def test_histogram_quantile_error_is_bounded(precision: int) -> None:
+    rng = random.Random(precision)
+    values = [round(rng.lognormvariate(8, 2)) for _ in range(10_000)]
+    histogram = Histogram(precision)
+
+    for value in values:
+        histogram.record(value / 1_000_000)
+
+    values.sort()
+
+    for q in (0.5, 0.9, 0.99, 0.999):
+        exact = values[math.ceil(q * len(values)) - 1] / 1000
+        # buckets keep the top bits of a value, so it is rounded down
+        assert exact * (1 - 2 ** -(precision - 1)) <= histogram.quantile(q) <= exact
+
+    assert histogram.quantile(1.0) <= histogram.max / 1000 == values[-1] / 1000
+
+
+def test_empty_histogram_quantile_is_nan() -> None:
+    assert math.isnan(Histogram().quantile(0.5))
+
+
+async def serve(response: bytes) -> asyncio.Server:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                break
+
+            length = re.search(rb"Content-Length: (\d+)", head)
+            await reader.readexactly(int(length[1]))
+            writer.write(response)
+            await writer.drain()
+
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("body", "error"),
+    [(b"<html>", "JSONDecodeError"), (b'{"id": 1}', "KeyError"), (b"[1]", "TypeError")],
+)
+async def test_bad_created_body_is_failed_request(body: bytes, error: str) -> None:
+    response = b"HTTP/1.1 201 Created\r\nContent-Length: %d\r\n\r\n%s" % (
+        len(body),
+        body,
+    )
+    server = await serve(response)
+    args = argparse.Namespace(
+        url=f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}",
+        stages=[(0.1, 100.0)],
+        start_rate=100.0,
+        mix=["create-user=1"],
+        connections=2,
+        max_in_flight=100,
+        hot_ids=10,
+        bulk_size=1,
+        users=3,
+        seed=0,
+    )
+
+    async with server:
+        report = await run(args)
+
+    assert report["requests"]["create-user"]["statuses"] == {f"201 {error}": 10}
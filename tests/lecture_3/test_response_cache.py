@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from demo_service.cache import ResponseCache
+
+
+class Loader:
+    # counts calls; a load reads value when it starts and then waits for
+    # release if it is set
+    def __init__(self, value: bytes | None = b"user") -> None:
+        self.value = value
+        self.calls: list[int] = []
+        self.release: asyncio.Event | None = None
+        self.error: Exception | None = None
+
+    async def __call__(self, key: int) -> bytes | None:
+        self.calls.append(key)
+        value = self.value
+
+        if self.release is not None:
+            await self.release.wait()
+
+        if self.error is not None:
+            raise self.error
+
+        return value
+
+
+@pytest.mark.asyncio
+async def test_hit_skips_loader() -> None:
+    cache, load = ResponseCache(), Loader()
+
+    assert await cache.get(1, load) == b"user"
+    assert await cache.get(1, load) == b"user"
+    assert load.calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_is_evicted() -> None:
+    cache, load = ResponseCache(max_size=2), Loader()
+
+    for key in (1, 2, 1, 3):
+        await cache.get(key, load)
+
+    await cache.get(1, load)
+    await cache.get(2, load)
+
+    assert load.calls == [1, 2, 3, 2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("cache_missing", "calls"), [(True, 1), (False, 2)])
+async def test_not_found_is_cached_if_allowed(cache_missing: bool, calls: int) -> None:
+    cache, load = ResponseCache(cache_missing=cache_missing), Loader(value=None)
+
+    assert await cache.get(1, load) is None
+    assert await cache.get(1, load) is None
+    assert len(load.calls) == calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load() -> None:
+    cache, load = ResponseCache(), Loader()
+    load.release = asyncio.Event()
+
+    readers = [asyncio.create_task(cache.get(1, load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    load.release.set()
+
+    assert await asyncio.gather(*readers) == [b"user"] * 5
+    assert load.calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_load_drops_its_result() -> None:
+    cache, load = ResponseCache(), Loader(value=None)
+    load.release = asyncio.Event()
+
+    stale = asyncio.create_task(cache.get(1, load))
+    await asyncio.sleep(0)
+    # user 1 is inserted while its "not found" is being loaded
+    cache.invalidate(1)
+    load.value = b"user"
+    fresh = asyncio.create_task(cache.get(1, load))
+    await asyncio.sleep(0)
+    load.release.set()
+
+    assert await stale is None
+    assert await fresh == b"user"
+    assert await cache.get(1, load) == b"user"
+    assert load.calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_shared_and_not_kept() -> None:
+    cache, load = ResponseCache(), Loader()
+    load.release = asyncio.Event()
+    load.error = RuntimeError("db is down")
+
+    readers = [asyncio.create_task(cache.get(1, load)) for _ in range(2)]
+    await asyncio.sleep(0)
+    load.release.set()
+    results = await asyncio.gather(*readers, return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not cache.containers()["loads"]
+
+    load.error = None
+    assert await cache.get(1, load) == b"user"
+    assert load.calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_load_is_retried_by_waiting_reader() -> None:
+    cache, load = ResponseCache(), Loader()
+    load.release = asyncio.Event()
+
+    leader = asyncio.create_task(cache.get(1, load))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get(1, load))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    load.release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    assert await waiter == b"user"
+    assert load.calls == [1, 1]
+    assert not cache.containers()["loads"]
+    assert await cache.get(1, load) == b"user"
@@ -0,0 +1,56 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from common.ids import MAX_WORKER, SEQUENCE_BITS
+from demo_service.contracts import UserRequest
+from demo_service.store import SqliteUsers
+
+
+def user(n: int, birthdate: datetime | None = None) -> UserRequest:
+    return UserRequest(
+        username=f"user{n}", first_name="a", last_name="b", birthdate=birthdate
+    )
+
+
+def worker(id: int) -> int:
+    return id >> SEQUENCE_BITS & MAX_WORKER
+
+
+@pytest.fixture()
+def path(tmp_path: Path) -> str:
+    return str(tmp_path / "users.db")
+
+
+def test_inserted_users_are_read_back(path: str) -> None:
+    users = SqliteUsers(path)
+    born = datetime(2000, 1, 2, 3, 4, 5)
+
+    created = users.insert_many([user(0, born), user(1)])
+    single = users.insert(user(2))
+
+    assert [u.username for u in created] == ["user0", "user1"]
+    assert users.select(created[0].uid) == created[0]
+    assert users.select(created[0].uid).birthdate == born
+    assert users.select(created[1].uid) == created[1]
+    assert users.select(single.uid) == single
+    assert users.select(single.uid + 1) is None
+
+
+def test_stores_on_one_file_claim_different_workers(
+    path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("WORKER_ID", str(MAX_WORKER))
+    # like uvicorn workers of one service: same file, same environment
+    first, second = SqliteUsers(path), SqliteUsers(path)
+
+    ids = [u.uid for u in first.insert_many([user(n) for n in range(100)])]
+    ids += [u.uid for u in second.insert_many([user(n) for n in range(100)])]
+    ids += [first.insert(user(0)).uid, second.insert(user(1)).uid]
+
+    assert len(set(ids)) == len(ids)
+    # slots 1 and 2 are added to WORKER_ID and wrap around
+    assert {worker(id) for id in ids} == {0, 1}
+    assert all(first.select(id) is not None for id in ids)
+    assert all(second.select(id) is not None for id in ids)
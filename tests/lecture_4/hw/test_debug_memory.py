@@ -0,0 +1,77 @@
+import sys
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from common.memory import deep_size, store_stats
+from lecture_4.demo_service.api.main import create_app
+
+ADMIN = ("admin", "superSecretAdminPassword123")
+
+
+@pytest.fixture()
+def client():
+    with TestClient(create_app(debug_endpoints=True)) as client:
+        yield client
+        client.post("/debug/memory/stop", auth=ADMIN)
+
+
+def test_deep_size_counts_shared_objects_once() -> None:
+    shared = "x" * 1000
+    seen: set[int] = set()
+
+    first, second = [shared], [shared]
+
+    assert deep_size(first, seen) >= sys.getsizeof(shared)
+    assert deep_size(second, seen) == sys.getsizeof(second)
+
+
+def test_store_stats_estimates_bytes_per_record() -> None:
+    store = {i: str(i) * 100 for i in range(10)}
+    stats = store_stats("strings", store)
+
+    assert stats["records"] == 10
+    assert stats["bytes_per_record"] > sys.getsizeof(store[0])
+    assert stats["estimated_bytes"] == pytest.approx(stats["bytes_per_record"] * 10, 1)
+
+
+def test_memory_report_without_tracing(client: TestClient) -> None:
+    response = client.get("/debug/memory", auth=ADMIN)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["tracing"] is False
+    assert {s["store"] for s in response.json()["stores"]} == {
+        "users",
+        "username_index",
+    }
+
+
+def test_memory_report_diffs_snapshots(client: TestClient) -> None:
+    assert client.post("/debug/memory/start", auth=ADMIN).json() == {"tracing": True}
+
+    for i in range(50):
+        client.post(
+            "/user-register",
+            json={
+                "username": f"memory{i}",
+                "name": "memory",
+                "birthdate": "2000-01-01T00:00:00",
+                "password": "password123456",
+            },
+        )
+
+    report = client.get("/debug/memory", params={"top": 5}, auth=ADMIN).json()
+    users = next(s for s in report["stores"] if s["store"] == "users")
+
+    assert report["tracing"] is True
+    assert report["traced_bytes"] > 0
+    assert users["records"] == 51
+    assert len(report["growth_since_previous"]) <= 5
+    assert report["growth_since_previous"][0]["bytes_diff"] > 0
+    assert client.post("/debug/memory/stop", auth=ADMIN).json() == {"tracing": False}
+
+
+def test_memory_requires_admin(client: TestClient) -> None:
+    assert client.get("/debug/memory").status_code == HTTPStatus.UNAUTHORIZED
+    assert client.post("/debug/memory/start").status_code == HTTPStatus.UNAUTHORIZED
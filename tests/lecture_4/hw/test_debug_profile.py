@@ -0,0 +1,123 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from common.profiler import Sampler
+from lecture_4.demo_service.api.main import create_app
+
+ADMIN = ("admin", "superSecretAdminPassword123")
+
+
+@pytest.fixture()
+def client():
+    with TestClient(create_app(debug_endpoints=True)) as client:
+        yield client
+
+
+def busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_collects_stacks_of_other_threads() -> None:
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+    thread.start()
+
+    try:
+        sampler = Sampler()
+
+        for _ in range(20):
+            sampler.sample()
+            time.sleep(0.001)
+    finally:
+        stop.set()
+        thread.join()
+
+    busy = [s for s in sampler.stacks if s.startswith("busy;")]
+    assert sampler.samples == 20
+    assert busy and all(f"{__name__}:busy_loop" in s for s in busy)
+
+
+def test_profile_returns_collapsed_stacks(client: TestClient) -> None:
+    response = client.get(
+        "/debug/profile", params={"seconds": 0.2, "idle": True}, auth=ADMIN
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert int(response.headers["x-profile-samples"]) > 0
+
+    for line in response.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
+
+
+@pytest.mark.parametrize(
+    ("auth", "status"),
+    [
+        (None, HTTPStatus.UNAUTHORIZED),
+        (("admin", "wrong"), HTTPStatus.UNAUTHORIZED),
+    ],
+)
+def test_profile_requires_admin(client: TestClient, auth, status) -> None:
+    response = client.get("/debug/profile", params={"seconds": 0.1}, auth=auth)
+
+    assert response.status_code == status
+
+
+@pytest.mark.parametrize(
+    ("token", "status"),
+    [("secret", HTTPStatus.OK), ("wrong", HTTPStatus.UNAUTHORIZED)],
+)
+def test_debug_token_replaces_admin(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, token: str, status
+) -> None:
+    monkeypatch.setenv("DEBUG_TOKEN", "secret")
+    response = client.get("/debug/memory", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == status
+
+
+def test_debug_token_is_off_while_unset(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("DEBUG_TOKEN", raising=False)
+    response = client.get("/debug/memory", headers={"Authorization": "Bearer "})
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_profile_forbidden_for_user(client: TestClient) -> None:
+    client.post(
+        "/user-register",
+        json={
+            "username": "profiler",
+            "name": "profiler",
+            "birthdate": "2000-01-01T00:00:00",
+            "password": "password123456",
+        },
+    )
+    response = client.get(
+        "/debug/profile",
+        params={"seconds": 0.1},
+        auth=("profiler", "password123456"),
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.parametrize("params", [{"seconds": 0}, {"seconds": 61}, {"hz": 1000}])
+def test_profile_bounds(client: TestClient, params) -> None:
+    response = client.get("/debug/profile", params=params, auth=ADMIN)
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_debug_endpoints_are_opt_in() -> None:
+    with TestClient(create_app()) as client:
+        response = client.get("/debug/profile", auth=ADMIN)
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
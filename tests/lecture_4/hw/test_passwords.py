@@ -0,0 +1,143 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import SecretStr
+
+from lecture_4.demo_service.api.main import create_app
+from lecture_4.demo_service.core.passwords import CredentialsCache, PasswordHasher
+from lecture_4.demo_service.core.users import UserInfo, UserService
+
+ADMIN = ("admin", "superSecretAdminPassword123")
+# cheap parameters, the format and checks are the same as with real ones
+FAST = PasswordHasher(n=2**4)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def user_info(username: str = "user", password: str = "password123") -> UserInfo:
+    return UserInfo(
+        username=username,
+        name=username,
+        birthdate=datetime(2000, 1, 1),
+        password=SecretStr(password),
+    )
+
+
+def test_hash_is_salted_and_verifies() -> None:
+    first, second = FAST.hash("password123"), FAST.hash("password123")
+
+    assert first != second
+    assert first.startswith("scrypt$16$8$1$")
+    assert FAST.verify("password123", first)
+    assert not FAST.verify("password124", first)
+
+
+def test_verify_uses_stored_parameters() -> None:
+    assert PasswordHasher(n=2**5).verify("password123", FAST.hash("password123"))
+
+
+def test_verify_unknown_algorithm() -> None:
+    with pytest.raises(ValueError):
+        FAST.verify("password123", "md5$1$1$1$c2FsdA==$aGFzaA==")
+
+
+def test_cache_hit_and_miss() -> None:
+    cache = CredentialsCache()
+    cache.put("user", "password123", 1)
+
+    assert cache.get("user", "password123") == 1
+    assert cache.get("user", "password124") is None
+    assert cache.get("user1", "password123") is None
+
+
+def test_cache_entries_expire() -> None:
+    clock = FakeClock()
+    cache = CredentialsCache(ttl=10, clock=clock)
+    cache.put("user", "password123", 1)
+    clock.now = 9.9
+
+    assert cache.get("user", "password123") == 1
+
+    clock.now = 10
+
+    assert cache.get("user", "password123") is None
+
+
+def test_cache_evicts_oldest() -> None:
+    cache = CredentialsCache(max_size=2)
+
+    for uid in range(3):
+        cache.put(f"user{uid}", "password123", uid)
+
+    assert cache.get("user0", "password123") is None
+    assert cache.get("user2", "password123") == 2
+
+
+def test_service_stores_hash_only() -> None:
+    service = UserService(password_hasher=FAST)
+    entity = service.register(user_info())
+
+    assert entity.info.password.get_secret_value() != "password123"
+    assert service.authenticate("user", "password123") == entity
+    assert service.authenticate("user", "password124") is None
+    assert service.authenticate("nobody", "password123") is None
+
+
+def test_concurrent_registration_takes_username_once() -> None:
+    service = UserService(password_hasher=FAST)
+
+    def register(_):
+        try:
+            return service.register(user_info())
+        except ValueError:
+            return None
+
+    with ThreadPoolExecutor(8) as executor:
+        entities = [e for e in executor.map(register, range(8)) if e is not None]
+
+    assert len(entities) == 1
+
+
+@pytest.fixture()
+def client():
+    with TestClient(create_app()) as client:
+        yield client
+
+
+def test_verified_credentials_skip_kdf(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = []
+    authenticate = UserService.authenticate
+
+    def counting(self, username, password):
+        calls.append(username)
+        return authenticate(self, username, password)
+
+    monkeypatch.setattr(UserService, "authenticate", counting)
+
+    for _ in range(3):
+        response = client.post("/user-get", params={"id": 1}, auth=ADMIN)
+        assert response.status_code == HTTPStatus.OK
+
+    assert calls == ["admin"]
+
+
+def test_wrong_password_is_not_served_from_cache(client: TestClient) -> None:
+    assert (
+        client.post("/user-get", params={"id": 1}, auth=ADMIN).status_code
+        == HTTPStatus.OK
+    )
+
+    response = client.post("/user-get", params={"id": 1}, auth=("admin", "wrong"))
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,225 @@
+import asyncio
+import time
+from concurrent import futures
+
+import grpc
+import pytest
+import pytest_asyncio
+from prometheus_client import REGISTRY, CollectorRegistry
+
+import lecture_2.grpc_example.ping_pb2 as pb2
+import lecture_2.grpc_example.ping_pb2_grpc as pb2_grpc
+from lecture_2.grpc_example.async_client import ExampleClient, deadline
+from lecture_2.grpc_example.batching import batch_requests
+from lecture_2.grpc_example.example_service import ExampleService
+from lecture_2.grpc_example.example_service_async import ServerConfig, create_server
+from lecture_2.grpc_example.metrics import GrpcMetrics, MetricsInterceptor
+
+
+@pytest_asyncio.fixture()
+async def server():
+    server, port = create_server(ServerConfig(address="127.0.0.1:0"))
+    await server.start()
+
+    yield server, port
+
+    await server.stop(None)
+
+
+@pytest_asyncio.fixture()
+async def stub(server):
+    _, port = server
+
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+        yield pb2_grpc.ExampleStub(channel)
+
+
+@pytest.mark.asyncio
+async def test_ping(stub) -> None:
+    response = await stub.Ping(pb2.PingRequest(message="hello"))
+
+    assert response.message == "hello"
+
+
+@pytest.mark.asyncio
+async def test_ping_stream(stub) -> None:
+    messages = [f"message {i}" for i in range(10)]
+
+    async def requests():
+        for message in messages:
+            yield pb2.PingRequest(message=message)
+
+    responses = [response.message async for response in stub.PingStream(requests())]
+
+    assert responses == messages
+
+
+@pytest.mark.asyncio
+async def test_shutdown_drains_in_flight_streams(server, stub) -> None:
+    grpc_server, _ = server
+    call = stub.PingStream()
+
+    await call.write(pb2.PingRequest(message="before"))
+    assert (await call.read()).message == "before"
+
+    stopping = asyncio.create_task(grpc_server.stop(5.0))
+    await asyncio.sleep(0.1)
+
+    await call.write(pb2.PingRequest(message="during"))
+    assert (await call.read()).message == "during"
+
+    await call.done_writing()
+    assert await call.code() == grpc.StatusCode.OK
+
+    await asyncio.wait_for(stopping, 1.0)
+
+
+@pytest.mark.asyncio
+async def test_ping_batch(stub) -> None:
+    messages = [f"message {i}" for i in range(5)]
+
+    response = await stub.PingBatch(
+        pb2.PingBatchRequest(messages=[pb2.PingRequest(message=m) for m in messages])
+    )
+
+    assert [m.message for m in response.messages] == messages
+
+
+@pytest.mark.asyncio
+async def test_ping_batch_stream(stub) -> None:
+    messages = [f"message {i}" for i in range(25)]
+    batches = batch_requests(
+        (pb2.PingRequest(message=m) for m in messages), max_size=10
+    )
+
+    async def requests():
+        for batch in batches:
+            yield batch
+
+    responses = [response async for response in stub.PingBatchStream(requests())]
+
+    assert [len(r.messages) for r in responses] == [10, 10, 5]
+    assert [m.message for r in responses for m in r.messages] == messages
+
+
+def test_batch_requests_flushes_after_delay() -> None:
+    def slow_requests():
+        yield pb2.PingRequest(message="first")
+        yield pb2.PingRequest(message="second")
+        time.sleep(0.2)
+        yield pb2.PingRequest(message="third")
+
+    batches = batch_requests(slow_requests(), max_size=10, max_delay=0.05)
+
+    assert [[m.message for m in b.messages] for b in batches] == [
+        ["first", "second"],
+        ["third"],
+    ]
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_batch_requests_raises_source_error_after_sent_batches() -> None:
+    def failing_requests():
+        yield pb2.PingRequest(message="first")
+        yield pb2.PingRequest(message="second")
+        raise ValueError("bad input")
+
+    sent = []
+
+    with pytest.raises(ValueError, match="bad input"):
+        for batch in batch_requests(failing_requests(), max_size=10):
+            sent.append([m.message for m in batch.messages])
+
+    assert sent == [["first", "second"]]
+
+
+@pytest_asyncio.fixture()
+async def client(server):
+    _, port = server
+
+    async with ExampleClient(f"127.0.0.1:{port}", channels=3, max_in_flight=4) as c:
+        yield c
+
+
+@pytest.mark.asyncio
+async def test_client_ping_many_keeps_order(client: ExampleClient) -> None:
+    messages = [f"message {i}" for i in range(100)]
+
+    assert await client.ping_many(messages, timeout=5.0) == messages
+
+
+@pytest.mark.asyncio
+async def test_client_propagates_deadline(client: ExampleClient) -> None:
+    with deadline(0.0), pytest.raises(grpc.aio.AioRpcError) as exc_info:
+        await client.ping("late")
+
+    assert exc_info.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+    assert await client.ping("in time") == "in time"
+
+
+class AbortingExampleService(ExampleService):
+    def Ping(self, request: pb2.PingRequest, context):
+        if not request.message:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "empty message")
+
+        return super().Ping(request, context)
+
+
+def test_metrics_interceptor() -> None:
+    registry = CollectorRegistry()
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=2),
+        interceptors=[MetricsInterceptor(GrpcMetrics(registry))],
+    )
+    pb2_grpc.add_ExampleServicer_to_server(AbortingExampleService(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+
+    try:
+        with grpc.insecure_channel(f"127.0.0.1:{port}") as channel:
+            stub = pb2_grpc.ExampleStub(channel)
+
+            stub.Ping(pb2.PingRequest(message="hello"))
+            with pytest.raises(grpc.RpcError):
+                stub.Ping(pb2.PingRequest(message=""))
+
+            list(stub.PingStream(pb2.PingRequest(message="m") for _ in range(3)))
+    finally:
+        server.stop(None)
+
+    def sample(name: str, **labels: str) -> float | None:
+        return registry.get_sample_value(
+            name, {"grpc_service": "example.Example", **labels}
+        )
+
+    ping = {"grpc_method": "Ping", "grpc_type": "unary_unary"}
+    stream = {"grpc_method": "PingStream", "grpc_type": "stream_stream"}
+
+    assert sample("grpc_server_handled_total", **ping, grpc_code="OK") == 1
+    assert (
+        sample("grpc_server_handled_total", **ping, grpc_code="INVALID_ARGUMENT") == 1
+    )
+    assert sample("grpc_server_handling_seconds_count", **ping) == 2
+    assert sample("grpc_server_in_flight", **ping) == 0
+    assert sample("grpc_server_handled_total", **stream, grpc_code="OK") == 1
+    assert (
+        sample("grpc_server_stream_messages_sum", **stream, direction="received") == 3
+    )
+    assert sample("grpc_server_stream_messages_sum", **stream, direction="sent") == 3
+
+
+@pytest.mark.asyncio
+async def test_async_metrics_interceptor(stub) -> None:
+    labels = {
+        "grpc_service": "example.Example",
+        "grpc_method": "PingBatchStream",
+        "grpc_type": "stream_stream",
+        "grpc_code": "OK",
+    }
+    before = REGISTRY.get_sample_value("grpc_server_handled_total", labels) or 0
+
+    async def requests():
+        yield pb2.PingBatchRequest(messages=[pb2.PingRequest(message="m")])
+
+    assert len([r async for r in stub.PingBatchStream(requests())]) == 1
+    assert REGISTRY.get_sample_value("grpc_server_handled_total", labels) == before + 1
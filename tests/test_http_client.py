@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from common.http_client import HttpConnection, ProtocolError
+
+
+async def respond(response: bytes) -> tuple[int, bytes]:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(response)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    async with server:
+        connection = await HttpConnection.open("127.0.0.1", port)
+
+        try:
+            return await connection.request("GET", "/")
+        finally:
+            await connection.close()
+
+
+@pytest.mark.asyncio
+async def test_reads_content_length_body() -> None:
+    response = b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhello"
+
+    assert await respond(response) == (200, b"hello")
+
+
+@pytest.mark.asyncio
+async def test_reads_chunked_body() -> None:
+    response = (
+        b"HTTP/1.1 201 Created\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"3;ext=1\r\nabc\r\n2\r\nde\r\n0\r\n\r\n"
+    )
+
+    assert await respond(response) == (201, b"abcde")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "response",
+    [
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\nabc\r\n",
+        b"HTTP/1.1 200 OK\r\nContent-Length: many\r\n\r\n",
+        b"HTTP/1.1 OK\r\nContent-Length: 0\r\n\r\n",
+    ],
+)
+async def test_unparseable_response_is_connection_error(response: bytes) -> None:
+    with pytest.raises(ProtocolError):
+        await respond(response)
+
+    assert issubclass(ProtocolError, ConnectionError)
+
+
+@pytest.mark.asyncio
+async def test_closed_connection() -> None:
+    with pytest.raises(ConnectionError):
+        await respond(b"")
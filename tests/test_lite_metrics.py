@@ -0,0 +1,192 @@
+import json
+import subprocess
+import sys
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry
+from prometheus_client.parser import text_string_to_metric_families
+from prometheus_fastapi_instrumentator import Instrumentator
+
+from common.metrics import LiteMetrics
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_app(clock: FakeClock | None = None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{id}")
+    async def get_item(id: int, seconds: float = 0.0) -> dict[str, int]:
+        if clock is not None:
+            clock.now += seconds
+
+        if id < 0:
+            raise HTTPException(HTTPStatus.NOT_FOUND)
+
+        return {"id": id}
+
+    @app.post("/fail")
+    async def fail() -> None:
+        raise RuntimeError("boom")
+
+    return app
+
+
+def send_requests(client: TestClient) -> None:
+    client.get("/items/1", params={"seconds": 0.3})
+    client.get("/items/2", params={"seconds": 0.02})
+    client.get("/items/-1")
+    client.get("/missing")
+    client.post("/fail", content=b"12345")
+
+
+def scrape(client: TestClient) -> dict[tuple[str, tuple], float]:
+    text = client.get("/metrics").text
+
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(text)
+        for sample in family.samples
+    }
+
+
+@pytest.fixture()
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture()
+def samples(clock: FakeClock) -> dict[tuple[str, tuple], float]:
+    app = create_app(clock)
+    app.add_middleware(LiteMetrics, include_registry=False, clock=clock)
+    client = TestClient(app, raise_server_exceptions=False)
+    send_requests(client)
+
+    return scrape(client)
+
+
+def value(samples, name: str, **labels: str) -> float | None:
+    return samples.get((name, tuple(sorted(labels.items()))))
+
+
+def test_requests_by_status_class_and_route(samples) -> None:
+    total = "http_requests_total"
+
+    assert value(samples, total, handler="/items/{id}", method="GET", status="2xx") == 2
+    assert value(samples, total, handler="/items/{id}", method="GET", status="4xx") == 1
+    # unmatched paths share one handler label, so they cannot blow up series
+    assert value(samples, total, handler="none", method="GET", status="4xx") == 1
+    assert value(samples, total, handler="/fail", method="POST", status="5xx") == 1
+    # a request that raised is not left counted as running
+    assert value(samples, "http_requests_inprogress") == 0
+
+
+def test_latency_lands_in_its_bucket(samples) -> None:
+    lowr = "http_request_duration_seconds_bucket"
+    labels = {"handler": "/items/{id}", "method": "GET"}
+
+    assert value(samples, lowr, **labels, le="0.1") == 2
+    assert value(samples, lowr, **labels, le="0.5") == 3
+    assert value(samples, lowr, **labels, le="+Inf") == 3
+    assert value(
+        samples, "http_request_duration_seconds_sum", **labels
+    ) == pytest.approx(0.32)
+
+    highr = "http_request_duration_highr_seconds_bucket"
+    assert value(samples, highr, le="0.01") == 3
+    assert value(samples, highr, le="0.025") == 4
+    assert value(samples, highr, le="0.25") == 4
+    assert value(samples, highr, le="0.5") == 5
+
+
+def test_sizes_come_from_content_length(samples) -> None:
+    assert value(samples, "http_request_size_bytes_sum", handler="/fail") == 5
+    assert value(samples, "http_request_size_bytes_count", handler="/fail") == 1
+    assert value(samples, "http_response_size_bytes_sum", handler="/items/{id}") == (
+        len(b'{"id":1}') + len(b'{"id":2}') + len(b'{"detail":"Not Found"}')
+    )
+
+
+def test_sampling_counts_all_and_times_some(clock: FakeClock) -> None:
+    app = create_app(clock)
+    app.add_middleware(LiteMetrics, include_registry=False, clock=clock, sample_every=3)
+    client = TestClient(app)
+
+    for id in range(9):
+        client.get(f"/items/{id}")
+
+    samples = scrape(client)
+    labels = {"handler": "/items/{id}", "method": "GET"}
+
+    assert value(samples, "http_requests_total", **labels, status="2xx") == 9
+    assert value(samples, "http_request_duration_seconds_count", **labels) == 3
+
+
+def test_same_series_as_instrumentator(samples) -> None:
+    app = create_app()
+    Instrumentator(registry=CollectorRegistry()).instrument(app).expose(app)
+    client = TestClient(app, raise_server_exceptions=False)
+    send_requests(client)
+
+    def series(samples) -> set[tuple[str, tuple]]:
+        # values differ, names and label sets must not; instrumentator also
+        # exports prometheus_client's *_created samples and has the in
+        # progress gauge off by default
+        return {
+            (name, tuple(k for k, v in labels))
+            for name, labels in samples
+            if not name.endswith("_created") and name != "http_requests_inprogress"
+        }
+
+    assert series(samples) == series(scrape(client))
+
+
+def dead_pid() -> int:
+    process = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        check=True,
+    )
+    return int(process.stdout)
+
+
+def test_workers_are_merged_from_multiprocess_dir(tmp_path: Path) -> None:
+    workers = [
+        TestClient(
+            LiteMetrics(
+                create_app(), multiprocess_dir=str(tmp_path), include_registry=False
+            )
+        )
+        for _ in range(2)
+    ]
+    workers[0].get("/items/1")
+    workers[1].get("/items/2")
+    workers[1].get("/items/-1")
+    # an exited worker that was killed in the middle of three requests
+    gone = {
+        "pid": dead_pid(),
+        "in_progress": 3,
+        "series": [["GET", "/items/{id}", {"requests": [0, 5, 0, 0, 0]}]],
+    }
+    (tmp_path / "lite_1_1.json").write_text(json.dumps(gone))
+
+    # scraping a worker writes its own file first, so the second scrape
+    # sees both of them
+    scrape(workers[0])
+    samples = scrape(workers[1])
+    labels = {"handler": "/items/{id}", "method": "GET"}
+
+    assert value(samples, "http_requests_total", **labels, status="2xx") == 7
+    assert value(samples, "http_requests_total", **labels, status="4xx") == 1
+    assert value(samples, "http_request_duration_seconds_count", **labels) == 3
+    assert value(samples, "http_requests_inprogress") == 0
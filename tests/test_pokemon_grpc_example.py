@@ -0,0 +1,119 @@
+import grpc
+import pytest
+import pytest_asyncio
+from faker import Faker
+from fastapi.testclient import TestClient
+
+import lecture_2.rest_example.rpc.pokemon_pb2 as pb2
+import lecture_2.rest_example.rpc.pokemon_pb2_grpc as pb2_grpc
+from lecture_2.rest_example import store
+from lecture_2.rest_example.main import app
+from lecture_2.rest_example.rpc.service import create_server
+from lecture_2.rest_example.store.models import PokemonInfo
+
+faker = Faker()
+client = TestClient(app)
+
+
+@pytest_asyncio.fixture()
+async def stub():
+    server, port = create_server("127.0.0.1:0")
+    await server.start()
+
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+        yield pb2_grpc.PokemonStoreStub(channel)
+
+    await server.stop(None)
+
+
+@pytest.fixture()
+def existing_pokemons():
+    pokemons = [store.add(PokemonInfo(faker.name(), faker.boolean())) for _ in range(5)]
+
+    yield pokemons
+
+    for pokemon in pokemons:
+        store.delete(pokemon.id)
+
+
+@pytest.mark.asyncio
+async def test_add_many_is_visible_over_rest(stub) -> None:
+    infos = [pb2.PokemonInfo(name=faker.name(), published=True) for _ in range(3)]
+
+    response = await stub.AddMany(pb2.AddManyRequest(pokemons=infos))
+
+    assert [p.name for p in response.pokemons] == [i.name for i in infos]
+
+    for pokemon in response.pokemons:
+        rest_response = client.get(f"/pokemon/{pokemon.id}")
+        assert rest_response.json() == {
+            "id": pokemon.id,
+            "name": pokemon.name,
+            "published": True,
+        }
+        store.delete(pokemon.id)
+
+
+@pytest.mark.asyncio
+async def test_get_one(stub, existing_pokemons) -> None:
+    pokemon = existing_pokemons[0]
+
+    response = await stub.GetOne(pb2.GetPokemonRequest(id=pokemon.id))
+
+    assert response == pb2.Pokemon(
+        id=pokemon.id, name=pokemon.info.name, published=pokemon.info.published
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_one_not_found(stub) -> None:
+    with pytest.raises(grpc.aio.AioRpcError) as exc_info:
+        await stub.GetOne(pb2.GetPokemonRequest(id=-1))
+
+    assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_get_many(stub, existing_pokemons) -> None:
+    responses = [
+        p async for p in stub.GetMany(pb2.GetManyRequest(offset=0, limit=1000))
+    ]
+
+    assert {p.id for p in existing_pokemons} <= {p.id for p in responses}
+
+
+@pytest.mark.asyncio
+async def test_patch_many(stub, existing_pokemons) -> None:
+    first, second = existing_pokemons[:2]
+
+    response = await stub.PatchMany(
+        pb2.PatchManyRequest(
+            patches=[
+                pb2.PokemonPatch(id=first.id, name="patched"),
+                pb2.PokemonPatch(id=second.id, published=not second.info.published),
+            ]
+        )
+    )
+
+    assert [p.id for p in response.pokemons] == [first.id, second.id]
+    assert store.get_one(first.id).info.name == "patched"
+    assert store.get_one(second.id).info.published == response.pokemons[1].published
+
+
+@pytest.mark.asyncio
+async def test_patch_many_is_all_or_nothing(stub, existing_pokemons) -> None:
+    pokemon = existing_pokemons[0]
+    name = pokemon.info.name
+
+    with pytest.raises(grpc.aio.AioRpcError) as exc_info:
+        await stub.PatchMany(
+            pb2.PatchManyRequest(
+                patches=[
+                    pb2.PokemonPatch(id=pokemon.id, name="patched"),
+                    pb2.PokemonPatch(id=-1, name="patched"),
+                ]
+            )
+        )
+
+    assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
+    assert store.get_one(pokemon.id).info.name == name
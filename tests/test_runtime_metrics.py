@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from anyio import to_thread
+from prometheus_client import CollectorRegistry
+
+from common.runtime_metrics import RuntimeMetrics, set_thread_limiter
+
+
+@pytest.fixture()
+def registry() -> CollectorRegistry:
+    return CollectorRegistry()
+
+
+def blocking_handler() -> None:
+    # sync work called from an async handler, it holds the event loop thread;
+    # blocking the loop is what the probe has to see
+    time.sleep(0.1)
+
+
+@pytest.mark.asyncio
+async def test_probe_measures_blocked_loop(registry: CollectorRegistry) -> None:
+    metrics = RuntimeMetrics(registry, interval=0.01)
+    probe = asyncio.create_task(metrics.probe())
+    await asyncio.sleep(0.05)
+
+    # runs on the loop as its next callback, not in a thread like to_thread
+    asyncio.get_running_loop().call_soon(blocking_handler)
+    await asyncio.sleep(0.12)
+    probe.cancel()
+
+    assert registry.get_sample_value("event_loop_lag_last_seconds") is not None
+    assert registry.get_sample_value("event_loop_lag_seconds_count") >= 2
+    assert registry.get_sample_value("event_loop_lag_seconds_sum") >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_threadpool_queue_and_threads(registry: CollectorRegistry) -> None:
+    metrics = RuntimeMetrics(registry)
+    limiter = to_thread.current_default_thread_limiter()
+    tokens = limiter.total_tokens
+    release = threading.Event()
+    set_thread_limiter(2)
+
+    try:
+        calls = [
+            asyncio.create_task(to_thread.run_sync(release.wait)) for _ in range(5)
+        ]
+        await asyncio.sleep(0.05)
+        metrics.observe_threadpool()
+        release.set()
+        await asyncio.gather(*calls)
+    finally:
+        limiter.total_tokens = tokens
+
+    def value(name: str, state: str | None = None) -> float | None:
+        return registry.get_sample_value(name, {"state": state} if state else {})
+
+    assert value("threadpool_waiting_tasks") == 3
+    assert value("threadpool_tokens", "total") == 2
+    assert value("threadpool_tokens", "borrowed") == 2
+    assert value("threadpool_threads", "busy") == 2
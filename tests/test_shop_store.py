@@ -0,0 +1,484 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from lecture_2.hw.shop_api.main import app
+from lecture_2.hw.shop_api.store import (
+    ItemInfo,
+    MemoryStore,
+    PatchItemInfo,
+    SqliteStore,
+)
+from lecture_2.hw.shop_api.store.index import SortedIndex
+
+
+@pytest.fixture()
+def store() -> MemoryStore:
+    return MemoryStore()
+
+
+def expected_price(store: MemoryStore, cart_id: int) -> float:
+    cart = store.get_cart(cart_id)
+
+    return sum(
+        store.get_item(item.id).info.price * item.quantity
+        for item in cart.items
+        if item.available
+    )
+
+
+def test_cart_totals_follow_add_to_cart(store: MemoryStore) -> None:
+    milk = store.add_item(ItemInfo("milk", 10.0))
+    bread = store.add_item(ItemInfo("bread", 2.5))
+    cart_id = store.create_cart()
+
+    store.add_to_cart(cart_id, milk.id)
+    store.add_to_cart(cart_id, milk.id)
+    cart = store.add_to_cart(cart_id, bread.id)
+
+    assert cart.price == pytest.approx(22.5)
+    assert cart.quantity == 3
+    assert [(item.id, item.quantity) for item in cart.items] == [
+        (milk.id, 2),
+        (bread.id, 1),
+    ]
+
+
+def test_item_price_change_updates_only_affected_carts(store: MemoryStore) -> None:
+    milk = store.add_item(ItemInfo("milk", 10.0))
+    bread = store.add_item(ItemInfo("bread", 2.5))
+    with_milk, without_milk = store.create_cart(), store.create_cart()
+
+    for _ in range(3):
+        store.add_to_cart(with_milk, milk.id)
+    store.add_to_cart(without_milk, bread.id)
+
+    store.patch_item(milk.id, PatchItemInfo(price=12.0))
+    assert store.get_cart(with_milk).price == pytest.approx(36.0)
+    assert store.get_cart(without_milk).price == pytest.approx(2.5)
+
+    store.replace_item(milk.id, ItemInfo("milk 2l", 20.0))
+    assert store.get_cart(with_milk).price == pytest.approx(60.0)
+    assert store.get_cart(with_milk).items[0].name == "milk 2l"
+    assert store.get_cart(with_milk).price == pytest.approx(
+        expected_price(store, with_milk)
+    )
+
+
+def test_deleted_item_is_unavailable_and_not_priced(store: MemoryStore) -> None:
+    milk = store.add_item(ItemInfo("milk", 10.0))
+    bread = store.add_item(ItemInfo("bread", 2.5))
+    cart_id = store.create_cart()
+    store.add_to_cart(cart_id, milk.id)
+    store.add_to_cart(cart_id, bread.id)
+
+    store.delete_item(milk.id)
+    store.delete_item(milk.id)
+
+    cart = store.get_cart(cart_id)
+    assert cart.price == pytest.approx(2.5)
+    assert cart.quantity == 2
+    assert [item.available for item in cart.items] == [False, True]
+    assert store.add_to_cart(cart_id, milk.id) is None
+
+
+def test_deletes_are_applied_before_price_filters(store: MemoryStore) -> None:
+    milk = store.add_item(ItemInfo("milk", 10.0))
+    bread = store.add_item(ItemInfo("bread", 2.5))
+    carts = [store.create_cart() for _ in range(3)]
+
+    for cart_id in carts:
+        store.add_to_cart(cart_id, milk.id)
+        store.add_to_cart(cart_id, bread.id)
+
+    store.delete_item(milk.id)
+    later = store.create_cart()
+    store.add_to_cart(later, bread.id)
+
+    # no cart was read since the delete, price index is reconciled lazily
+    assert [cart.id for cart in store.get_carts(max_price=5.0)] == [*carts, later]
+    assert store.get_carts(min_price=5.0) == []
+    assert store.get_carts(min_quantity=2)[0].price == pytest.approx(2.5)
+
+
+def test_get_carts_filters_by_totals(store: MemoryStore) -> None:
+    item = store.add_item(ItemInfo("item", 5.0))
+    carts = [store.create_cart() for _ in range(4)]
+
+    for quantity, cart_id in enumerate(carts):
+        for _ in range(quantity):
+            store.add_to_cart(cart_id, item.id)
+
+    assert [c.id for c in store.get_carts(min_price=5.0, max_price=10.0)] == carts[1:3]
+    assert [c.id for c in store.get_carts(min_quantity=3)] == carts[3:]
+    assert [c.id for c in store.get_carts(max_quantity=0)] == carts[:1]
+    assert [c.id for c in store.get_carts(offset=1, limit=2)] == carts[1:3]
+
+
+@pytest.mark.parametrize("store_type", ["memory", "sqlite"])
+def test_emptied_cart_costs_exactly_zero(store_type: str, tmp_path) -> None:
+    # 0.1 + 0.2 - 0.1 - 0.2 is not 0 in floats
+    store = (
+        MemoryStore() if store_type == "memory" else SqliteStore(str(tmp_path / "db"))
+    )
+    items = [store.add_item(ItemInfo(f"item-{i}", 0.1 * (i + 1))) for i in range(3)]
+    cart_id = store.create_cart()
+    store.add_many_to_cart(cart_id, [(item.id, 1) for item in items])
+    store.patch_item(items[0].id, PatchItemInfo(price=0.7))
+
+    for item in items:
+        store.delete_item(item.id)
+
+    assert [cart.id for cart in store.get_carts(max_price=0.0)] == [cart_id]
+    assert store.get_cart(cart_id).price == 0.0
+
+
+def test_sorted_index_matches_brute_force() -> None:
+    rng = random.Random(36)
+    index = SortedIndex(load=4)
+    entries: set[tuple[float, int]] = set()
+
+    for id in range(500):
+        key = float(rng.randint(0, 50))
+        index.add(key, id)
+        entries.add((key, id))
+
+        if rng.random() < 0.3:
+            entry = rng.choice(sorted(entries))
+            index.remove(*entry)
+            entries.remove(entry)
+
+    assert len(index) == len(entries)
+
+    for _ in range(100):
+        low, high = sorted(float(rng.randint(0, 50)) for _ in range(2))
+        offset = rng.randint(0, 40)
+        expected = [id for key, id in sorted(entries) if low <= key <= high]
+
+        assert list(index.range(low, high, offset)) == expected[offset:]
+        assert index.count(low, high) == len(expected)
+
+    with pytest.raises(KeyError):
+        index.remove(100.0, 0)
+
+
+def test_unfiltered_pages_seek_by_id(store: MemoryStore) -> None:
+    ids = [store.add_item(ItemInfo(f"item{n}", 1.0)).id for n in range(20)]
+    carts = [store.create_cart() for _ in range(7)]
+
+    for id in ids[::3]:
+        store.delete_item(id)
+
+    live = [id for id in ids if id not in ids[::3]]
+
+    for offset in (0, 4, 12, 13, 30):
+        page = store.get_items(offset, 5)
+        assert [item.id for item in page] == live[offset : offset + 5]
+
+        page = store.get_items(offset, 5, show_deleted=True)
+        assert [item.id for item in page] == ids[offset : offset + 5]
+
+        page = store.get_carts(offset, 5)
+        assert [cart.id for cart in page] == carts[offset : offset + 5]
+
+
+def test_filtered_lists_match_brute_force(store: MemoryStore) -> None:
+    rng = random.Random(36)
+    items = [
+        store.add_item(ItemInfo(f"item-{i}", rng.randint(1, 20))) for i in range(40)
+    ]
+    carts = [store.create_cart() for _ in range(30)]
+
+    for _ in range(200):
+        store.add_to_cart(rng.choice(carts), rng.choice(items).id)
+
+    for item in rng.sample(items, 10):
+        store.patch_item(item.id, PatchItemInfo(price=rng.randint(1, 20)))
+
+    for item in rng.sample(items, 5):
+        store.delete_item(item.id)
+
+    all_items = store.get_items(limit=100, show_deleted=True)
+    all_carts = store.get_carts(limit=100)
+
+    for _ in range(50):
+        low, high = sorted(rng.randint(0, 200) for _ in range(2))
+        offset = rng.randint(0, 5)
+
+        items_page = store.get_items(offset, 5, min_price=low / 10, max_price=high / 10)
+        expected_items = sorted(
+            (
+                i
+                for i in all_items
+                if not i.info.deleted and low / 10 <= i.info.price <= high / 10
+            ),
+            key=lambda i: (i.info.price, i.id),
+        )
+        assert items_page == expected_items[offset : offset + 5]
+
+        carts_page = store.get_carts(
+            offset, 5, min_price=low, max_price=high, min_quantity=5
+        )
+        expected_carts = sorted(
+            (c for c in all_carts if low <= c.price <= high and c.quantity >= 5),
+            key=lambda c: (c.price, c.id),
+        )
+        assert carts_page == expected_carts[offset : offset + 5]
+
+        quantity_page = store.get_carts(offset, 5, max_quantity=high // 20)
+        expected_quantity = sorted(
+            (c for c in all_carts if c.quantity <= high // 20),
+            key=lambda c: (c.quantity, c.id),
+        )
+        assert quantity_page == expected_quantity[offset : offset + 5]
+
+
+def test_add_many_to_cart_is_all_or_nothing(store: MemoryStore) -> None:
+    milk = store.add_item(ItemInfo("milk", 10.0))
+    bread = store.add_item(ItemInfo("bread", 2.5))
+    cart_id = store.create_cart()
+
+    assert store.add_many_to_cart(cart_id, [(milk.id, 2), (bread.id + 1, 1)]) is None
+    assert store.get_cart(cart_id).quantity == 0
+
+    cart = store.add_many_to_cart(cart_id, [(milk.id, 2), (bread.id, 3)])
+    assert cart.price == pytest.approx(27.5)
+    assert cart.quantity == 5
+
+
+def test_concurrent_adds_lose_no_updates() -> None:
+    store = MemoryStore(stripes=4)
+    items = [store.add_item(ItemInfo(f"item-{i}", 1.0 + i)) for i in range(5)]
+    carts = [store.create_cart() for _ in range(8)]
+    rounds = 200
+
+    def add(thread: int) -> None:
+        for i in range(rounds):
+            cart_id = carts[(thread + i) % len(carts)]
+            store.add_many_to_cart(cart_id, [(items[i % 5].id, 1), (items[0].id, 1)])
+
+            if i % 50 == 0:
+                store.patch_item(items[1].id, PatchItemInfo(price=2.0 + i))
+                store.get_carts(min_price=0.0)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(add, range(8)))
+
+    for cart_id in carts:
+        cart = store.get_cart(cart_id)
+        assert cart.price == pytest.approx(expected_price(store, cart_id))
+
+    assert sum(store.get_cart(id).quantity for id in carts) == 8 * rounds * 2
+
+
+@pytest.mark.parametrize(("stripes", "in_pool"), [(0, False), (4, True)])
+def test_only_striped_store_leaves_event_loop(
+    stripes: int, in_pool: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    threads = []
+
+    class RecordingStore(MemoryStore):
+        def create_cart(self) -> int:
+            threads.append(threading.current_thread().name)
+            return super().create_cart()
+
+    store = RecordingStore(stripes=stripes)
+    monkeypatch.setattr(app.state, "store", store)
+
+    assert TestClient(app).post("/cart").status_code == HTTPStatus.CREATED
+    assert store.blocking is in_pool
+    assert (threads[0] == "AnyIO worker thread") is in_pool
+
+
+def test_batch_add_endpoint() -> None:
+    client = TestClient(app)
+    item_ids = [
+        client.post("/item", json={"name": name, "price": 4.0}).json()["id"]
+        for name in ("tea", "sugar")
+    ]
+    cart_id = client.post("/cart").json()["id"]
+
+    response = client.post(
+        f"/cart/{cart_id}/add",
+        json=[{"id": item_ids[0], "quantity": 3}, {"id": item_ids[1]}],
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["price"] == pytest.approx(16.0)
+    assert [item["quantity"] for item in response.json()["items"]] == [3, 1]
+
+    response = client.post(f"/cart/{cart_id}/add", json=[{"id": -1}])
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+    response = client.post(f"/cart/{cart_id}/add", json=[{"id": 1, "quantity": 0}])
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_sqlite_store_matches_memory_store(tmp_path) -> None:
+    rng = random.Random(39)
+    memory = MemoryStore()
+    sqlite = SqliteStore(str(tmp_path / "shop.db"))
+
+    prices = [float(rng.randint(1, 20)) for _ in range(30)]
+
+    for store in (memory, sqlite):
+        for i, price in enumerate(prices):
+            store.add_item(ItemInfo(f"item-{i}", price))
+
+        for _ in range(20):
+            store.create_cart()
+
+    for _ in range(300):
+        match rng.randint(0, 9):
+            case 0:
+                args = (rng.randint(1, 31), PatchItemInfo(price=rng.randint(1, 20)))
+                results = [store.patch_item(*args) for store in (memory, sqlite)]
+            case 1:
+                id = rng.randint(1, 31)
+                results = [store.delete_item(id) for store in (memory, sqlite)]
+            case _:
+                batch = [(rng.randint(1, 31), rng.randint(1, 3)) for _ in range(2)]
+                cart_id = rng.randint(1, 21)
+                results = [
+                    store.add_many_to_cart(cart_id, batch) for store in (memory, sqlite)
+                ]
+
+        assert results[0] == results[1]
+
+    for query in (
+        {},
+        {"min_price": 20.0, "max_price": 80.0},
+        {"min_quantity": 5},
+        {"max_price": 60.0, "max_quantity": 10, "offset": 2},
+    ):
+        assert memory.get_carts(limit=30, **query) == sqlite.get_carts(
+            limit=30, **query
+        )
+
+    for query in ({}, {"min_price": 5.0, "max_price": 15.0}, {"show_deleted": True}):
+        assert memory.get_items(limit=40, **query) == sqlite.get_items(
+            limit=40, **query
+        )
+
+    sqlite.close()
+
+
+def test_sqlite_store_concurrent_adds(tmp_path) -> None:
+    store = SqliteStore(str(tmp_path / "shop.db"))
+    item = store.add_item(ItemInfo("item", 1.5))
+    cart_id = store.create_cart()
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda _: store.add_to_cart(cart_id, item.id), range(100)))
+
+    cart = store.get_cart(cart_id)
+    assert cart.quantity == 100
+    assert cart.price == pytest.approx(150.0)
+    store.close()
+
+
+@pytest.mark.parametrize("store_type", ["memory", "sqlite"])
+def test_top_items_follow_add_to_cart(store_type: str, tmp_path) -> None:
+    store = (
+        MemoryStore() if store_type == "memory" else SqliteStore(str(tmp_path / "db"))
+    )
+    ids = store.add_items([ItemInfo(f"item-{i}", 1.0) for i in range(4)])
+    assert list(ids) == [1, 2, 3, 4]
+
+    carts = [store.create_cart() for _ in range(2)]
+    store.add_many_to_cart(carts[0], [(ids[0], 1), (ids[2], 3)])
+    store.add_many_to_cart(carts[1], [(ids[1], 2), (ids[2], 1)])
+    store.add_to_cart(carts[1], ids[0])
+
+    assert [(t.id, t.carted) for t in store.get_top_items(10)] == [
+        (ids[2], 4),
+        (ids[0], 2),
+        (ids[1], 2),
+    ]
+
+    store.delete_item(ids[2])
+    assert [t.id for t in store.get_top_items(1)] == [ids[0]]
+
+
+def test_import_items_endpoint() -> None:
+    client = TestClient(app)
+    csv_body = 'name,price\r\n"milk, 1l",10.5\r\n"bread\nwhite",2\r\n\r\ntea,3\r\n'
+
+    response = client.post(
+        "/item/import?batch_size=2",
+        content=(csv_body.encode()[i : i + 5] for i in range(0, len(csv_body), 5)),
+        headers={"content-type": "text/csv"},
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    first, last = response.json()["ids"][0]
+    assert response.json()["imported"] == 3 and last - first == 2
+    assert client.get(f"/item/{first}").json()["name"] == "milk, 1l"
+    assert client.get(f"/item/{first + 1}").json()["name"] == "bread\nwhite"
+
+    ndjson_body = '{"name": "a", "price": 1}\n{"name": "b", "price": 2}\n{"name": "c"}'
+    response = client.post(
+        "/item/import?batch_size=2",
+        content=ndjson_body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()["detail"]["imported"] == 2
+    assert response.json()["detail"]["row"] == 3
+
+    response = client.post("/item/import", content="[]")
+    assert response.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+
+    client.post(f"/cart/{client.post('/cart').json()['id']}/add/{first + 2}")
+    top = client.get("/item/top", params={"k": 100}).json()
+    assert {"id": first + 2, "name": "tea", "price": 3.0, "carted": 1} in top
+
+
+@pytest.mark.parametrize(
+    ("lines", "row", "error"),
+    [
+        # two objects on one line are not two rows
+        (
+            ['{"name": "a", "price": 1}', '{"name": "b", "price": 2},{"name": "c"}'],
+            2,
+            "json_invalid",
+        ),
+        (
+            ['{"name": "a", "price": 1}', "", '{"name": "b", "price": '],
+            2,
+            "json_invalid",
+        ),
+        (['{"name": "a", "price": 1}', "[]"], 2, "model_type"),
+    ],
+)
+def test_import_ndjson_rejects_bad_lines(
+    lines: list[str], row: int, error: str
+) -> None:
+    response = TestClient(app).post(
+        "/item/import",
+        content="\n".join(lines),
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()["detail"]["imported"] == 0
+    assert response.json()["detail"]["row"] == row
+    assert response.json()["detail"]["errors"][0]["type"] == error
+
+
+@pytest.mark.parametrize("content_type", ["text/csv", "application/x-ndjson"])
+def test_import_rejects_invalid_utf8(content_type: str) -> None:
+    body = "name,price\n" if content_type == "text/csv" else ""
+    response = TestClient(app).post(
+        "/item/import",
+        # last character is cut in the middle of its utf-8 bytes
+        content=body.encode() + "молоко".encode()[:-1],
+        headers={"content-type": content_type},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()["detail"]["imported"] == 0
+    assert response.json()["detail"]["row"] is None
+    assert response.json()["detail"]["errors"][0]["type"] == "utf8_invalid"
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import pytest
+
+from common.ids import (
+    EPOCH_MS,
+    SEQUENCE_BITS,
+    SEQUENCE_SIZE,
+    WORKER_BITS,
+    Snowflake,
+)
+
+
+class FrozenClock:
+    def __init__(self, ms: int = EPOCH_MS + 1000) -> None:
+        self.ms = ms
+
+    def __call__(self) -> int:
+        return self.ms
+
+
+def test_ids_are_increasing_and_carry_worker() -> None:
+    ids = list(islice(Snowflake(worker=7), 10_000))
+
+    assert ids == sorted(set(ids))
+    assert all(id >> SEQUENCE_BITS & ((1 << WORKER_BITS) - 1) == 7 for id in ids)
+
+
+def test_used_up_sequence_borrows_next_millisecond() -> None:
+    clock = FrozenClock()
+    ids = list(islice(Snowflake(clock=clock), SEQUENCE_SIZE + 1))
+
+    assert ids == sorted(set(ids))
+    assert ids[-1] >> (WORKER_BITS + SEQUENCE_BITS) == clock.ms - EPOCH_MS + 1
+
+
+def test_clock_going_back_does_not_repeat_ids() -> None:
+    clock = FrozenClock()
+    generator = Snowflake(clock=clock)
+    before = [generator.next_id() for _ in range(10)]
+    clock.ms -= 500
+    after = [generator.next_id() for _ in range(10)]
+
+    assert before + after == sorted(set(before + after))
+
+
+def test_workers_never_collide() -> None:
+    # same millisecond for both and more ids than one millisecond holds, so
+    # both borrow the same next milliseconds too
+    clock = FrozenClock()
+    first, second = Snowflake(1, clock), Snowflake(2, clock)
+    n = 3 * SEQUENCE_SIZE + 5
+    first_ids = set(islice(first, n)) | {id for r in first.lease(n) for id in r}
+    second_ids = set(islice(second, n)) | {id for r in second.lease(n) for id in r}
+
+    assert len(first_ids) == len(second_ids) == 2 * n
+    assert not first_ids & second_ids
+
+
+def test_threads_get_unique_ids() -> None:
+    generator = Snowflake()
+
+    with ThreadPoolExecutor(8) as executor:
+        batches = list(
+            executor.map(lambda _: [generator.next_id() for _ in range(5000)], range(8))
+        )
+
+    ids = [id for batch in batches for id in batch]
+    assert len(set(ids)) == len(ids)
+
+
+@pytest.mark.parametrize("n", [1, 100, SEQUENCE_SIZE, 3 * SEQUENCE_SIZE + 5])
+def test_lease_is_contiguous_blocks_after_previous_ids(n: int) -> None:
+    generator = Snowflake(clock=FrozenClock())
+    before = generator.next_id()
+    blocks = generator.lease(n)
+    after = generator.next_id()
+    leased = [id for block in blocks for id in block]
+
+    assert len(leased) == n
+    assert [before, *leased, after] == sorted({before, *leased, after})
+    assert all(block.step == 1 for block in blocks)
+
+
+def test_worker_out_of_range() -> None:
+    with pytest.raises(ValueError):
+        Snowflake(worker=1 << WORKER_BITS)
@@ -0,0 +1,123 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from lecture_2.ws_example import server
+from lecture_2.ws_example.rate_limit import (
+    Decision,
+    Policy,
+    RateLimiter,
+    TokenBucket,
+    limiter_from_env,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def test_token_bucket_burst_and_refill(clock: FakeClock) -> None:
+    bucket = TokenBucket(rate=2.0, burst=3.0, clock=clock)
+
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    clock.now += 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    clock.now += 100.0
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_token_bucket_reserve(clock: FakeClock) -> None:
+    bucket = TokenBucket(rate=4.0, burst=1.0, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.25)
+
+    clock.now += 0.25
+    assert not bucket.try_acquire()
+
+    clock.now += 0.25
+    assert bucket.try_acquire()
+
+
+@pytest.mark.parametrize(
+    ("policy", "decision", "prevented_fanout"),
+    [
+        (Policy.DROP, Decision.DROP, 10),
+        (Policy.DELAY, Decision.DELAY, 0),
+        (Policy.DISCONNECT, Decision.DISCONNECT, 10),
+    ],
+)
+def test_rate_limiter_stats(
+    policy: Policy,
+    decision: Decision,
+    prevented_fanout: int,
+) -> None:
+    limiter = RateLimiter(rate=0.001, burst=1.0, policy=policy)
+    bucket = limiter.new_bucket()
+
+    assert limiter.decide(bucket, fanout=5) == Decision.ACCEPT
+    assert limiter.decide(bucket, fanout=5) == decision
+    assert limiter.decide(bucket, fanout=5) == decision
+
+    stats = limiter.stats()
+    assert stats[Decision.ACCEPT] == 1
+    assert stats[decision] == 2
+    assert stats["prevented_fanout"] == prevented_fanout
+
+
+def test_ws_disconnects_offender(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        server,
+        "limiter",
+        RateLimiter(rate=0.001, burst=1.0, policy=Policy.DISCONNECT),
+    )
+    client = TestClient(server.app)
+
+    with client.websocket_connect("/subscribe") as ws:
+        assert ws.receive_text().endswith("subscribed")
+
+        ws.send_text("first")
+        assert ws.receive_text() == "first"
+
+        ws.send_text("second")
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            ws.receive_text()
+
+        assert exc_info.value.code == status.WS_1008_POLICY_VIOLATION
+
+    assert server.broadcaster.subscribers == []
+    assert client.get("/rate-limit").json()["disconnect"] == 1
+
+
+def test_limiter_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("WS_RATE_LIMIT", "2.5")
+    monkeypatch.setenv("WS_RATE_BURST", "5")
+    monkeypatch.setenv("WS_RATE_POLICY", "delay")
+
+    limiter = limiter_from_env()
+
+    assert (limiter.rate, limiter.burst, limiter.policy) == (2.5, 5.0, Policy.DELAY)
+
+
+def test_limiter_from_env_defaults_and_invalid(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in ("WS_RATE_LIMIT", "WS_RATE_BURST", "WS_RATE_POLICY"):
+        monkeypatch.delenv(name, raising=False)
+
+    assert limiter_from_env() == RateLimiter()
+
+    monkeypatch.setenv("WS_RATE_LIMIT", "0")
+    with pytest.raises(ValueError):
+        limiter_from_env()